@@ -0,0 +1,168 @@
+import argparse
+import sys
+from typing import List, Optional
+
+"""
+one entry point for everything the package runs:
+
+    python run.py play --method expectimax --seed 7
+    python run.py simulate --games 100 --method expectimax --workers 4
+    python run.py bench --method expectimax --positions 5
+    python run.py bench --render --games 2
+    python run.py replay game.trace
+    python run.py stats results/simulation_results results/simulation_results_1
+
+without a subcommand it plays, like run.py always did. nothing but argparse
+is imported up front, every subcommand imports what it needs when it runs: only
+play (and bench --render) ever load pygame, and replay doesn't load the solvers
+"""
+
+
+def _positive(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive number, got {value}")
+    return number
+
+
+def _check_methods(parser: argparse.ArgumentParser, methods: List[str]) -> None:
+    from .g2048 import solvers
+
+    for method in methods:
+        if method not in solvers.METHODS:
+            parser.error(
+                f"unknown method '{method}' (choose from {', '.join(solvers.METHODS)})"
+            )
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="2048 solvers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # shared by play and simulate
+    board = argparse.ArgumentParser(add_help=False)
+    board.add_argument("--width", type=_positive, default=4)
+    board.add_argument("--height", type=_positive, default=4)
+    board.add_argument("--book", help="opening book file to play from")
+
+    play = commands.add_parser(
+        "play", parents=[board], help="watch a solver play in a window"
+    )
+    play.add_argument("--method", default="expectimax")
+    play.add_argument("--seed", type=int, help="random if not given")
+    play.add_argument("--trace", help="record the game to this file")
+    play.add_argument(
+        "--sync",
+        action="store_true",
+        help="search in the window's process instead of a background one",
+    )
+    play.add_argument(
+        "--headless", action="store_true", help="draw offscreen, without a display"
+    )
+
+    simulate = commands.add_parser(
+        "simulate", parents=[board], help="play many games and save the results"
+    )
+    simulate.add_argument(
+        "--method", action="append", help="repeat for several, all if not given"
+    )
+    simulate.add_argument("--games", type=_positive, default=1_000)
+    simulate.add_argument("--seed", type=int, default=0)
+    simulate.add_argument("--workers", type=_positive)
+    simulate.add_argument("--format", default="csv", help="csv or binary")
+
+    # everything bench doesn't know itself is passed on to the benchmark
+    bench = commands.add_parser(
+        "bench",
+        help="benchmark the solvers (see python -m src.g2048.bench --help)",
+    )
+    bench.add_argument(
+        "--render",
+        action="store_true",
+        help="benchmark drawing instead (see python -m src.g2048.pygame.bench)",
+    )
+
+    replay = commands.add_parser("replay", help="rerun a recorded game")
+    replay.add_argument("path")
+    replay.add_argument("--no-check", action="store_true")
+
+    stats = commands.add_parser(
+        "stats", help="summarize (and merge) the results files of sweeps"
+    )
+    stats.add_argument("base", nargs="+", help="e.g. results/simulation_results")
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    parser = _parser()
+    args, rest = parser.parse_known_args(argv or ["play"])
+    if rest and args.command != "bench":
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    match args.command:
+        case "play":
+            _check_methods(parser, [args.method])
+            from . import main as runner
+
+            runner.main(
+                seed=args.seed,
+                book=args.book,
+                trace=args.trace,
+                background=not args.sync,
+                method=args.method,
+                width=args.width,
+                height=args.height,
+                headless=args.headless,
+            )
+        case "simulate":
+            _check_methods(parser, args.method or [])
+            from . import main as runner
+            from .g2048.results import FORMATS
+
+            if args.format not in FORMATS:
+                parser.error(
+                    f"unknown format '{args.format}' "
+                    f"(choose from {', '.join(FORMATS)})"
+                )
+            runner.auto(
+                workers=args.workers,
+                seed=args.seed,
+                book=args.book,
+                format=args.format,
+                games=args.games,
+                methods=args.method,
+                width=args.width,
+                height=args.height,
+            )
+        case "bench":
+            if args.render:
+                from .g2048.pygame import bench as render_bench
+
+                return render_bench.main(rest)
+            from .g2048 import bench
+
+            return bench.main(rest)
+        case "replay":
+            from .g2048.trace import replay_file
+
+            replay_file(args.path, check=not args.no_check)
+        case "stats":
+            from .g2048.aggregate import SweepStats
+            from .g2048.results import read_results, result_files
+
+            # one pass per sweep, merged, like partial aggregates of one sweep
+            merged = SweepStats()
+            for base in args.base:
+                if not result_files(base):
+                    parser.error(f"no results files start with '{base}'")
+                merged.merge(SweepStats.from_rows(read_results(result_files(base))))
+            print(merged.summary())
+            print(f"\n---{merged.games} games---")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
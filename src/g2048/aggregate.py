@@ -0,0 +1,260 @@
+import math
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple, Union
+
+from .board import Board
+from .reporters import Reporter
+
+if TYPE_CHECKING:
+    from .results import ResultRow
+    from .runner import GameResult
+    from .solver import Solver
+
+"""
+running per-method statistics of a sweep, in constant memory
+
+every game is folded in as it finishes and then dropped: means and variances
+are updated in place (Welford), max tiles are counted per tile and latencies go
+into a QuantileSketch, whose size depends on the range of the values, not on
+how many there are. all of it merges, so partial aggregates (per worker, per
+results file, per machine) add up to the one a single pass would have built:
+
+    stats = SweepStats()
+    for result in run_games(methods, 1_000):
+        stats.add(result)
+    print(stats.summary())
+
+    stats = SweepStats.from_rows(read_results(result_files(base)))
+"""
+
+# the tiles reach rates are reported for
+REACH_TILES = [512, 1024, 2048, 4096]
+
+
+class Moments:
+    # count, mean, variance, min and max of a stream of numbers
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        # sum of squared differences from the mean
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Moments") -> None:
+        # Chan et al.'s pairwise update, the same as adding other's values one
+        # by one (up to rounding)
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        # of the sample
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    # quantiles within `accuracy` relative error. a value v > 0 is counted in
+    # bucket ceil(log(v) / log(gamma)), so the buckets only depend on the range
+    # of the values: 1us to 100s at 1% is about 1800 of them. past
+    # `max_buckets` the lowest ones are folded together, which only costs
+    # accuracy on the fastest values
+    def __init__(self, accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        self.accuracy = accuracy
+        self.max_buckets = max_buckets
+        self.count = 0
+        self.zeros = 0
+        self.buckets: Dict[int, int] = {}
+
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, QuantileSketch)
+            and self.accuracy == other.accuracy
+            and self.zeros == other.zeros
+            and self.buckets == other.buckets
+        )
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        if value <= 0:
+            self.zeros += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.accuracy != self.accuracy:
+            raise ValueError(
+                f"can't merge sketches of accuracy {other.accuracy} and "
+                f"{self.accuracy}"
+            )
+        self.count += other.count
+        self.zeros += other.zeros
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def quantile(self, fraction: float) -> float:
+        # nan while empty
+        if self.count == 0:
+            return math.nan
+        rank = fraction * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # the middle of the bucket, relative to its width
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+
+class LatencyReporter(Reporter):
+    # times every move of Solver.solve into `sketch`: the search, the step and
+    # the spawn, from one report() to the next
+    def __init__(self, sketch: Optional[QuantileSketch] = None) -> None:
+        self.sketch = sketch if sketch is not None else QuantileSketch()
+        self._last: Optional[float] = None
+
+    def report(self, solver: "Solver", board: Board, iteration: int) -> None:
+        now = time.perf_counter()
+        if self._last is not None:
+            self.sketch.add(now - self._last)
+        self._last = now
+
+
+class MethodStats:
+    def __init__(self, method: str) -> None:
+        self.method = method
+        self.games = 0
+        self.max_tile = Moments()
+        self.turns = Moments()
+        self.moves_per_sec = Moments()
+        # games per max tile, at most one entry per power of two
+        self.max_tiles: Counter = Counter()
+        self.latency = QuantileSketch()
+        self.seconds = 0.0
+        # (max_tile, turns) of the best game, fewer turns breaking ties
+        self.best: Optional[Tuple[int, int]] = None
+
+    def add(self, row: "ResultRow", latency: Optional[QuantileSketch] = None) -> None:
+        self.games += 1
+        self.max_tile.add(row.max_tile)
+        self.turns.add(row.turns)
+        self.moves_per_sec.add(row.moves_per_sec)
+        self.max_tiles[row.max_tile] += 1
+        self.seconds += row.seconds
+        if latency is not None:
+            self.latency.merge(latency)
+        self._best(row.max_tile, row.turns)
+
+    def merge(self, other: "MethodStats") -> None:
+        self.games += other.games
+        self.max_tile.merge(other.max_tile)
+        self.turns.merge(other.turns)
+        self.moves_per_sec.merge(other.moves_per_sec)
+        self.max_tiles.update(other.max_tiles)
+        self.latency.merge(other.latency)
+        self.seconds += other.seconds
+        if other.best is not None:
+            self._best(*other.best)
+
+    def _best(self, max_tile: int, turns: int) -> None:
+        if self.best is None or (max_tile, -turns) > (self.best[0], -self.best[1]):
+            self.best = (max_tile, turns)
+
+    def reach_rate(self, tile: int) -> float:
+        # the share of games that got a tile of at least `tile`
+        reached = sum(n for max_tile, n in self.max_tiles.items() if max_tile >= tile)
+        return reached / self.games if self.games else 0.0
+
+
+class SweepStats:
+    def __init__(self) -> None:
+        self.methods: Dict[str, MethodStats] = {}
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Union["GameResult", "ResultRow"]]
+    ) -> "SweepStats":
+        stats = cls()
+        for row in rows:
+            stats.add(row)
+        return stats
+
+    @property
+    def games(self) -> int:
+        return sum(method.games for method in self.methods.values())
+
+    def _method(self, method: str) -> MethodStats:
+        if method not in self.methods:
+            self.methods[method] = MethodStats(method)
+        return self.methods[method]
+
+    def add(self, result: Union["GameResult", "ResultRow"]) -> None:
+        # a finished game, or a row read back from a results file (which keeps
+        # no latencies)
+        from .results import ResultRow
+
+        if isinstance(result, ResultRow):
+            self._method(result.method).add(result)
+        else:
+            self._method(result.method).add(
+                ResultRow.from_result(result), result.latency
+            )
+
+    def merge(self, other: "SweepStats") -> None:
+        for method, stats in other.methods.items():
+            self._method(method).merge(stats)
+
+    def summary(self) -> str:
+        # one line per method, best first
+        lines = [
+            f"{'method':<28}{'games':>7}{'tile':>8}{'sd':>7}{'turns':>8}"
+            f"{'moves/s':>10}"
+            + "".join(f"{tile:>8}" for tile in REACH_TILES)
+            + f"{'p50 ms':>9}{'p99 ms':>9}"
+        ]
+        for stats in sorted(
+            self.methods.values(), key=lambda m: (-m.max_tile.mean, m.method)
+        ):
+            lines.append(
+                f"{stats.method:<28}{stats.games:>7}"
+                f"{stats.max_tile.mean:>8.1f}{stats.max_tile.stdev:>7.1f}"
+                f"{stats.turns.mean:>8.1f}{stats.moves_per_sec.mean:>10.1f}"
+                + "".join(f"{stats.reach_rate(tile):>8.1%}" for tile in REACH_TILES)
+                + f"{stats.latency.quantile(0.50) * 1000:>9.3f}"
+                f"{stats.latency.quantile(0.99) * 1000:>9.3f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,169 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .bitboard import _ROW_LEFT, _SCORE_LEFT, ROW_MASK
+
+"""
+N 4x4 games stepped in lockstep
+
+cells[n, y, x] holds the log2 of the tile of game n (0 means empty), moves are
+given as one int per game: 0 up, 1 left, 2 down, 3 right (same order as
+solvers.random)
+"""
+
+UP, LEFT, DOWN, RIGHT = 0, 1, 2, 3
+MOVES = np.array(["w", "a", "s", "d"])
+
+_SHIFTS = np.array([0, 4, 8, 12], dtype=np.uint32)
+
+# every packed row slid left, reusing the BitBoard tables so both boards follow
+# the same merge rules
+_ROWS = np.arange(ROW_MASK + 1, dtype=np.uint32)
+_LEFT = ((_ROWS ^ np.array(_ROW_LEFT, dtype=np.uint32))[:, None] >> _SHIFTS) & 0xF
+_LEFT = _LEFT.astype(np.uint8)
+_LEFT_SCORE = np.array(_SCORE_LEFT, dtype=np.int64)
+
+
+def _orient(cells: np.ndarray, move: int) -> np.ndarray:
+    # a view of the games where `move` slides every row towards x = 0
+    match move:
+        case 1:  # left
+            return cells
+        case 3:  # right
+            return cells[:, :, ::-1]
+        case 0:  # up
+            return cells.transpose(0, 2, 1)
+        case 2:  # down
+            return cells.transpose(0, 2, 1)[:, :, ::-1]
+    raise ValueError(f"unknown move {move}")
+
+
+def _unorient(cells: np.ndarray, move: int) -> np.ndarray:
+    match move:
+        case 1:  # left
+            return cells
+        case 3:  # right
+            return cells[:, :, ::-1]
+        case 0:  # up
+            return cells.transpose(0, 2, 1)
+        case 2:  # down
+            return cells[:, :, ::-1].transpose(0, 2, 1)
+    raise ValueError(f"unknown move {move}")
+
+
+class BatchBoard:
+    def __init__(
+        self,
+        size: int,
+        *,
+        seed: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None,
+    ) -> None:
+        self.width: int = 4
+        self.height: int = 4
+
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+
+        self.cells = np.zeros((size, self.height, self.width), dtype=np.uint8)
+        self.alive = np.ones(size, dtype=bool)
+        self.turns = np.zeros(size, dtype=np.int64)
+        self.merge_score = np.zeros(size, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __repr__(self) -> str:
+        return f"BatchBoard(size={len(self)}, alive={int(self.alive.sum())})"
+
+    def place_starting_tiles(self) -> None:
+        # same distribution as runner.place_starting_tiles: 1 to 3 tiles,
+        # 30% 4 / 70% 2, later tiles may land on earlier ones
+        size = len(self)
+        games = np.arange(size)
+        counts = self.rng.integers(1, 4, size)
+        for i in range(3):
+            placed = games[counts > i]
+            cells = self.rng.integers(0, 16, len(placed))
+            values = np.where(self.rng.random(len(placed)) > 0.7, 2, 1)
+            self.cells[placed, cells // 4, cells % 4] = values
+
+    def moved(self, moves: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # (new cells, changed mask, merge scores) without spawning anything,
+        # games that are over are left as they are
+        moves = np.asarray(moves)
+        new = self.cells.copy()
+        scores = np.zeros(len(self), dtype=np.int64)
+
+        for move in range(4):
+            games = np.flatnonzero((moves == move) & self.alive)
+            if len(games) == 0:
+                continue
+
+            rows = _orient(self.cells[games], move).astype(np.uint32)
+            packed = (rows << _SHIFTS).sum(axis=2)
+
+            new[games] = _unorient(_LEFT[packed], move)
+            scores[games] = _LEFT_SCORE[packed].sum(axis=1)
+
+        changed = (new != self.cells).any(axis=(1, 2))
+        return new, changed, scores
+
+    def legal_moves(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        # Board.legal_moves of every game still going (of the `mask`ed ones, 0
+        # for the rest), bit `move` set if `move` changes the game
+        games = self.alive if mask is None else self.alive & mask
+        legal = np.zeros(len(self), dtype=np.int64)
+        for move in range(4):
+            _, changed, _ = self.moved(np.where(games, move, -1))
+            legal |= changed.astype(np.int64) << move
+        return legal
+
+    def step(self, moves: np.ndarray) -> np.ndarray:
+        # Board.step for every game, returns which games are still going
+        moves = np.asarray(moves)
+        new, changed, scores = self.moved(moves)
+        full = ~(new == 0).any(axis=(1, 2))
+
+        stuck = self.alive & ~changed & full
+        if stuck.any():
+            # like Solver.choose, a dead move on a full board that can still
+            # merge plays the first legal move instead of ending the game
+            legal = self.legal_moves(stuck)
+            first = np.argmax((legal[:, None] >> np.arange(4)) & 1, axis=1)
+            moves = np.where(legal != 0, first, moves)
+            new, changed, scores = self.moved(moves)
+            full = ~(new == 0).any(axis=(1, 2))
+
+        self.alive &= changed | ~full
+        self.cells = new
+        self.merge_score += scores
+        self.turns += self.alive
+
+        self.spawn(self.alive & ~full)
+        return self.alive.copy()
+
+    def spawn(self, mask: np.ndarray) -> None:
+        # one random tile in a uniformly chosen empty cell of every masked game
+        games = np.flatnonzero(mask)
+        if len(games) == 0:
+            return
+
+        flat = self.cells[games].reshape(len(games), -1)
+        weights = self.rng.random(flat.shape)
+        weights[flat != 0] = -1
+        cells = weights.argmax(axis=1)
+
+        values = np.where(self.rng.random(len(games)) < 0.1, 2, 1)  # 10% 4, 90% 2
+        flat[np.arange(len(games)), cells] = values
+        self.cells[games] = flat.reshape(-1, self.height, self.width)
+
+    def full(self) -> np.ndarray:
+        return ~(self.cells == 0).any(axis=(1, 2))
+
+    def done(self) -> bool:
+        return not self.alive.any()
+
+    def score(self) -> np.ndarray:
+        exponents = self.cells.max(axis=(1, 2)).astype(np.int64)
+        return np.where(exponents > 0, 1 << exponents, 0)
@@ -0,0 +1,49 @@
+from typing import Callable, Dict
+
+import numpy as np
+
+from .batch_board import DOWN, LEFT, RIGHT, UP, BatchBoard
+
+"""
+batched versions of the move-only policies in solvers.py, each returns one move
+per game of the batch (see batch_board for the encoding)
+"""
+
+
+def up_left(board: BatchBoard) -> np.ndarray:
+    return np.where(board.turns % 2 == 0, UP, LEFT)
+
+
+def down_right(board: BatchBoard) -> np.ndarray:
+    return np.where(board.turns % 2 == 0, DOWN, RIGHT)
+
+
+def random(board: BatchBoard) -> np.ndarray:
+    return board.rng.integers(0, 4, len(board))
+
+
+def circular(board: BatchBoard) -> np.ndarray:
+    # w, a, s, d in turn, which is the move encoding itself
+    return board.turns % 4
+
+
+METHODS: Dict[str, Callable[[BatchBoard], np.ndarray]] = {
+    "up-left": up_left,
+    "down-right": down_right,
+    "random": random,
+    "circular": circular,
+}
+
+
+def play(
+    method: Callable[[BatchBoard], np.ndarray], games: int, *, seed: int = 0
+) -> BatchBoard:
+    # plays `games` games to the end and returns the finished batch, read the
+    # results from its score() and turns
+    board = BatchBoard(games, seed=seed)
+    board.place_starting_tiles()
+
+    while not board.done():
+        board.step(method(board))
+
+    return board
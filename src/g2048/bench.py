@@ -0,0 +1,221 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from random import Random
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import solvers
+from .board import Board
+from .runner import derive_seed, place_starting_tiles
+from .solver import Solver
+
+"""
+micro-benchmarks for the board, the heuristics and every solver
+
+everything runs on positions taken from seeded random games, so two runs on
+the same machine measure the same work and can be compared against a saved
+baseline:
+
+    python -m src.g2048.bench --json bench.json
+    python -m src.g2048.bench --baseline bench.json
+"""
+
+SHIFTS = ["shift_up", "shift_down", "shift_left", "shift_right"]
+HEURISTICS = ["score_tile_weights", "score_board", "score_position"]
+
+
+class CountingBoard(Board):
+    # counts every position a search generates, through moved() or spawn()
+    nodes = 0
+
+    def moved(self, move: str) -> Tuple[Board, bool, int]:
+        CountingBoard.nodes += 1
+        return super().moved(move)
+
+    def spawn(self, cell: Tuple[int, int], value: int) -> Board:
+        CountingBoard.nodes += 1
+        return super().spawn(cell, value)
+
+
+def positions(count: int, seed: int = 2048) -> List[CountingBoard]:
+    # snapshots of seeded random games, spread from the opening to the end game
+    boards: List[CountingBoard] = []
+    game = 0
+    while len(boards) < count:
+        rng = Random(derive_seed(seed, game))
+        board = CountingBoard(4, 4, rng=rng)
+        place_starting_tiles(board)
+
+        moves = ["w", "a", "s", "d"]
+        turn = 0
+        while board.step(rng.choice(moves)) and not board.full():
+            turn += 1
+            if turn % 15 == 0:
+                boards.append(board.copy())  # type: ignore[arg-type]
+        game += 1
+    return boards[:count]
+
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(
+    function: Callable[[Any], Any], inputs: Sequence[Any], *, min_seconds: float
+) -> Dict[str, float]:
+    # calls `function` on every input, looping over them until min_seconds have
+    # passed, latencies are per call. one untimed pass warms up caches first
+    for item in inputs:
+        function(item)
+
+    latencies: List[float] = []
+    nodes = CountingBoard.nodes
+    start = time.perf_counter()
+    while True:
+        for item in inputs:
+            call_start = time.perf_counter()
+            function(item)
+            latencies.append(time.perf_counter() - call_start)
+        if time.perf_counter() - start >= min_seconds:
+            break
+    seconds = time.perf_counter() - start
+    nodes = CountingBoard.nodes - nodes
+
+    return {
+        "calls": len(latencies),
+        "seconds": seconds,
+        "calls_per_sec": len(latencies) / seconds,
+        "nodes": nodes,
+        "nodes_per_sec": nodes / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def run(
+    *,
+    seed: int = 2048,
+    count: int = 20,
+    min_seconds: float = 0.5,
+    methods: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    boards = positions(count, seed)
+    results: Dict[str, Dict[str, float]] = {}
+
+    # shifts and step mutate the board, so they're timed on a copy
+    for shift in SHIFTS:
+        results[f"board.{shift}"] = measure(
+            lambda b: getattr(b.copy(), shift)(), boards, min_seconds=min_seconds
+        )
+
+    def step(b: Board) -> None:
+        b = b.copy()
+        b.rng = Random(seed)
+        b.step("w")
+
+    results["board.step"] = measure(step, boards, min_seconds=min_seconds)
+    results["board.moved"] = measure(
+        lambda b: b.moved("w"), boards, min_seconds=min_seconds
+    )
+
+    for heuristic in HEURISTICS:
+        results[f"heuristic.{heuristic}"] = measure(
+            getattr(solvers, heuristic), boards, min_seconds=min_seconds
+        )
+
+    for name in methods if methods is not None else list(solvers.METHODS):
+        method = solvers.METHODS[name]
+
+        def solve(b: Board) -> None:
+            solver = Solver(name, method, rng=Random(seed))
+            method(solver, b)
+
+        # a solver call is one move, so calls_per_sec is moves/sec here
+        results[f"solver.{name}"] = measure(solve, boards, min_seconds=min_seconds)
+
+    return results
+
+
+def compare(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    # benchmarks whose throughput dropped more than `tolerance` (0.1 = 10%)
+    regressions = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["calls_per_sec"], result["calls_per_sec"]
+        if after < before * (1 - tolerance):
+            regressions.append(
+                f"{name}: {before:.1f} -> {after:.1f} calls/s "
+                f"({(after - before) / before:+.1%})"
+            )
+    return regressions
+
+
+def report(results: Dict[str, Dict[str, float]]) -> None:
+    print(
+        f"{'benchmark':<40}{'calls/s':>12}{'nodes/s':>12}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<40}{r['calls_per_sec']:>12.1f}{r['nodes_per_sec']:>12.1f}"
+            f"{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="2048 board and solver benchmarks")
+    parser.add_argument("--seed", type=int, default=2048)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--min-seconds", type=float, default=0.5)
+    parser.add_argument("--method", action="append", choices=list(solvers.METHODS))
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against a saved --json file")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run(
+        seed=args.seed,
+        count=args.positions,
+        min_seconds=args.min_seconds,
+        methods=args.method,
+    )
+    report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "seed": args.seed,
+                    "positions": args.positions,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            return 1
+        print(f"\n---no regressions against '{args.baseline}'---")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+import random
+from random import Random
+from typing import Any, Dict, Generator, List, Optional, Tuple, cast
+
+from .board import DOWN, LEFT, MOVE_BITS, RIGHT, UP
+
+"""
+4x4 board packed into a single 64-bit integer.
+
+every cell is a nibble holding the log2 of the tile (0 means empty), cell (x, y)
+lives at bit 4 * (4 * y + x), so row y is the 16 bits starting at 16 * y and
+its leftmost cell is the lowest nibble
+"""
+
+ROW_MASK = 0xFFFF
+
+# the largest tile a nibble holds is 1 << MAX_EXPONENT (32768)
+MAX_EXPONENT = 0xF
+
+
+def _shift_row_left(row: List[int]) -> Tuple[List[int], int]:
+    # same cell-by-cell rules as board._slide, applied to exponents. two
+    # MAX_EXPONENT tiles don't merge, there's no nibble for their sum, so they
+    # stay put like any two different tiles (where a Board would make a 65536)
+    cells = list(row)
+    merged = 0
+    for x in range(len(cells)):
+        value = cells[x]
+        if value == 0:
+            continue
+
+        mergeable = value < MAX_EXPONENT
+        new_x = x
+        while new_x - 1 >= 0 and (
+            cells[new_x - 1] == 0 or (mergeable and cells[new_x - 1] == value)
+        ):
+            new_x -= 1
+
+        if new_x != x:
+            if cells[new_x] == value:
+                cells[new_x] = value + 1
+                merged += 1 << cells[new_x]
+            else:
+                cells[new_x] = value
+            cells[x] = 0
+    return cells, merged
+
+
+def _pack_row(cells: List[int]) -> int:
+    return cells[0] | cells[1] << 4 | cells[2] << 8 | cells[3] << 12
+
+
+def _unpack_row(row: int) -> List[int]:
+    return [row & 0xF, (row >> 4) & 0xF, (row >> 8) & 0xF, (row >> 12) & 0xF]
+
+
+def _unpack_col(row: int) -> int:
+    # spreads the 4 nibbles of a row down column 0
+    return (
+        (row & 0xF)
+        | (row & 0xF0) << 12
+        | (row & 0xF00) << 24
+        | (row & 0xF000) << 36
+    )
+
+
+def _reverse_row(row: int) -> int:
+    return (
+        (row >> 12)
+        | ((row >> 4) & 0xF0)
+        | ((row << 4) & 0xF00)
+        | ((row << 12) & 0xF000)
+    )
+
+
+# tables store `before ^ after` so a move is a handful of xors
+_ROW_LEFT: List[int] = [0] * (ROW_MASK + 1)
+_ROW_RIGHT: List[int] = [0] * (ROW_MASK + 1)
+_COL_UP: List[int] = [0] * (ROW_MASK + 1)
+_COL_DOWN: List[int] = [0] * (ROW_MASK + 1)
+
+# merge score of sliding a row towards its low / high nibble
+_SCORE_LEFT: List[int] = [0] * (ROW_MASK + 1)
+_SCORE_RIGHT: List[int] = [0] * (ROW_MASK + 1)
+
+# legal_moves() bits of a row (LEFT, RIGHT) and of a column read as a row (UP,
+# DOWN)
+_ROW_MOVES: List[int] = [0] * (ROW_MASK + 1)
+_COL_MOVES: List[int] = [0] * (ROW_MASK + 1)
+
+
+def _build_tables() -> None:
+    for row in range(ROW_MASK + 1):
+        cells, merged = _shift_row_left(_unpack_row(row))
+        result = _pack_row(cells)
+        reversed_row = _reverse_row(row)
+        reversed_result = _reverse_row(result)
+
+        _ROW_LEFT[row] = row ^ result
+        _ROW_RIGHT[reversed_row] = reversed_row ^ reversed_result
+        _COL_UP[row] = _unpack_col(row ^ result)
+        _COL_DOWN[reversed_row] = _unpack_col(reversed_row ^ reversed_result)
+        _SCORE_LEFT[row] = merged
+        _SCORE_RIGHT[reversed_row] = merged
+
+    for row in range(ROW_MASK + 1):
+        _ROW_MOVES[row] = (LEFT if _ROW_LEFT[row] else 0) | (
+            RIGHT if _ROW_RIGHT[row] else 0
+        )
+        _COL_MOVES[row] = (UP if _ROW_LEFT[row] else 0) | (
+            DOWN if _ROW_RIGHT[row] else 0
+        )
+
+
+_build_tables()
+
+
+def transpose(board: int) -> int:
+    a1 = board & 0xF0F0_0F0F_F0F0_0F0F
+    a2 = board & 0x0000_F0F0_0000_F0F0
+    a3 = board & 0x0F0F_0000_0F0F_0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00_FF00_00FF_00FF
+    b2 = a & 0x00FF_00FF_0000_0000
+    b3 = a & 0x0000_0000_FF00_FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def count_empty(board: int) -> int:
+    board |= (board >> 2) & 0x3333_3333_3333_3333
+    board |= board >> 1
+    board = ~board & 0x1111_1111_1111_1111
+    return bin(board).count("1")
+
+
+def move_left(board: int) -> int:
+    return (
+        board
+        ^ _ROW_LEFT[board & ROW_MASK]
+        ^ _ROW_LEFT[(board >> 16) & ROW_MASK] << 16
+        ^ _ROW_LEFT[(board >> 32) & ROW_MASK] << 32
+        ^ _ROW_LEFT[(board >> 48) & ROW_MASK] << 48
+    )
+
+
+def move_right(board: int) -> int:
+    return (
+        board
+        ^ _ROW_RIGHT[board & ROW_MASK]
+        ^ _ROW_RIGHT[(board >> 16) & ROW_MASK] << 16
+        ^ _ROW_RIGHT[(board >> 32) & ROW_MASK] << 32
+        ^ _ROW_RIGHT[(board >> 48) & ROW_MASK] << 48
+    )
+
+
+def move_up(board: int) -> int:
+    t = transpose(board)
+    return (
+        board
+        ^ _COL_UP[t & ROW_MASK]
+        ^ _COL_UP[(t >> 16) & ROW_MASK] << 4
+        ^ _COL_UP[(t >> 32) & ROW_MASK] << 8
+        ^ _COL_UP[(t >> 48) & ROW_MASK] << 12
+    )
+
+
+def move_down(board: int) -> int:
+    t = transpose(board)
+    return (
+        board
+        ^ _COL_DOWN[t & ROW_MASK]
+        ^ _COL_DOWN[(t >> 16) & ROW_MASK] << 4
+        ^ _COL_DOWN[(t >> 32) & ROW_MASK] << 8
+        ^ _COL_DOWN[(t >> 48) & ROW_MASK] << 12
+    )
+
+
+def legal_moves(board: int) -> int:
+    t = transpose(board)
+    return (
+        _ROW_MOVES[board & ROW_MASK]
+        | _ROW_MOVES[(board >> 16) & ROW_MASK]
+        | _ROW_MOVES[(board >> 32) & ROW_MASK]
+        | _ROW_MOVES[(board >> 48) & ROW_MASK]
+        | _COL_MOVES[t & ROW_MASK]
+        | _COL_MOVES[(t >> 16) & ROW_MASK]
+        | _COL_MOVES[(t >> 32) & ROW_MASK]
+        | _COL_MOVES[(t >> 48) & ROW_MASK]
+    )
+
+
+def _rows_score(board: int, table: List[int]) -> int:
+    return (
+        table[board & ROW_MASK]
+        + table[(board >> 16) & ROW_MASK]
+        + table[(board >> 32) & ROW_MASK]
+        + table[(board >> 48) & ROW_MASK]
+    )
+
+
+def apply_move(board: int, move: str) -> Tuple[int, int]:
+    match move:
+        case "up" | "w":
+            return move_up(board), _rows_score(transpose(board), _SCORE_LEFT)
+        case "down" | "s":
+            return move_down(board), _rows_score(transpose(board), _SCORE_RIGHT)
+        case "right" | "d":
+            return move_right(board), _rows_score(board, _SCORE_RIGHT)
+        case "left" | "a":
+            return move_left(board), _rows_score(board, _SCORE_LEFT)
+    return board, 0
+
+
+class BitBoard:
+    def __init__(
+        self, width: int = 4, height: int = 4, rng: Optional[Random] = None
+    ) -> None:
+        if width != 4 or height != 4:
+            raise ValueError(
+                f"BitBoard only supports 4x4 boards, got {width}x{height}"
+            )
+
+        self.width: int = width
+        self.height: int = height
+
+        self.rng: Random = rng if rng is not None else cast(Random, random)
+
+        self._board: int = 0
+
+    @classmethod
+    def from_int(cls, board: int, rng: Optional[Random] = None) -> "BitBoard":
+        new = cls.__new__(cls)
+        new.width = new.height = 4
+        new.rng = rng if rng is not None else cast(Random, random)
+        new._board = board
+        return new
+
+    def __repr__(self) -> str:
+        rep = f"({self.height}x{self.width}), score={self.score()}\n"
+        for row in self:
+            rep += "|"
+            for cell in row:
+                rep += f" {cell if cell != 0 else ' '}\t|"
+            rep += "\n"
+        return rep
+
+    def key(self) -> int:
+        return self._board
+
+    def copy(self) -> "BitBoard":
+        return BitBoard.from_int(self._board, self.rng)
+
+    def __copy__(self) -> "BitBoard":
+        return BitBoard.from_int(self._board, self.rng)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "BitBoard":
+        return BitBoard.from_int(self._board, self.rng)
+
+    def __getitem__(self, coords: Tuple[int, int]) -> int:
+        exponent = (self._board >> (4 * (4 * coords[1] + coords[0]))) & 0xF
+        return 1 << exponent if exponent else 0
+
+    def __setitem__(self, coords: Tuple[int, int], value: int) -> None:
+        shift = 4 * (4 * coords[1] + coords[0])
+        exponent = value.bit_length() - 1 if value > 0 else 0
+        if exponent > MAX_EXPONENT:
+            # it would spill into the next cell's nibble
+            raise ValueError(
+                f"BitBoard tiles go up to {1 << MAX_EXPONENT}, got {value}"
+            )
+        self._board = (self._board & ~(0xF << shift)) | (exponent << shift)
+
+    def __iter__(self) -> Generator:
+        for y in range(4):
+            row = (self._board >> (16 * y)) & ROW_MASK
+            yield [1 << e if e else 0 for e in _unpack_row(row)]
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def reset(self) -> None:
+        self._board = 0
+
+    def shift_up(self) -> None:
+        self._board = move_up(self._board)
+
+    def shift_down(self) -> None:
+        self._board = move_down(self._board)
+
+    def shift_left(self) -> None:
+        self._board = move_left(self._board)
+
+    def shift_right(self) -> None:
+        self._board = move_right(self._board)
+
+    def moved(self, move: str) -> Tuple["BitBoard", bool, int]:
+        board, merged = apply_move(self._board, move)
+        return BitBoard.from_int(board, self.rng), board != self._board, merged
+
+    def spawn(self, cell: Tuple[int, int], value: int) -> "BitBoard":
+        new = BitBoard.from_int(self._board, self.rng)
+        new[cell] = value
+        return new
+
+    def legal_moves(self) -> int:
+        return legal_moves(self._board)
+
+    def is_terminal(self) -> bool:
+        return self.full() and not legal_moves(self._board)
+
+    def step(self, move: str) -> bool:
+        if legal_moves(self._board) & MOVE_BITS.get(move, 0):
+            match move:
+                case "up" | "w":
+                    self.shift_up()
+                case "down" | "s":
+                    self.shift_down()
+                case "right" | "d":
+                    self.shift_right()
+                case "left" | "a":
+                    self.shift_left()
+        elif self.full():
+            return False
+
+        self._generate_random()
+        return True
+
+    def render(self) -> None:
+        print(self)
+
+    def full(self) -> bool:
+        return count_empty(self._board) == 0
+
+    def done(self) -> bool:
+        return self.is_terminal()
+
+    def empty_cells(self) -> List[Tuple[int, int]]:
+        return [
+            (x, y)
+            for y in range(4)
+            for x in range(4)
+            if (self._board >> (4 * (4 * y + x))) & 0xF == 0
+        ]
+
+    def _generate_random(self) -> None:
+        if self.full():
+            return
+
+        x, y = self.rng.choice(self.empty_cells())
+
+        # 10% 4, 90% 2
+        self._board |= (2 if self.rng.random() < 0.1 else 1) << (4 * (4 * y + x))
+
+    def score(self) -> float:
+        board = self._board
+        exponent = 0
+        while board:
+            exponent = max(exponent, board & 0xF)
+            board >>= 4
+        return 1 << exponent if exponent else 0
+
+    def tick(self) -> None:
+        pass
@@ -1,14 +1,100 @@
-import copy
-from random import random, randrange, choice
-from typing import Callable, Generator, List, Optional, Tuple
+import random
+from random import Random
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, cast
+
+MOVES = ["w", "a", "s", "d"]
+# bit of every move in a legal_moves() mask
+UP, LEFT, DOWN, RIGHT = 1, 2, 4, 8
+MOVE_BITS = {
+    "w": UP,
+    "up": UP,
+    "a": LEFT,
+    "left": LEFT,
+    "s": DOWN,
+    "down": DOWN,
+    "d": RIGHT,
+    "right": RIGHT,
+}
+ALL_MOVES = UP | LEFT | DOWN | RIGHT
+
+_ROW_BITS = (0, LEFT, RIGHT, LEFT | RIGHT)
+_COLUMN_BITS = (0, UP, DOWN, UP | DOWN)
+
+# the most lines any memo of lines keeps (these ones and the LineHeuristic
+# ones). that's every line of a 4x4 board, long rows on big boards have too
+# many to keep all, so once a memo is full new lines are only computed
+MAX_LINES = 1 << 18
+
+# line -> 1 if its tiles can slide towards its start, | 2 towards its end.
+# there are only so many lines, and boards keep running into the same ones
+_LINE_MOVES: Dict[Tuple[int, ...], int] = {}
+
+# line -> (the line slid towards its start, merge score). lines of any length
+# are slid once and looked up from then on
+_SLIDES: Dict[Tuple[int, ...], Tuple[Tuple[int, ...], int]] = {}
+
+
+def _slide(line: Tuple[int, ...]) -> Tuple[Tuple[int, ...], int]:
+    slid = _SLIDES.get(line)
+    if slid is not None:
+        return slid
+
+    # cell by cell from the start: a tile slides over empty cells and cells
+    # holding its value, merging if it stops on one
+    cells = list(line)
+    merged = 0
+    for x in range(1, len(cells)):
+        value = cells[x]
+        if value == 0:
+            continue
+
+        new_x = x
+        while new_x > 0 and (cells[new_x - 1] == 0 or cells[new_x - 1] == value):
+            new_x -= 1
+
+        if new_x != x:
+            if cells[new_x] == value:
+                cells[new_x] = value * 2
+                merged += cells[new_x]
+            else:
+                cells[new_x] = value
+            cells[x] = 0
+
+    slid = (tuple(cells), merged)
+    if len(_SLIDES) < MAX_LINES:
+        _SLIDES[line] = slid
+    return slid
+
+
+def _line_moves(line: Tuple[int, ...]) -> int:
+    moves = _LINE_MOVES.get(line)
+    if moves is None:
+        # a tile moves if its neighbour that way is empty or holds its value
+        moves = 0
+        for a, b in zip(line, line[1:]):
+            if a == b:
+                if a:
+                    moves = 3
+                    break
+            elif a == 0:
+                moves |= 1
+            elif b == 0:
+                moves |= 2
+        if len(_LINE_MOVES) < MAX_LINES:
+            _LINE_MOVES[line] = moves
+    return moves
 
 
 class Board:
-    def __init__(self, width: int, height: int) -> None:
+    def __init__(self, width: int, height: int, rng: Optional[Random] = None) -> None:
         self.width: int = width
         self.height: int = height
 
-        self._data: List[List[int]] = [[0 for j in range(height)] for i in range(width)]
+        # spawns draw from here, the global random module unless given a seeded one
+        self.rng: Random = rng if rng is not None else cast(Random, random)
+
+        # _data[y][x], row by row
+        self._data: List[List[int]] = [[0 for x in range(width)] for y in range(height)]
 
     def __repr__(self) -> str:
         rep = f"({self.height}x{self.width}), score={self.score()}\n"
@@ -33,9 +119,8 @@ class Board:
         return self.width * self.height
 
     def reset(self) -> None:
-        for x in range(self.width):
-            for y in range(self.height):
-                self._data[x][y] = 0
+        for row in self._data:
+            row[:] = [0] * self.width
 
     def _iterate(
         self,
@@ -54,77 +139,99 @@ class Board:
                     results.append(res)
         return results
 
-    def _shift(self, x: int, y: int, x_direction: int, y_direction: int) -> None:
-        if self._data[y][x] == 0:
-            return
-
-        new_y = y
-        # > 0 up, < 0 down, 0 nothing
-        while (
-            new_y - y_direction != y
-            and new_y - y_direction >= 0
-            and new_y - y_direction < self.height
-            and (
-                self._data[new_y - y_direction][x] == 0
-                or self._data[new_y - y_direction][x] == self._data[y][x]
-            )
-        ):
-            new_y -= y_direction
-
-        new_x = x
-        while (
-            new_x - x_direction != x
-            and new_x - x_direction >= 0
-            and new_x - x_direction < self.height
-            and (
-                self._data[y][new_x - x_direction] == 0
-                or self._data[y][new_x - x_direction] == self._data[y][x]
-            )
-        ):
-            new_x -= x_direction
-
-        # print(f"{(x, y)} -> {(x, new_y)}")
-        if new_y != y or new_x != x:
-            if self._data[new_y][new_x] == self._data[y][x]:
-                self._data[new_y][new_x] = self._data[y][x] * 2
-            else:
-                self._data[new_y][new_x] = self._data[y][x]
-            self._data[y][x] = 0
-
-    def shift_up(self) -> None:
-        for x in range(self.width):
-            for y in range(self.height):
-                self._shift(x, y, 0, 1)
-
-    def shift_down(self) -> None:
-        for x in reversed(range(self.width)):
-            for y in reversed(range(self.height)):
-                self._shift(x, y, 0, -1)
-
-    def shift_left(self) -> None:
-        for y in range(self.height):
-            for x in range(self.width):
-                self._shift(x, y, 1, 0)
-
-    def shift_right(self) -> None:
-        for y in reversed(range(self.height)):
-            for x in reversed(range(self.width)):
-                self._shift(x, y, -1, 0)
-
-    def step(self, move: str) -> bool:
-        before = copy.deepcopy(self._data)
-
+    def key(self) -> Tuple[Tuple[int, ...], ...]:
+        return tuple(tuple(row) for row in self._data)
+
+    def copy(self) -> "Board":
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new._data = [row[:] for row in self._data]
+        return new
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Board":
+        # the copy keeps drawing from the same rng (which may be the random module)
+        return self.copy()
+
+    def shift_up(self) -> int:
+        merged = 0
+        columns = []
+        for column in zip(*self._data):
+            line, score = _slide(column)
+            columns.append(line)
+            merged += score
+        self._data[:] = [list(row) for row in zip(*columns)]
+        return merged
+
+    def shift_down(self) -> int:
+        merged = 0
+        columns = []
+        for column in zip(*self._data):
+            line, score = _slide(column[::-1])
+            columns.append(line[::-1])
+            merged += score
+        self._data[:] = [list(row) for row in zip(*columns)]
+        return merged
+
+    def shift_left(self) -> int:
+        merged = 0
+        for y, row in enumerate(self._data):
+            line, score = _slide(tuple(row))
+            self._data[y] = list(line)
+            merged += score
+        return merged
+
+    def shift_right(self) -> int:
+        merged = 0
+        for y, row in enumerate(self._data):
+            line, score = _slide(tuple(row[::-1]))
+            self._data[y] = list(line[::-1])
+            merged += score
+        return merged
+
+    def _apply(self, move: str) -> int:
         match move:
             case "up" | "w":
-                self.shift_up()
+                return self.shift_up()
             case "down" | "s":
-                self.shift_down()
+                return self.shift_down()
             case "right" | "d":
-                self.shift_right()
+                return self.shift_right()
             case "left" | "a":
-                self.shift_left()
+                return self.shift_left()
+        return 0
+
+    def moved(self, move: str) -> Tuple["Board", bool, int]:
+        # side-effect free: (new board, whether anything moved, merge score)
+        # no random tile is spawned, see spawn()
+        new = self.copy()
+        merged = new._apply(move)
+        return new, new._data != self._data, merged
+
+    def spawn(self, cell: Tuple[int, int], value: int) -> "Board":
+        new = self.copy()
+        new[cell] = value
+        return new
+
+    def legal_moves(self) -> int:
+        # mask of the moves that change the board (see MOVE_BITS), looked up
+        # line by line without copying or shifting anything
+        rows = 0
+        for row in self._data:
+            rows |= _line_moves(tuple(row))
+        columns = 0
+        for column in zip(*self._data):
+            columns |= _line_moves(column)
+        return _ROW_BITS[rows] | _COLUMN_BITS[columns]
+
+    def is_terminal(self) -> bool:
+        # a move that changes nothing still spawns a tile (see step), so the
+        # game only ends once the board is full and nothing can move
+        return self.full() and not self.legal_moves()
 
-        if self._data == before and self.full():
+    def step(self, move: str) -> bool:
+        if self.legal_moves() & MOVE_BITS.get(move, 0):
+            self._apply(move)
+        elif self.full():
             return False
 
         self._generate_random()
@@ -141,21 +248,23 @@ class Board:
         return True
 
     def done(self) -> bool:
-        return self.full()
+        return self.is_terminal()
 
-    def _generate_random(self) -> None:
-        if self.full():
-            return
-
-        empty_cells = [
+    def empty_cells(self) -> List[Tuple[int, int]]:
+        return [
             (x, y)
             for y in range(self.height)
             for x in range(self.width)
             if self._data[y][x] == 0
         ]
-        x, y = choice(empty_cells)
 
-        self._data[y][x] = 4 if random() < 0.1 else 2  # 10% 4, 90% 2
+    def _generate_random(self) -> None:
+        if self.full():
+            return
+
+        x, y = self.rng.choice(self.empty_cells())
+
+        self._data[y][x] = 4 if self.rng.random() < 0.1 else 2  # 10% 4, 90% 2
 
     def score(self) -> float:
         score = float("-inf")
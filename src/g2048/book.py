@@ -0,0 +1,381 @@
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Hashable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .board import Board
+from .symmetry import _variants_int, map_move, unmap_move
+
+"""
+a persistent opening book: canonical positions -> (best move, value, depth)
+
+the book is a fixed-size open-addressing hash table in a file that is
+memory-mapped, so every process of a run (see runner.run_games) can open the
+same book and look positions up without loading or deserializing anything.
+
+every record is 16 bytes, the packed entry and `key ^ entry`. a reader only
+accepts a record whose key comes back out of the xor, so a record torn by a
+concurrent writer reads as a miss instead of a wrong move (the same lockless
+trick chess engines use for shared hash tables). positions are stored under
+their canonical symmetry, moves are mapped to and from it.
+
+    python -m src.g2048.book build book.bin --method expectimax --games 200
+    python -m src.g2048.book merge book.bin other.bin
+    python -m src.g2048.book compact book.bin --max-mb 4
+"""
+
+MAGIC = b"G2048BK1"
+# magic, slots, name of the method the book was built with ("" for any)
+HEADER = struct.Struct("<8sQ32s")
+HEADER_BYTES = 64
+RECORD = struct.Struct("<QQ")
+ENTRY = struct.Struct("<fHBx")
+
+DEFAULT_SLOTS = 1 << 20
+# slots probed from a key's home slot before something has to be replaced
+PROBES = 8
+# positions past this turn are almost never seen twice, so they're not stored
+BOOK_TURNS = 100
+
+_MOVES = ["w", "a", "s", "d"]
+_MASK = (1 << 64) - 1
+
+
+class BookEntry(NamedTuple):
+    move: str
+    value: float
+    depth: int
+
+
+def pack_key(key: Hashable) -> Optional[int]:
+    # the BitBoard layout of a board key, None for boards that don't fit in one
+    # (anything but 4x4, or tiles over 2^15)
+    if isinstance(key, int):
+        return key
+
+    rows: Any = key
+    if len(rows) != 4 or any(len(row) != 4 for row in rows):
+        return None
+    packed = 0
+    for i, cell in enumerate(cell for row in rows for cell in row):
+        exponent = cell.bit_length() - 1 if cell else 0
+        if exponent > 0xF:
+            return None
+        packed |= exponent << (4 * i)
+    return packed
+
+
+def canonical(board: Board) -> Optional[Tuple[int, int]]:
+    # (canonical packed key, symmetry that produced it), like symmetry.canonical
+    # but always on packed keys so Boards and BitBoards share entries
+    key = pack_key(board.key())
+    if key is None:
+        return None
+    variants = _variants_int(key, True)
+    best = min(variants)
+    return best, variants.index(best)
+
+
+def _pack_entry(move: str, value: float, depth: int) -> int:
+    data = ENTRY.pack(value, min(depth, 0xFFFF), _MOVES.index(move) + 1)
+    return int.from_bytes(data, "little")
+
+
+def _unpack_entry(data: int) -> Optional[BookEntry]:
+    value, depth, move = ENTRY.unpack(data.to_bytes(8, "little"))
+    if not 0 < move <= len(_MOVES):
+        return None
+    return BookEntry(_MOVES[move - 1], value, depth)
+
+
+def slots_for(max_bytes: int) -> int:
+    return max(PROBES, (max_bytes - HEADER_BYTES) // RECORD.size)
+
+
+def _create(path: str, slots: int, method: str) -> None:
+    # the book is written out in full under a name of its own and then linked
+    # to `path`, which fails if it already exists. so processes racing to
+    # create the same book all end up opening one complete file, and none of
+    # them truncates a book another one has already mapped
+    temporary = f"{path}.{os.getpid()}.new"
+    try:
+        with open(temporary, "wb") as f:
+            header = HEADER.pack(MAGIC, slots, method.encode())
+            f.write(header.ljust(HEADER_BYTES, b"\0"))
+            f.truncate(HEADER_BYTES + slots * RECORD.size)
+        os.link(temporary, path)
+    except FileExistsError:
+        pass
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+class OpeningBook:
+    def __init__(
+        self,
+        path: str,
+        *,
+        slots: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        method: str = "",
+        readonly: bool = False,
+    ) -> None:
+        # opens the book at `path`, creating it with `slots` slots (or as many
+        # as fit in `max_bytes`) for `method` if it doesn't exist yet
+        if max_bytes is not None:
+            slots = slots_for(max_bytes)
+
+        if not os.path.exists(path):
+            if readonly:
+                raise FileNotFoundError(path)
+            _create(path, slots or DEFAULT_SLOTS, method)
+
+        self.path = path
+        self.readonly = readonly
+        self._file = open(path, "rb" if readonly else "r+b")
+        self._map = mmap.mmap(
+            self._file.fileno(),
+            0,
+            access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE,
+        )
+
+        magic, self.slots, method_bytes = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not an opening book")
+        self.method = method_bytes.rstrip(b"\0").decode()
+
+    def __repr__(self) -> str:
+        return (
+            f"OpeningBook('{self.path}', slots={self.slots}, method='{self.method}')"
+        )
+
+    def __enter__(self) -> "OpeningBook":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_BYTES + slot * RECORD.size
+
+    def _home(self, key: int) -> int:
+        # fibonacci hashing: the high bits of the product are well mixed, then
+        # scaled onto [0, slots) without a modulo
+        mixed = ((key * 0x9E37_79B9_7F4A_7C15) & _MASK) >> 32
+        return (mixed * self.slots) >> 32
+
+    def get(self, key: int) -> Optional[BookEntry]:
+        home = self._home(key)
+        for i in range(PROBES):
+            slot = (home + i) % self.slots
+            check, data = RECORD.unpack_from(self._map, self._offset(slot))
+            if data == 0:
+                return None
+            if check ^ data == key:
+                return _unpack_entry(data)
+        return None
+
+    def put(self, key: int, move: str, value: float, depth: int) -> bool:
+        # depth-preferred: an entry is only replaced by one searched at least
+        # as deep, returns whether the entry was written
+        home = self._home(key)
+        target = None
+        shallowest = None
+        for i in range(PROBES):
+            slot = (home + i) % self.slots
+            check, data = RECORD.unpack_from(self._map, self._offset(slot))
+            if data == 0 or check ^ data == key:
+                target = slot
+                break
+            entry = _unpack_entry(data)
+            if entry is None:
+                continue
+            if shallowest is None or entry.depth < shallowest[1]:
+                shallowest = (slot, entry.depth)
+
+        if target is None:
+            if shallowest is None or depth < shallowest[1]:
+                return False
+            target = shallowest[0]
+        else:
+            check, data = RECORD.unpack_from(self._map, self._offset(target))
+            old = _unpack_entry(data) if check ^ data == key else None
+            if old is not None and depth < old.depth:
+                return False
+
+        data = _pack_entry(move, value, depth)
+        RECORD.pack_into(self._map, self._offset(target), key ^ data, data)
+        return True
+
+    def lookup(self, board: Board) -> Optional[BookEntry]:
+        # the entry of `board` or any of its symmetries, with the move mapped
+        # back onto `board`
+        found = canonical(board)
+        if found is None:
+            return None
+        key, symmetry = found
+        entry = self.get(key)
+        if entry is None:
+            return None
+        return entry._replace(move=unmap_move(entry.move, symmetry))
+
+    def store(
+        self, board: Board, move: str, value: Optional[float], depth: int
+    ) -> bool:
+        found = canonical(board)
+        if found is None:
+            return False
+        key, symmetry = found
+        value = math.nan if value is None else value
+        return self.put(key, map_move(move, symmetry), value, depth)
+
+    def __iter__(self) -> Iterator[Tuple[int, BookEntry]]:
+        for slot in range(self.slots):
+            check, data = RECORD.unpack_from(self._map, self._offset(slot))
+            entry = _unpack_entry(data) if data else None
+            if entry is not None:
+                yield check ^ data, entry
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+def merge(target: str, sources: List[str]) -> int:
+    # copies every entry of `sources` into `target` (deeper entries win),
+    # creating it like the first source if it doesn't exist. returns how many
+    # entries were written
+    if not os.path.exists(target):
+        with OpeningBook(sources[0], readonly=True) as first:
+            OpeningBook(target, slots=first.slots, method=first.method).close()
+
+    written = 0
+    with OpeningBook(target) as book:
+        for source in sources:
+            with OpeningBook(source, readonly=True) as other:
+                if other.method != book.method:
+                    raise ValueError(
+                        f"can't merge a '{other.method}' book into a "
+                        f"'{book.method}' one"
+                    )
+                for key, entry in other:
+                    written += book.put(key, *entry)
+        book.flush()
+    return written
+
+
+def compact(
+    path: str, *, slots: Optional[int] = None, max_bytes: Optional[int] = None
+) -> int:
+    # rewrites the book with `slots` slots (default: 4 per entry), the
+    # deepest entries first so they're the ones kept if it shrinks. returns
+    # the entries kept
+    with OpeningBook(path, readonly=True) as book:
+        entries = sorted(book, key=lambda item: -item[1].depth)
+        method = book.method
+
+    if max_bytes is not None:
+        slots = slots_for(max_bytes)
+    slots = slots or max(PROBES, 4 * len(entries))
+
+    temporary = f"{path}.compact"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+    with OpeningBook(temporary, slots=slots, method=method) as new:
+        for key, entry in entries:
+            new.put(key, *entry)
+        new.flush()
+        kept = len(new)
+    os.replace(temporary, path)
+    return kept
+
+
+def build(
+    path: str,
+    method: str,
+    games: int,
+    *,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    slots: Optional[int] = None,
+) -> int:
+    # plays `games` games of `method` with the book attached, which stores the
+    # move of every opening position the solver had to search
+    from .runner import run_games
+
+    OpeningBook(path, slots=slots, method=method).close()
+    for _ in run_games([method], games, seed=seed, workers=workers, book=path):
+        pass
+    with OpeningBook(path, readonly=True) as book:
+        return len(book)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from . import solvers
+
+    parser = argparse.ArgumentParser(description="2048 opening books")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="play games into a book")
+    build_parser.add_argument("path")
+    build_parser.add_argument(
+        "--method", default="expectimax", choices=list(solvers.METHODS)
+    )
+    build_parser.add_argument("--games", type=int, default=100)
+    build_parser.add_argument("--seed", type=int, default=0)
+    build_parser.add_argument("--workers", type=int)
+    build_parser.add_argument("--max-mb", type=float)
+
+    merge_parser = commands.add_parser("merge", help="copy books into another")
+    merge_parser.add_argument("path")
+    merge_parser.add_argument("sources", nargs="+")
+
+    compact_parser = commands.add_parser("compact", help="resize a book")
+    compact_parser.add_argument("path")
+    compact_parser.add_argument("--max-mb", type=float)
+
+    info_parser = commands.add_parser("info", help="count a book's entries")
+    info_parser.add_argument("path")
+
+    args = parser.parse_args(argv)
+    max_bytes = int(args.max_mb * 2**20) if getattr(args, "max_mb", None) else None
+
+    match args.command:
+        case "build":
+            slots = slots_for(max_bytes) if max_bytes is not None else None
+            entries = build(
+                args.path,
+                args.method,
+                args.games,
+                seed=args.seed,
+                workers=args.workers,
+                slots=slots,
+            )
+            print(f"---{entries} entries in '{args.path}'---")
+        case "merge":
+            written = merge(args.path, args.sources)
+            print(f"---{written} entries merged into '{args.path}'---")
+        case "compact":
+            kept = compact(args.path, max_bytes=max_bytes)
+            print(f"---{kept} entries kept in '{args.path}'---")
+        case "info":
+            with OpeningBook(args.path, readonly=True) as book:
+                entries = len(book)
+                print(f"{book}: {entries} entries ({entries / book.slots:.1%} full)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
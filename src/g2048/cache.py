@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+# rough size of one entry: the (key, depth) tuple, the board key, a float and
+# the dict / linked list slot holding them
+ENTRY_BYTES = 200
+
+POLICIES = ["lru", "depth"]
+
+
+class TranspositionTable:
+    """
+    bounded cache of search values keyed on (board key, depth)
+
+    policy="lru" drops the least recently used entry once the table is full,
+    policy="depth" hashes every position into a fixed slot and only lets a new
+    entry replace the current one if it was searched at least as deep
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1_000_000,
+        *,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(
+                f"unknown policy '{policy}', expected one of {POLICIES}"
+            )
+        if max_bytes is not None:
+            max_entries = max_bytes // ENTRY_BYTES
+        if max_entries <= 0:
+            raise ValueError("the table needs room for at least one entry")
+
+        self.max_entries = max_entries
+        self.policy = policy
+
+        self._lru: OrderedDict[Tuple[Hashable, int], float] = OrderedDict()
+        self._slots: Dict[int, Tuple[Hashable, int, float]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._lru) if self.policy == "lru" else len(self._slots)
+
+    def __repr__(self) -> str:
+        return (
+            f"TranspositionTable(policy={self.policy}, "
+            f"size={len(self)}/{self.max_entries}, {self.stats()})"
+        )
+
+    def get(self, key: Hashable, depth: int) -> Optional[float]:
+        value: Optional[float] = None
+        if self.policy == "lru":
+            value = self._lru.get((key, depth))
+            if value is not None:
+                self._lru.move_to_end((key, depth))
+        else:
+            entry = self._slots.get(hash((key, depth)) % self.max_entries)
+            if entry is not None and entry[0] == key and entry[1] == depth:
+                value = entry[2]
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: Hashable, depth: int, value: float) -> None:
+        if self.policy == "lru":
+            self._lru[(key, depth)] = value
+            self._lru.move_to_end((key, depth))
+            if len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+                self.evictions += 1
+            return
+
+        slot = hash((key, depth)) % self.max_entries
+        entry = self._slots.get(slot)
+        if entry is not None and (entry[0], entry[1]) != (key, depth):
+            if entry[1] > depth:
+                return
+            self.evictions += 1
+        self._slots[slot] = (key, depth, value)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        self._slots.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,291 @@
+import math
+from random import Random
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Type, cast
+
+from . import board as board_module
+from .board import Board
+
+"""
+board heuristics kept up to date as the board changes instead of rescanning it
+
+a LineHeuristic scores a board as a sum of independent terms for every row and
+every column plus one for the largest tile. an IncrementalBoard keeps those
+terms per line and, after a move or a spawn, only rescores the rows and columns
+whose cells changed, so evaluate() adds up height + width cached numbers
+instead of walking every cell. line terms are memoized too, so a line that was
+scored once (in any position of any board) is a dict lookup afterwards, up
+to board.MAX_LINES lines
+"""
+
+Line = Tuple[int, ...]
+
+
+class LineHeuristic:
+    # whether row()/column() depend on the index of the line, heuristics that
+    # don't can share one table between all rows (see tables.RowTables)
+    positional_rows = False
+    positional_columns = False
+
+    def __init__(self) -> None:
+        self._rows: Dict[Tuple[int, Line, int], float] = {}
+        self._columns: Dict[Tuple[int, Line, int], float] = {}
+
+    def row(self, y: int, row: Line, height: int) -> float:
+        return 0.0
+
+    def column(self, x: int, column: Line, width: int) -> float:
+        return 0.0
+
+    def largest(self, tile: int) -> float:
+        return 0.0
+
+    def row_value(self, y: int, row: Line, height: int) -> float:
+        key = (y, row, height)
+        value = self._rows.get(key)
+        if value is None:
+            value = self.row(y, row, height)
+            if len(self._rows) < board_module.MAX_LINES:
+                self._rows[key] = value
+        return value
+
+    def column_value(self, x: int, column: Line, width: int) -> float:
+        key = (x, column, width)
+        value = self._columns.get(key)
+        if value is None:
+            value = self.column(x, column, width)
+            if len(self._columns) < board_module.MAX_LINES:
+                self._columns[key] = value
+        return value
+
+
+def smoothness(line: Line) -> int:
+    # score_board's smoothness for the neighbouring pairs of one line
+    total = 0
+    for a, b in zip(line, line[1:]):
+        if a != 0 and b != 0:
+            total -= abs(a - b)
+    return total
+
+
+def monotonicity(line: Line) -> float:
+    # minus the log2 steps that go against the line's better direction, 0 for a
+    # line that only ever increases or only ever decreases
+    ranks = [math.log2(cell) if cell else 0.0 for cell in line]
+    increasing = decreasing = 0.0
+    for a, b in zip(ranks, ranks[1:]):
+        if a > b:
+            increasing += a - b
+        else:
+            decreasing += b - a
+    return -min(increasing, decreasing)
+
+
+def corner_weight(x: int, y: int, width: int, height: int) -> float:
+    # 0 in the top left corner up to 1 in the bottom right one
+    return (x + y) / max(1, width + height - 2)
+
+
+class Weights(NamedTuple):
+    # the defaults are solvers.score_board
+    empty: float = 100
+    max_tile: float = 10
+    smoothness: float = 0.5
+    monotonicity: float = 0
+    corner: float = 0
+
+
+class WeightedHeuristic(LineHeuristic):
+    # empty cells, log2 of the largest tile, smoothness, monotonicity and log2
+    # tiles weighted towards the bottom right corner
+    def __init__(self, weights: Optional[Weights] = None) -> None:
+        super().__init__()
+        self.weights = weights if weights is not None else Weights()
+        self.positional_rows = bool(self.weights.corner)
+
+    def row(self, y: int, row: Line, height: int) -> float:
+        w = self.weights
+        value = w.empty * row.count(0) + w.smoothness * smoothness(row)
+        if w.monotonicity:
+            value += w.monotonicity * monotonicity(row)
+        if w.corner:
+            for x, cell in enumerate(row):
+                if cell:
+                    weight = corner_weight(x, y, len(row), height)
+                    value += w.corner * weight * math.log2(cell)
+        return value
+
+    def column(self, x: int, column: Line, width: int) -> float:
+        w = self.weights
+        value = w.smoothness * smoothness(column)
+        if w.monotonicity:
+            value += w.monotonicity * monotonicity(column)
+        return value
+
+    def largest(self, tile: int) -> float:
+        return self.weights.max_tile * math.log2(tile) if tile else 0.0
+
+
+class TileWeightHeuristic(LineHeuristic):
+    # solvers.score_tile_weights, every tile scores cell * log2(cell)
+    def row(self, y: int, row: Line, height: int) -> float:
+        return sum(cell * math.log2(cell) for cell in row if cell)
+
+
+class PositionHeuristic(LineHeuristic):
+    # solvers.score_position split into rows and columns
+    positional_rows = True
+
+    def row(self, y: int, row: Line, height: int) -> float:
+        width = len(row)
+        corners = [(0, 0), (0, height - 1), (width - 1, 0), (width - 1, height - 1)]
+        score = 0.0
+        for x, cell in enumerate(row):
+            if cell == 0:
+                continue
+
+            score += cell * math.log2(cell)
+
+            if (x, y) == (0, height - 1):
+                score += 5 * math.log2(cell)
+            if (x, y) == (width - 1, height - 1):
+                score += 5 * math.log2(cell)
+
+            if (x, y) not in corners:
+                score -= 0.2 * cell
+
+            if x < width - 1 and row[x + 1] == cell:
+                score += 2
+
+            if abs(x - (width - 1)) + abs(y - 0) <= 2:
+                score += 0.5 * cell
+            if abs(x - (width - 1)) + abs(y - (height - 1)) <= 2:
+                score += 0.5 * cell
+        return score
+
+    def column(self, x: int, column: Line, width: int) -> float:
+        return 2.0 * sum(1 for a, b in zip(column, column[1:]) if a != 0 and a == b)
+
+
+class IncrementalBoard(Board):
+    # a Board that carries its heuristic's row and column terms along. moved(),
+    # spawn(), step() and item assignment keep them current; the shift_*
+    # methods mutate the board without updating them, go through moved() or
+    # step() instead (or call sync())
+    heuristic: LineHeuristic = WeightedHeuristic()
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        rng: Optional[Random] = None,
+        heuristic: Optional[LineHeuristic] = None,
+    ) -> None:
+        super().__init__(width, height, rng)
+        if heuristic is not None:
+            self.heuristic = heuristic
+        self.sync()
+
+    def sync(self) -> None:
+        # rescores every line: the values of every row then every column, and
+        # the largest tile of every row
+        self._values: List[float] = [0.0] * (self.height + self.width)
+        self._largest: List[int] = [0] * self.height
+        for y in range(self.height):
+            self._update_row(y)
+        for x in range(self.width):
+            self._update_column(x)
+
+    def _update_row(self, y: int) -> None:
+        row = tuple(self._data[y])
+        self._values[y] = self.heuristic.row_value(y, row, self.height)
+        self._largest[y] = max(row)
+
+    def _update_column(self, x: int) -> None:
+        column = tuple(row[x] for row in self._data)
+        self._values[self.height + x] = self.heuristic.column_value(
+            x, column, self.width
+        )
+
+    def _update(self, before: List[List[int]]) -> None:
+        # rescores the lines that differ from `before`
+        columns: Set[int] = set()
+        for y, (old, new) in enumerate(zip(before, self._data)):
+            if old != new:
+                self._update_row(y)
+                columns.update(x for x in range(self.width) if old[x] != new[x])
+        for x in columns:
+            self._update_column(x)
+
+    def evaluate(self) -> float:
+        return sum(self._values) + self.heuristic.largest(max(self._largest))
+
+    def copy(self) -> "IncrementalBoard":
+        new = cast(IncrementalBoard, super().copy())
+        new._values = self._values[:]
+        new._largest = self._largest[:]
+        return new
+
+    def __setitem__(self, coords: Tuple[int, int], value: int) -> None:
+        super().__setitem__(coords, value)
+        self._update_row(coords[1])
+        self._update_column(coords[0])
+
+    def moved(self, move: str) -> Tuple[Board, bool, int]:
+        # the parent is still around to diff against, so no snapshot is needed
+        new, changed, merged = super().moved(move)
+        if changed:
+            cast(IncrementalBoard, new)._update(self._data)
+        return new, changed, merged
+
+    def step(self, move: str) -> bool:
+        before = [row[:] for row in self._data]
+        result = super().step(move)
+        self._update(before)
+        return result
+
+
+_classes: Dict[Type[Board], Type[IncrementalBoard]] = {}
+
+
+def incremental(
+    board: Board, heuristic: Optional[LineHeuristic] = None
+) -> IncrementalBoard:
+    # a copy of `board` that tracks `heuristic`, keeping the board's own class
+    # (and whatever its subclass overrides) underneath
+    if isinstance(board, IncrementalBoard) and (
+        heuristic is None or heuristic is board.heuristic
+    ):
+        return board
+
+    cls = type(board)
+    if not issubclass(cls, IncrementalBoard):
+        if cls not in _classes:
+            name = f"Incremental{cls.__name__}"
+            _classes[cls] = type(name, (IncrementalBoard, cls), {})
+        cls = _classes[cls]
+
+    new = cast(IncrementalBoard, board.copy())
+    new.__class__ = cls
+    if heuristic is not None:
+        new.heuristic = heuristic
+    new.sync()
+    return new
+
+
+def score_incremental(board: Board) -> float:
+    # the heuristic value of an IncrementalBoard, for use as a solver's evaluate
+    return cast(IncrementalBoard, board).evaluate()
+
+
+def line_evaluator(
+    board: Board, heuristic: LineHeuristic
+) -> Tuple[Board, Callable[[Board], float]]:
+    # the root to search from and the cheapest way to evaluate `heuristic` on
+    # every position under it: BitBoards (whose keys are packed ints) look their
+    # lines up in precomputed tables, other boards track them incrementally.
+    # tables is imported lazily so plain Board users don't pay for building it
+    if isinstance(board.key(), int):
+        from .tables import row_tables
+
+        return board, row_tables(heuristic)
+    return incremental(board, heuristic), score_incremental
@@ -0,0 +1,109 @@
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+"""
+search metrics a solver can report into through solver.stats
+
+solvers only touch it behind `if stats is not None` and swap in timed versions
+of their helpers with wrap(), so leaving Solver.stats unset costs one
+comparison per node
+"""
+
+SECTIONS = ["move", "spawn", "evaluation"]
+
+
+class MoveStats(NamedTuple):
+    turn: int
+    seconds: float
+    nodes: int
+    depth: int
+
+
+class SearchStats:
+    def __init__(self) -> None:
+        self.nodes_per_ply: List[int] = []
+        self.max_nodes = 0
+        self.chance_nodes = 0
+        self.leaves = 0
+        # children generated by max and chance nodes, for the branching factor
+        self.children = 0
+        # moved() copies and moves in one go, so "move" includes its copy and
+        # "spawn" is the copying done for chance children
+        self.time: Dict[str, float] = {section: 0.0 for section in SECTIONS}
+        self.cache: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self.moves: List[MoveStats] = []
+
+        self._move_start = 0.0
+        self._move_nodes = 0
+        self._move_depth = 0
+
+    @property
+    def nodes(self) -> int:
+        return sum(self.nodes_per_ply)
+
+    def node(self, kind: str, ply: int, children: int = 0) -> None:
+        while len(self.nodes_per_ply) <= ply:
+            self.nodes_per_ply.append(0)
+        self.nodes_per_ply[ply] += 1
+        self._move_depth = max(self._move_depth, ply)
+
+        match kind:
+            case "max":
+                self.max_nodes += 1
+            case "chance":
+                self.chance_nodes += 1
+            case "leaf":
+                self.leaves += 1
+        self.children += children
+
+    def wrap(self, section: str, function: F) -> F:
+        # `function`, adding the time spent in it to `section`
+        def timed(*args: Any) -> Any:
+            start = time.perf_counter()
+            result = function(*args)
+            self.time[section] += time.perf_counter() - start
+            return result
+
+        return cast(F, timed)
+
+    def record_cache(self, before: Dict[str, int], after: Dict[str, int]) -> None:
+        for counter in self.cache:
+            self.cache[counter] += after[counter] - before[counter]
+
+    def begin_move(self) -> None:
+        self._move_start = time.perf_counter()
+        self._move_nodes = self.nodes
+        self._move_depth = 0
+
+    def end_move(self, turn: int) -> None:
+        self.moves.append(
+            MoveStats(
+                turn=turn,
+                seconds=time.perf_counter() - self._move_start,
+                nodes=self.nodes - self._move_nodes,
+                depth=self._move_depth,
+            )
+        )
+
+    def branching_factor(self) -> float:
+        interior = self.max_nodes + self.chance_nodes
+        return self.children / interior if interior else 0.0
+
+    def as_dict(self, slowest: int = 5) -> Dict[str, Any]:
+        return {
+            "moves": len(self.moves),
+            "nodes": self.nodes,
+            "max_nodes": self.max_nodes,
+            "chance_nodes": self.chance_nodes,
+            "leaves": self.leaves,
+            "nodes_per_ply": list(self.nodes_per_ply),
+            "branching_factor": self.branching_factor(),
+            "time": dict(self.time),
+            "cache": dict(self.cache),
+            "slowest_moves": [
+                move._asdict()
+                for move in sorted(self.moves, key=lambda m: -m.seconds)[:slowest]
+            ],
+        }
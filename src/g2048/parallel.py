@@ -0,0 +1,136 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from ..utils.decorators import settings
+from .board import MOVE_BITS, MOVES, Board
+from .worker import SearchWorker
+
+"""
+root-parallel search: every legal root move searched in its own process
+
+the pool keeps one SearchWorker per core for as long as it lives, so workers
+keep their transposition tables between turns (and restarts them when the
+method's settings change). a worker only searches the
+root move it was given (Solver.root_moves) and hands back that move's value,
+the pool plays the best of them. with a timeout the pool stops waiting once
+it runs out, plays the best move whose search finished and kills the rest
+(the next search restarts them).
+
+only methods marked with parallel_roots (see solvers) are split, everything
+else runs in the calling process as usual. equal values go to the move that
+comes first in the method's root_ties, which is how its serial search breaks
+ties, so a position gets the same move either way:
+
+    with RootPool(timeout=0.5) as pool:
+        solver = Solver("expectimax", solvers.expectimax, parallel=pool)
+"""
+
+# how long to sleep between looking for finished searches
+POLL_SECONDS = 0.0005
+
+
+class RootPool:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        *,
+        timeout: Optional[float] = None,
+        seed: int = 0,
+        start_method: Optional[str] = None,
+    ) -> None:
+        # `timeout` is in seconds per move. workers are started by the first
+        # search of every method and are handed its settings (the static vars)
+        # then, whatever the start method of their processes
+        self.workers = workers or min(len(MOVES), os.cpu_count() or 1)
+        self.timeout = timeout
+        self.seed = seed
+        self.start_method = start_method
+        self.timeouts = 0
+
+        self._workers: Dict[str, List[SearchWorker]] = {}
+
+    def __enter__(self) -> "RootPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def supports(self, method: Any) -> bool:
+        return bool(getattr(method, "parallel_roots", False))
+
+    def _pool(self, method: Any) -> List[SearchWorker]:
+        method_name, current = method.__name__, settings(method)
+        workers = self._workers.get(method_name)
+        if workers is not None and workers[0].settings != current:
+            for worker in workers:
+                worker.close()
+            workers = None
+        if workers is None:
+            workers = self._workers[method_name] = [
+                SearchWorker(
+                    method_name,
+                    seed=self.seed + i,
+                    settings=current,
+                    start_method=self.start_method,
+                )
+                for i in range(self.workers)
+            ]
+        return workers
+
+    def search(self, solver: Any, board: Board) -> str:
+        # the move solver.method would choose for `board`, setting the solver's
+        # last_move, last_value and last_depth like the method does
+        legal = board.legal_moves()
+        moves = [move for move in MOVES if legal & MOVE_BITS[move]]
+        if not moves:
+            # nothing to search, the method picks its fallback
+            return solver.method(solver, board)
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        workers = self._pool(solver.method)
+        waiting = list(moves)
+        running: Dict[SearchWorker, str] = {}
+        values: Dict[str, float] = {}
+        depths: Dict[str, int] = {}
+
+        while waiting or running:
+            for worker in workers:
+                if waiting and worker not in running:
+                    move = waiting.pop(0)
+                    worker.request(board, solver.turns, roots=MOVE_BITS[move])
+                    running[worker] = move
+
+            for worker, move in list(running.items()):
+                if worker.poll() is not None:
+                    del running[worker]
+                    if worker.last_value is not None:
+                        values[move] = worker.last_value
+                        depths[move] = worker.last_depth
+
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            if running:
+                time.sleep(POLL_SECONDS)
+
+        if running or waiting:
+            self.timeouts += 1
+            for worker in running:
+                worker.cancel()
+
+        if not values:
+            # out of time before any search finished
+            solver.last_move, solver.last_value, solver.last_depth = moves[0], None, 0
+            return moves[0]
+
+        ties = getattr(solver.method, "root_ties", "".join(MOVES))
+        best = max(values, key=lambda move: (values[move], -ties.index(move)))
+        solver.last_move = best
+        solver.last_value, solver.last_depth = values[best], depths[best]
+        return best
+
+    def close(self) -> None:
+        for workers in self._workers.values():
+            for worker in workers:
+                worker.close()
+        self._workers = {}
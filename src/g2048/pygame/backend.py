@@ -0,0 +1,142 @@
+import abc
+import functools
+import os
+import time
+from collections import deque
+from typing import Deque, List, Optional, Sequence, Tuple
+
+import pygame as pg
+
+"""
+where a PyBoard draws its frames
+
+nothing is initialized until the first frame: importing this (or the board)
+doesn't touch the display or the fonts. WindowBackend is the game window,
+HeadlessBackend draws into an offscreen surface (on SDL's dummy video driver,
+so it runs without a display, e.g. in CI) and never waits on the frame rate.
+both can save every frame they show as a png and/or keep it as raw RGB bytes,
+and count frames per second:
+
+    backend = HeadlessBackend(capture="frames/{frame:05d}.png")
+    board = PyBoard(4, 4, backend=backend)
+"""
+
+# frames the fps is measured over
+FPS_WINDOW = 120
+
+
+@functools.lru_cache(maxsize=None)
+def font(size: int = 72) -> pg.font.Font:
+    pg.font.init()
+    return pg.font.SysFont("Helvetica", size)
+
+
+class Backend(abc.ABC):
+    def __init__(
+        self,
+        size: Tuple[int, int] = (800, 800),
+        *,
+        capture: Optional[str] = None,
+        raw: bool = False,
+    ) -> None:
+        # `capture` is a path with a {frame} field every shown frame is saved
+        # to, with `raw` they're kept in `buffers` too (size[0] * size[1] * 3
+        # bytes each)
+        self.size = size
+        self.capture = capture
+        self.buffers: Optional[List[bytes]] = [] if raw else None
+        self.frames = 0
+
+        self._surface: Optional[pg.Surface] = None
+        self._clock: Optional[pg.time.Clock] = None
+        self._times: Deque[float] = deque(maxlen=FPS_WINDOW)
+
+    def surface(self) -> pg.Surface:
+        if self._surface is None:
+            self._surface = self._open()
+        return self._surface
+
+    def present(self, rects: Optional[Sequence[pg.Rect]] = None) -> None:
+        # shows the frame drawn on surface(), only `rects` of it if given
+        self._present(rects)
+        self.frames += 1
+        self._times.append(time.perf_counter())
+
+        if self.capture is not None:
+            path = self.capture.format(frame=self.frames)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            pg.image.save(self.surface(), path)
+        if self.buffers is not None:
+            self.buffers.append(pg.image.tobytes(self.surface(), "RGB"))
+
+    @property
+    def fps(self) -> float:
+        # frames per second over the last FPS_WINDOW frames
+        if len(self._times) < 2:
+            return 0.0
+        return (len(self._times) - 1) / (self._times[-1] - self._times[0])
+
+    def tick(self, fps: int) -> None:
+        if self._clock is None:
+            self._clock = pg.time.Clock()
+        self._clock.tick(fps)
+
+    def close(self) -> None:
+        self._surface = None
+
+    @abc.abstractmethod
+    def _open(self) -> pg.Surface:
+        ...
+
+    @abc.abstractmethod
+    def _present(self, rects: Optional[Sequence[pg.Rect]]) -> None:
+        ...
+
+
+class WindowBackend(Backend):
+    caption = "2048"
+
+    def _open(self) -> pg.Surface:
+        surface = pg.display.set_mode(self.size)
+        pg.display.set_caption(self.caption)
+        return surface
+
+    def _present(self, rects: Optional[Sequence[pg.Rect]]) -> None:
+        if rects is None:
+            pg.display.flip()
+        elif rects:
+            pg.display.update(rects)
+
+    def close(self) -> None:
+        super().close()
+        pg.display.quit()
+
+
+class HeadlessBackend(Backend):
+    def __init__(
+        self,
+        size: Tuple[int, int] = (800, 800),
+        *,
+        capture: Optional[str] = None,
+        raw: bool = False,
+        realtime: bool = False,
+    ) -> None:
+        # `realtime` keeps tick() waiting on the frame rate like the window does
+        super().__init__(size, capture=capture, raw=raw)
+        self.realtime = realtime
+
+    def _open(self) -> pg.Surface:
+        # the display is only initialized so events (get_input) work, nothing is
+        # ever shown on it
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pg.display.init()
+        return pg.Surface(self.size)
+
+    def _present(self, rects: Optional[Sequence[pg.Rect]]) -> None:
+        pass
+
+    def tick(self, fps: int) -> None:
+        if self.realtime:
+            super().tick(fps)
@@ -0,0 +1,92 @@
+import argparse
+import json
+import sys
+import time
+from random import Random
+from typing import Dict, List, Optional
+
+from .. import solvers
+from ..bench import percentile
+from ..runner import derive_seed, place_starting_tiles
+from ..solver import Solver
+from .backend import HeadlessBackend
+from .board import PyBoard
+
+"""
+rendering throughput of PyBoard, without a display
+
+plays seeded games on a HeadlessBackend and times every render(), the same
+frames the window would draw with the solver stepping as fast as it can:
+
+    python -m src.g2048.pygame.bench --games 20
+    python -m src.g2048.pygame.bench --games 1 --capture "frames/{frame:05d}.png"
+"""
+
+
+def run(
+    *,
+    games: int = 10,
+    seed: int = 2048,
+    method: str = "closest_best_simple",
+    capture: Optional[str] = None,
+) -> Dict[str, float]:
+    backend = HeadlessBackend(capture=capture)
+    latencies: List[float] = []
+
+    for n in range(games):
+        rng = Random(derive_seed(seed, n, "board"))
+        board = PyBoard(4, 4, rng=rng, backend=backend)
+        place_starting_tiles(board)
+        solver = Solver(
+            method,
+            solvers.METHODS[method],
+            rng=Random(derive_seed(seed, n, "solver")),
+        )
+
+        while not board.done():
+            start = time.perf_counter()
+            board.render()
+            latencies.append(time.perf_counter() - start)
+
+            board.step(solver.choose(board))
+            solver.turns += 1
+
+    seconds = sum(latencies)
+    return {
+        "frames": backend.frames,
+        "seconds": seconds,
+        "fps": len(latencies) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="PyBoard rendering benchmark")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2048)
+    parser.add_argument(
+        "--method", default="closest_best_simple", choices=list(solvers.METHODS)
+    )
+    parser.add_argument("--capture", help="save frames to e.g. 'frames/{frame}.png'")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    result = run(
+        games=args.games, seed=args.seed, method=args.method, capture=args.capture
+    )
+    print(
+        f"{result['frames']} frames, {result['fps']:.1f} fps, "
+        f"p50={result['p50_ms']:.3f}ms p95={result['p95_ms']:.3f}ms "
+        f"p99={result['p99_ms']:.3f}ms"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,64 +1,90 @@
+from random import Random
+from typing import Dict, List, Optional, Tuple
+
 from ..board import Board
+from .backend import Backend, WindowBackend, font
 import pygame as pg
 
-screens = {}
-clocks = {}
+_BOARD_COLOUR = (0xFD, 0xF8, 0xD4)
+# a finished cell (background, border, number) for every tile exponent and cell
+# size, rendered the first time it's drawn and blitted from then on
+_tiles: Dict[Tuple[int, Tuple[int, int]], pg.Surface] = {}
+
+
+def _tile(value: int, size: Tuple[int, int]) -> pg.Surface:
+    exponent = value.bit_length() - 1 if value else 0
+    key = (exponent, size)
+    if key not in _tiles:
+        surface = pg.Surface(size)
+        surface.fill(_BOARD_COLOUR)
+        if value:
+            width, height = size
+            pg.draw.rect(surface, (0x80, 0x00, 0x00), pg.Rect(2, 2, width - 4, height - 4), 4)
+
+            # 72pt in the 190px cells of a 4x4 board
+            text_surface = font(max(8, height * 72 // 190)).render(str(value), False, (0x00, 0x00, 0x00))
+            surface.blit(text_surface, text_surface.get_rect(center=(width // 2, height // 2)))
+        _tiles[key] = surface.convert() if pg.display.get_surface() is not None else surface
+    return _tiles[key]
 
-pg.font.init()
-FONT = pg.font.SysFont("Helvetica", 72)
 
 class PyBoard(Board):
-    def __init__(self, width: int, height: int) -> None:
-        super().__init__(width, height)
+    def __init__(self, width: int, height: int, rng: Optional[Random] = None, backend: Optional[Backend] = None) -> None:
+        super().__init__(width, height, rng)
         self._background_colour = (0x00, 0x00, 0x00)
         self._display_width = self._display_height = 800
-        
-        _hash = hash(self)
-        if _hash not in screens:
-            screens[_hash] = pg.display.set_mode((800, 800))
-        self._hash = _hash
-        if _hash not in clocks:
-            clocks[_hash] = pg.time.Clock()
-
-        pg.display.set_caption("2048")
+
+        # opened on the first render(), copies of the board share it
+        self.backend = backend if backend is not None else WindowBackend((self._display_width, self._display_height))
         self.running = True
         
         self._FPS = 24
+        # the tile values on screen, by cell, None before the first frame
+        self._drawn: Optional[List[List[int]]] = None
 
     def render(self) -> None:
-        self._screen().fill(self._background_colour)
-        pg.draw.rect(self._screen(), (0xFD, 0xF8, 0xD4), (10, 10, self._display_width - 10 * 2, self._display_height - 10 * 2))
-        
+        # only cells whose tile changed since the last frame are redrawn, and
+        # only their rects are pushed to the display
+        cells = [list(row) for row in self]
+        drawn = self._drawn
+        full = drawn is None
+        if full:
+            self._screen().fill(self._background_colour)
+            pg.draw.rect(self._screen(), _BOARD_COLOUR, (10, 10, self._display_width - 10 * 2, self._display_height - 10 * 2))
+
         # 800 - 20 = 780 / 4 = 190
         # | | | | |
         # 2.5 190 5 190 5 190 5 190 2.5
+        # square cells, as many as fit along the board's longer side
         base_offset = 20
-        cell_width, cell_height = 190, 190
+        cell_width = cell_height = (self._display_width - 2 * base_offset) // max(self.width, self.height)
 
-        for x in range(self.height):
-            for y in range(self.width):
-                if self[x, y] == 0: continue
+        dirty = []
+        for y in range(self.height):
+            for x in range(self.width):
+                value = cells[y][x]
+                if value == (0 if drawn is None else drawn[y][x]):
+                    continue
 
                 rect = pg.Rect(base_offset + x * cell_width, base_offset + y * cell_height, cell_width, cell_height)
-                pg.draw.rect(self._screen(), (0x80, 0x00, 0x00), pg.Rect(rect.left + 2, rect.top + 2, rect.width - 4, rect.height - 4), 4)
+                self._screen().blit(_tile(value, rect.size), rect)
+                dirty.append(rect)
 
-                text_surface = FONT.render(str(self[x, y]), False, (0x00, 0x00, 0x00))
-                new_rect = text_surface.get_rect(center=rect.center)
+        # a new list rather than updating it, copies of the board share it
+        self._drawn = cells
+        self.backend.present(None if full else dirty)
 
-                self._screen().blit(text_surface, new_rect)
-
-        pg.display.flip()
+    def redraw(self) -> None:
+        # the next render() draws the whole window again
+        self._drawn = None
 
     def done(self) -> bool:
         return not self.running or super().done()
 
     def tick(self) -> None:
-        self._clock().tick(self._FPS)
-
-    def _clock(self) -> pg.time.Clock:
-        return clocks[self._hash]
+        self.backend.tick(self._FPS)
 
     def _screen(self) -> pg.Surface:
-        return screens[self._hash]
+        return self.backend.surface()
 
     
@@ -0,0 +1,83 @@
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from ..utils.cli import cls
+from .board import Board
+
+if TYPE_CHECKING:
+    from .solver import Solver
+
+
+# Solver.solve calls report() before every move and finish() once the game is over
+class Reporter:
+    def report(self, solver: "Solver", board: Board, iteration: int) -> None:
+        pass
+
+    def finish(self, solver: "Solver", board: Board, iteration: int) -> None:
+        pass
+
+
+class TerminalReporter(Reporter):
+    # the interactive view: clear the terminal and redraw the board every turn
+    def __init__(
+        self,
+        prev_score: Tuple[float, int, str] = (0, 0, ""),
+        max_score: Tuple[float, int, str] = (0, 0, ""),
+    ) -> None:
+        self.prev_score = prev_score
+        self.max_score = max_score
+
+    def report(self, solver: "Solver", board: Board, iteration: int) -> None:
+        cls()
+        print(
+            f"current_iteration={iteration}, turn={solver.turns}, current_score={(solver.method_name, board.score())}, max_score={self.max_score}, prev_score={self.prev_score}"
+        )
+        board.render()
+
+
+class LineReporter(Reporter):
+    # one status line per report, no clearing or board rendering
+    def report(self, solver: "Solver", board: Board, iteration: int) -> None:
+        print(
+            f"iteration={iteration}, method='{solver.method_name}', "
+            f"turn={solver.turns}, score={board.score()}"
+        )
+
+    def finish(self, solver: "Solver", board: Board, iteration: int) -> None:
+        print(
+            f"iteration={iteration}, method='{solver.method_name}', "
+            f"turns={solver.turns}, final_score={board.score()}"
+        )
+
+
+class SampledReporter(Reporter):
+    # forwards to `reporter` every `every_turns` turns and/or every
+    # `every_seconds` seconds, whichever comes first
+    def __init__(
+        self,
+        reporter: Reporter,
+        *,
+        every_turns: Optional[int] = None,
+        every_seconds: Optional[float] = None,
+    ) -> None:
+        if every_turns is None and every_seconds is None:
+            raise ValueError("set every_turns, every_seconds or both")
+
+        self.reporter = reporter
+        self.every_turns = every_turns
+        self.every_seconds = every_seconds
+        self._last_report = float("-inf")
+
+    def report(self, solver: "Solver", board: Board, iteration: int) -> None:
+        if self.every_turns is not None and solver.turns % self.every_turns == 0:
+            self._forward(solver, board, iteration)
+        elif self.every_seconds is not None:
+            if time.monotonic() - self._last_report >= self.every_seconds:
+                self._forward(solver, board, iteration)
+
+    def finish(self, solver: "Solver", board: Board, iteration: int) -> None:
+        self.reporter.finish(solver, board, iteration)
+
+    def _forward(self, solver: "Solver", board: Board, iteration: int) -> None:
+        self._last_report = time.monotonic()
+        self.reporter.report(solver, board, iteration)
@@ -0,0 +1,214 @@
+import abc
+import csv
+import glob
+import io
+import os
+import struct
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Type
+
+from .runner import GameResult
+
+"""
+finished games streamed to disk as they come in
+
+a writer buffers rows and appends them to `{base}.0000.csv` (or .bin) every
+`flush_every` games or `flush_seconds` seconds, starting `{base}.0001.csv` once
+a file would grow past `max_bytes`. nothing is kept once it's written, so a
+sweep of any length runs in flat memory, and closing the writer (which `with`
+does on errors and KeyboardInterrupt too) writes whatever is still buffered.
+
+the binary format is a magic followed by fixed-width little-endian records,
+see BinaryResultWriter.RECORD
+"""
+
+FIELDS = ["seed", "method", "max_tile", "turns", "moves_per_sec", "seconds"]
+
+
+class ResultRow(NamedTuple):
+    seed: int
+    method: str
+    max_tile: int
+    turns: int
+    moves_per_sec: float
+    seconds: float
+
+    @classmethod
+    def from_result(cls, result: GameResult) -> "ResultRow":
+        return cls(
+            seed=result.seed,
+            method=result.method,
+            max_tile=max(0, int(result.score)),
+            turns=result.turns,
+            moves_per_sec=result.turns / result.seconds if result.seconds else 0.0,
+            seconds=result.seconds,
+        )
+
+
+class ResultWriter(abc.ABC):
+    suffix = ""
+
+    def __init__(
+        self,
+        base: str,
+        *,
+        flush_every: int = 64,
+        flush_seconds: float = 5.0,
+        max_bytes: Optional[int] = 64 * 2**20,
+    ) -> None:
+        self.base = base
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.max_bytes = max_bytes
+        self.paths: List[str] = []
+        self.rows = 0
+
+        self._buffer: List[ResultRow] = []
+        self._file: Optional[io.BufferedWriter] = None
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+        directory = os.path.dirname(base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def write(self, result: GameResult) -> None:
+        self._buffer.append(ResultRow.from_result(result))
+        self.rows += 1
+        if (
+            len(self._buffer) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        chunk = self._encode(self._buffer)
+        self._buffer = []
+        if self._file is None or (
+            self.max_bytes is not None and self._size + len(chunk) > self.max_bytes
+        ):
+            self._rotate()
+
+        assert self._file is not None
+        self._file.write(chunk)
+        self._file.flush()
+        self._size += len(chunk)
+
+    def close(self) -> None:
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+        path = f"{self.base}.{len(self.paths):04d}{self.suffix}"
+        self.paths.append(path)
+        self._file = open(path, "wb")
+        header = self._header()
+        self._file.write(header)
+        self._size = len(header)
+
+    def _header(self) -> bytes:
+        return b""
+
+    @abc.abstractmethod
+    def _encode(self, rows: List[ResultRow]) -> bytes:
+        ...
+
+
+class CsvResultWriter(ResultWriter):
+    suffix = ".csv"
+
+    def _header(self) -> bytes:
+        return self._encode_lines([FIELDS])
+
+    def _encode(self, rows: List[ResultRow]) -> bytes:
+        return self._encode_lines(rows)
+
+    @staticmethod
+    def _encode_lines(rows: Iterable[Iterable[Any]]) -> bytes:
+        text = io.StringIO()
+        csv.writer(text, lineterminator="\n").writerows(rows)
+        return text.getvalue().encode()
+
+
+class BinaryResultWriter(ResultWriter):
+    suffix = ".bin"
+    MAGIC = b"G2048RS1"
+    # seed, method (utf-8, zero padded), max tile, turns, moves/sec, seconds
+    RECORD = struct.Struct("<Q32sIIdd")
+
+    def _header(self) -> bytes:
+        return self.MAGIC
+
+    def _encode(self, rows: List[ResultRow]) -> bytes:
+        return b"".join(
+            self.RECORD.pack(
+                row.seed,
+                row.method.encode(),
+                row.max_tile,
+                row.turns,
+                row.moves_per_sec,
+                row.seconds,
+            )
+            for row in rows
+        )
+
+
+FORMATS: Dict[str, Type[ResultWriter]] = {
+    "csv": CsvResultWriter,
+    "binary": BinaryResultWriter,
+}
+
+
+def open_writer(base: str, format: str = "csv", **kwargs: Any) -> ResultWriter:
+    return FORMATS[format](base, **kwargs)
+
+
+def result_files(base: str) -> List[str]:
+    # every file a writer with this base rotated through, in order
+    return sorted(
+        glob.glob(glob.escape(base) + ".[0-9][0-9][0-9][0-9].csv")
+        + glob.glob(glob.escape(base) + ".[0-9][0-9][0-9][0-9].bin")
+    )
+
+
+def read_results(paths: Iterable[str]) -> Iterator[ResultRow]:
+    for path in paths:
+        if path.endswith(".bin"):
+            magic, record = BinaryResultWriter.MAGIC, BinaryResultWriter.RECORD
+            with open(path, "rb") as f:
+                if f.read(len(magic)) != magic:
+                    raise ValueError(f"'{path}' is not a results file")
+                # a record cut short by a crash is dropped
+                while len(data := f.read(record.size)) == record.size:
+                    seed, method, *rest = record.unpack(data)
+                    yield ResultRow(seed, method.rstrip(b"\0").decode(), *rest)
+        else:
+            with open(path, newline="") as f:
+                for line in csv.DictReader(f):
+                    try:
+                        yield ResultRow(
+                            seed=int(line["seed"]),
+                            method=line["method"],
+                            max_tile=int(line["max_tile"]),
+                            turns=int(line["turns"]),
+                            moves_per_sec=float(line["moves_per_sec"]),
+                            seconds=float(line["seconds"]),
+                        )
+                    except (TypeError, ValueError):
+                        # same for a line cut short
+                        continue
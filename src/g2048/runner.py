@@ -0,0 +1,157 @@
+import os
+import time
+from random import Random
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from . import solvers
+from .aggregate import LatencyReporter, QuantileSketch
+from .board import Board
+from .book import OpeningBook
+from .instrumentation import SearchStats
+from .solver import Solver
+from .trace import TraceRecorder
+
+
+class GameResult(NamedTuple):
+    method: str
+    seed: int
+    score: float
+    turns: int
+    seconds: float
+    # SearchStats.as_dict() of the game, when it was played instrumented
+    stats: Optional[Dict[str, Any]] = None
+    # the game's per-move latencies
+    latency: Optional[QuantileSketch] = None
+
+
+def place_starting_tiles(board: Board) -> None:
+    rng = board.rng
+    num_of_blocks = rng.randrange(1, 4)
+    for i in range(num_of_blocks):
+        x, y = rng.randrange(0, board.width), rng.randrange(0, board.height)
+        board[(x, y)] = 4 if rng.random() > 0.7 else 2
+
+
+def derive_seed(seed: int, *path: object) -> int:
+    # seeding Random with a str hashes it with sha512, so this is stable across
+    # processes and runs (unlike hash()) and unrelated paths get unrelated streams
+    return Random("/".join(map(str, (seed, *path)))).getrandbits(63)
+
+
+def open_book(path: str, method_name: str) -> Optional[OpeningBook]:
+    # a book built by one method would make every other one play its moves, so
+    # it's only opened for the method it was built with, and created for it if
+    # it doesn't exist. an untagged book is only used while it's empty, since
+    # nothing says which method filled it
+    book = OpeningBook(path, method=method_name)
+    if book.method != method_name and (book.method or len(book)):
+        book.close()
+        return None
+    return book
+
+
+def play_game(
+    method_name: str,
+    seed: int,
+    width: int = 4,
+    height: int = 4,
+    instrument: bool = False,
+    book: Optional[str] = None,
+    trace: Optional[str] = None,
+) -> GameResult:
+    # the board (spawns) and the solver (its own random choices) get separate
+    # streams, so a solver change doesn't shift the tiles the game deals out
+    board = Board(width, height, rng=Random(derive_seed(seed, "board")))
+    place_starting_tiles(board)
+
+    solver = Solver(
+        method_name=method_name,
+        method=solvers.METHODS[method_name],
+        rng=Random(derive_seed(seed, "solver")),
+        stats=SearchStats() if instrument else None,
+        book=open_book(book, method_name) if book is not None else None,
+        recorder=(
+            TraceRecorder(meta={"method": method_name, "seed": seed})
+            if trace is not None
+            else None
+        ),
+    )
+
+    latency = LatencyReporter()
+    start = time.perf_counter()
+    try:
+        solver.solve(board, headless=True, reporter=latency)
+    finally:
+        if solver.book is not None:
+            solver.book.close()
+        if solver.recorder is not None and solver.recorder.trace is not None:
+            solver.recorder.trace.save(trace)  # type: ignore[arg-type]
+
+    return GameResult(
+        method=method_name,
+        seed=seed,
+        score=board.score(),
+        turns=solver.turns,
+        seconds=time.perf_counter() - start,
+        stats=solver.stats.as_dict() if solver.stats is not None else None,
+        latency=latency.sketch,
+    )
+
+
+def _play_task(task: Tuple[str, int, int, int, bool, Optional[str]]) -> GameResult:
+    method_name, seed, width, height, instrument, book = task
+    return play_game(method_name, seed, width, height, instrument=instrument, book=book)
+
+
+def run_games(
+    methods: List[str],
+    games: int,
+    *,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    instrument: bool = False,
+    book: Optional[str] = None,
+    width: int = 4,
+    height: int = 4,
+) -> Iterator[GameResult]:
+    # plays `games` games of every method, yielding results as soon as each game
+    # finishes, so they don't come back in submission order. game n of every
+    # method gets the same derived seed, so all methods play the same deals and a
+    # whole sweep replays from `seed`. every game opens the opening book at
+    # `book` (a path, it's memory-mapped and shared, not pickled) if given
+    tasks = [
+        (method, derive_seed(seed, n), width, height, instrument, book)
+        for method in methods
+        for n in range(games)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            yield _play_task(task)
+        return
+
+    # only keep a window of tasks in flight instead of queueing the whole sweep
+    chunk_size = chunk_size or workers * 4
+    pending = iter(tasks)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: Set[Future] = set()
+        try:
+            while True:
+                for task in pending:
+                    in_flight.add(pool.submit(_play_task, task))
+                    if len(in_flight) >= chunk_size:
+                        break
+
+                if not in_flight:
+                    break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
@@ -1,35 +1,129 @@
-from time import sleep
-from typing import Any, Callable, Tuple
+import random
+from random import Random
+from typing import Any, Callable, Optional, Tuple, cast
 
-from ..utils.cli import cls
-from .board import Board
+from .board import ALL_MOVES, MOVE_BITS, MOVES, Board
+from .book import BOOK_TURNS, OpeningBook
+from .cache import TranspositionTable
+from .instrumentation import SearchStats
+from .parallel import RootPool
+from .reporters import Reporter, TerminalReporter
+from .trace import TraceRecorder
 
 
 class Solver:
-    def __init__(self, method_name: str, method: Callable[[Any, Board], str]) -> None:
+    def __init__(
+        self,
+        method_name: str,
+        method: Callable[[Any, Board], str],
+        cache: Optional[TranspositionTable] = None,
+        rng: Optional[Random] = None,
+        stats: Optional[SearchStats] = None,
+        book: Optional[OpeningBook] = None,
+        recorder: Optional[TraceRecorder] = None,
+        parallel: Optional[RootPool] = None,
+    ) -> None:
+        if stats is not None and parallel is not None and parallel.supports(method):
+            # the searches would run in the pool's workers, where stats never
+            # sees them
+            raise ValueError(
+                f"'{method_name}' can't be instrumented while searched in parallel"
+            )
         self.method_name = method_name
         self.method = method
         self.turns = 0
+        # shared by searches across turns, see solvers.expectimax
+        self.cache = cache
+        # used by the methods for their own random choices, the global random
+        # module unless given a seeded one
+        self.rng: Random = rng if rng is not None else cast(Random, random)
+        # the previous move, the methods that cycle through moves on ties go on
+        # from it
+        self.last_move: Optional[str] = None
+        # search metrics, only collected when set
+        self.stats = stats
+        # moves of earlier games, looked up (and stored) for the first
+        # BOOK_TURNS turns of a game
+        self.book = book
+        # value and depth of the last search, for the methods that have them
+        self.last_value: Optional[float] = None
+        self.last_depth = 0
+        # writes down every move and spawn of solve(), see trace.py
+        self.recorder = recorder
+        # searches the root moves of the methods that support it in parallel,
+        # see parallel.py
+        self.parallel = parallel
+        # mask of the root moves the search methods consider (see
+        # Board.legal_moves), how a RootPool worker searches a single one
+        self.root_moves = ALL_MOVES
+
+    def choose(self, board: Board) -> str:
+        # the method's move for `board`, or the book's if it has one
+        opening = self.book is not None and self.turns < BOOK_TURNS
+        if opening:
+            entry = self.book.lookup(board)  # type: ignore[union-attr]
+            if entry is not None:
+                self.last_move = entry.move
+                return entry.move
+
+        self.last_value, self.last_depth = None, 0
+        if self.stats is not None:
+            self.stats.begin_move()
+            move = self._search(board)
+            self.stats.end_move(self.turns)
+        else:
+            move = self._search(board)
+
+        if board.full() and not board.legal_moves() & MOVE_BITS.get(move, 0):
+            # a move that changes nothing ends the game on a full board, which
+            # isn't over while anything can still merge
+            legal = board.legal_moves()
+            move = next((m for m in MOVES if legal & MOVE_BITS[m]), move)
+        self.last_move = move
+
+        if opening:
+            self.book.store(  # type: ignore[union-attr]
+                board, move, self.last_value, self.last_depth
+            )
+        return move
+
+    def _search(self, board: Board) -> str:
+        if self.parallel is not None and self.parallel.supports(self.method):
+            return self.parallel.search(self, board)
+        return self.method(self, board)
 
     def solve(
         self,
         board: Board,
-        iteration: int,
+        iteration: int = 0,
         prev_score: Tuple[float, int, str] = (0, 0, ""),
         max_score: Tuple[float, int, str] = (0, 0, ""),
+        *,
+        headless: bool = False,
+        reporter: Optional[Reporter] = None,
     ) -> None:
+        # headless runs never touch the terminal unless given a reporter
+        if reporter is None and not headless:
+            reporter = TerminalReporter(prev_score, max_score)
+
         while True:
-            cls()
-            print(
-                f"current_iteration={iteration}, turn={self.turns}, current_score={(self.method_name, board.score())}, max_score={max_score}, prev_score={prev_score}"
-            )
-            board.render()
+            if reporter is not None:
+                reporter.report(self, board, iteration)
+            if board.is_terminal():
+                break
 
-            move = self.method(self, board)
+            move = self.choose(board)
 
-            if not board.step(move):
+            if self.recorder is not None:
+                stepped = self.recorder.step(board, move)
+            else:
+                stepped = board.step(move)
+            if not stepped:
                 break
 
             self.turns += 1
 
             # sleep(0.1)
+
+        if reporter is not None:
+            reporter.finish(self, board, iteration)
@@ -1,12 +1,18 @@
 import math
-from copy import deepcopy
-from random import randrange, choice
-from typing import Tuple, Optional, List
-from functools import wraps
+import time
+from typing import Callable, Dict, List, Tuple
 
 from ..utils.decorators import static_vars
-from .board import Board
+from .board import MOVE_BITS, MOVES, Board
+from .cache import TranspositionTable
+from .incremental import (
+    PositionHeuristic,
+    TileWeightHeuristic,
+    WeightedHeuristic,
+    line_evaluator,
+)
 from .solver import Solver
+from .symmetry import SymmetricEvaluator, canonical_key
 
 
 def up_left(solver: Solver, board: Board) -> str:
@@ -20,7 +26,7 @@ def down_right(solver: Solver, board: Board) -> str:
 
 
 def random(solver: Solver, board: Board) -> str:
-    match (randrange(0, 4)):
+    match (solver.rng.randrange(0, 4)):
         case 0:
             return "w"
         case 1:
@@ -57,8 +63,7 @@ def closest_best_simple(solver: Solver, board: Board) -> str:
         return score
 
     def test_move(move: str) -> Tuple[float, str]:
-        b = deepcopy(board)
-        b.step(move)
+        b, _, _ = board.moved(move)
         return (score_position(b), move)
 
     score_up, score_left, score_down, score_right = (
@@ -70,12 +75,11 @@ def closest_best_simple(solver: Solver, board: Board) -> str:
     move = max(score_up, score_left, score_down, score_right)[1]
 
     if score_up == score_left and score_left == score_right and score_right == score_up:
-        move = ["w", "a", "s", "d"][randrange(0, 4)]
+        move = ["w", "a", "s", "d"][solver.rng.randrange(0, 4)]
 
     return move
 
 
-@static_vars(last_move=None)
 def closest_best_circular(solver: Solver, board: Board) -> str:
     def score_position(board: Board) -> float:
         score: float = 0
@@ -87,8 +91,7 @@ def closest_best_circular(solver: Solver, board: Board) -> str:
         return score
 
     def test_move(move: str) -> Tuple[float, str]:
-        b = deepcopy(board)
-        b.step(move)
+        b, _, _ = board.moved(move)
         return (score_position(b), move)
 
     score_up, score_left, score_down, score_right = (
@@ -102,166 +105,269 @@ def closest_best_circular(solver: Solver, board: Board) -> str:
     if score_up == score_left and score_left == score_right and score_right == score_up:
         moves = ["w", "a", "s", "d"]
         current_index = (
-            moves.index(closest_best_circular.last_move)
-            if closest_best_circular.last_move is not None
+            moves.index(solver.last_move)
+            if solver.last_move is not None
             else 0
         )
         current_index = (current_index + 1) % 4
         move = moves[current_index]
 
-    closest_best_circular.last_move = move
+    solver.last_move = move
     return move
 
 
-@static_vars(last_move=None)
+def score_tile_weights(board: Board) -> float:
+    score: float = 0
+    for x in range(board.width):
+        for y in range(board.height):
+            cell = board[(x, y)]
+            if cell == 0:
+                continue
+            score += cell * math.log2(cell)
+    return score
+
+
+def score_board(b: Board) -> float:
+    empty_cells = sum(1 for x in range(b.width) for y in range(b.height) if b[(x, y)] == 0)
+    max_tile = max(cell for row in b for cell in row)
+    smoothness = 0
+
+    for x in range(b.width):
+        for y in range(b.height):
+            value = b[(x, y)]
+            if value == 0:
+                continue
+            for dx, dy in [(1, 0), (0, 1)]:
+                nx, ny = x + dx, y + dy
+                if nx < b.width and ny < b.height and b[(nx, ny)] != 0:
+                    smoothness -= abs(value - b[(nx, ny)])
+
+    return (
+        empty_cells * 100
+        + math.log2(max_tile) * 10
+        + smoothness * 0.5
+    )
+
+
+# both heuristics only look at tile values and unordered neighbour pairs, so
+# they score every rotation/reflection of a board the same and can be shared
+# between symmetric positions
+symmetric_tile_weights = SymmetricEvaluator(score_tile_weights)
+symmetric_score_board = SymmetricEvaluator(score_board)
+
+
+def score_position(board: Board) -> float:
+    score = 0
+    largest_tile = max([cell for row in board for cell in row if cell > 0], default=0)
+    right, bottom = board.width - 1, board.height - 1
+
+    for x in range(board.width):
+        for y in range(board.height):
+            cell = board[(x, y)]
+            if cell == 0:
+                continue
+
+            score += cell * math.log2(cell)
+
+            if (x, y) == (0, board.height - 1):
+                score += 5 * math.log2(cell)
+            if (x, y) == (board.width - 1, board.height - 1):
+                score += 5 * math.log2(cell)
+
+            if (x, y) not in [(0, 0), (0, board.height - 1), (board.width - 1, 0), (board.width - 1, board.height - 1)]:
+                score -= 0.2 * cell
+
+            if x < board.width - 1 and board[(x + 1, y)] == cell:
+                score += 2
+            if y < board.height - 1 and board[(x, y + 1)] == cell:
+                score += 2
+
+            # near the top right and bottom right corners
+            if largest_tile > 0 and abs(x - right) + abs(y - 0) <= 2:
+                score += 0.5 * cell
+            if largest_tile > 0 and abs(x - right) + abs(y - bottom) <= 2:
+                score += 0.5 * cell
+
+    return score
+
+
+# the heuristics above as row and column terms, see incremental.line_evaluator
+board_heuristic = WeightedHeuristic()
+tile_weight_heuristic = TileWeightHeuristic()
+position_heuristic = PositionHeuristic()
+
+
+# root_ties is the order the root moves win ties in, for RootPool to break them
+# the same way. max() over (value, move) tuples prefers the greatest move
+@static_vars(symmetric=False, tables=True, parallel_roots=True, root_ties="wsda")
 def look_ahead_simple(solver: Solver, board: Board) -> str:
-    def score_position(board: Board) -> float:
-        score: float = 0
-        for x in range(board.width):
-            for y in range(board.height):
-                cell = board[(x, y)]
-                if cell == 0:
-                    continue
-                score += cell * math.log2(cell)
-        return score
+    evaluate: Callable[[Board], float] = (
+        symmetric_tile_weights if look_ahead_simple.symmetric else score_tile_weights
+    )
+    # score_tile_weights is one cheap pass over the cells, tracking it on an
+    # IncrementalBoard costs more than it saves, so only BitBoards (whose keys
+    # are packed ints) switch to table lookups
+    if look_ahead_simple.tables and not look_ahead_simple.symmetric:
+        if isinstance(board.key(), int):
+            board, evaluate = line_evaluator(board, tile_weight_heuristic)
+
+    def moved(b: Board, move: str) -> Tuple[Board, bool, int]:
+        return b.moved(move)
+
+    stats = solver.stats
+    if stats is not None:
+        evaluate = stats.wrap("evaluation", evaluate)
+        moved = stats.wrap("move", moved)
 
     def test_move(move: str, board: Board, depth: int = 2) -> Tuple[float, str]:
         if depth == 0:
             return (0, "")
 
-        b = deepcopy(board)
-        b.step(move)
-        position_score = score_position(b)
-        position_score += test_move("w", b, depth - 1)[0]
-        position_score += test_move("a", b, depth - 1)[0]
-        position_score += test_move("s", b, depth - 1)[0]
-        position_score += test_move("d", b, depth - 1)[0]
+        b, _, _ = moved(board, move)
+        position_score = evaluate(b)
+        # only moves that change the board are searched, on the last ply none are
+        legal = b.legal_moves() if depth > 1 else 0
+        if stats is not None:
+            expanded = bin(legal).count("1")
+            stats.node("max" if depth > 1 else "leaf", 5 - depth, expanded)
+
+        for child_move in MOVES:
+            if legal & MOVE_BITS[child_move]:
+                position_score += test_move(child_move, b, depth - 1)[0]
 
         return (position_score, move)
 
+    legal = board.legal_moves() & solver.root_moves
+    if stats is not None:
+        # the root is ply 0, like in expectimax
+        stats.node("max", 0, bin(legal).count("1"))
+
+    def test_root(move: str) -> Tuple[float, str]:
+        if not legal & MOVE_BITS[move]:
+            return (float("-inf"), move)
+        return test_move(move, board, 4)
+
     score_up, score_left, score_down, score_right = (
-        test_move("w", board, 4),
-        test_move("a", board, 4),
-        test_move("s", board, 4),
-        test_move("d", board, 4),
+        test_root("w"),
+        test_root("a"),
+        test_root("s"),
+        test_root("d"),
     )
 
-    move = max(score_up, score_left, score_down, score_right)[1]
+    value, move = max(score_up, score_left, score_down, score_right)
+    if legal:
+        solver.last_value, solver.last_depth = value, 4
 
     if score_up == score_left and score_left == score_right and score_right == score_up:
         moves = ["w", "a", "s", "d"]
         current_index = (
-            moves.index(look_ahead_simple.last_move)
-            if look_ahead_simple.last_move is not None
+            moves.index(solver.last_move)
+            if solver.last_move is not None
             else 0
         )
         current_index = (current_index + 1) % 4
         move = moves[current_index]
 
-    look_ahead_simple.last_move = move
+    solver.last_move = move
     return move
 
 
-@static_vars(last_move=None)
+@static_vars(incremental=True, parallel_roots=True, root_ties="wsda")
 def look_ahead_position_aware(solver: Solver, board: Board) -> str:
-    def score_position(board: Board) -> float:
-        score = 0
-        largest_tile = max([cell for row in board._data for cell in row if cell > 0], default=0)
+    evaluate: Callable[[Board], float] = score_position
+    if look_ahead_position_aware.incremental:
+        board, evaluate = line_evaluator(board, position_heuristic)
 
-        for x in range(board.width):
-            for y in range(board.height):
-                cell = board[(x, y)]
-                if cell == 0:
-                    continue
+    def moved(b: Board, move: str) -> Tuple[Board, bool, int]:
+        return b.moved(move)
 
-                score += cell * math.log2(cell)
-
-                if (x, y) == (0, board.height - 1): 
-                    score += 5 * math.log2(cell)  
-                if (x, y) == (board.width - 1, board.height - 1):
-                    score += 5 * math.log2(cell) 
-
-                if (x, y) not in [(0, 0), (0, board.height - 1), (board.width - 1, 0), (board.width - 1, board.height - 1)]:
-                    score -= 0.2 * cell 
-
-                if x < board.width - 1 and board[(x + 1, y)] == cell:
-                    score += 2 
-                if y < board.height - 1 and board[(x, y + 1)] == cell:
-                    score += 2 
-
-                if largest_tile > 0 and abs(x - 3) + abs(y - 0) <= 2: 
-                    score += 0.5 * cell
-                if largest_tile > 0 and abs(x - 3) + abs(y - 3) <= 2: 
-                    score += 0.5 * cell
-
-        return score
+    stats = solver.stats
+    if stats is not None:
+        evaluate = stats.wrap("evaluation", evaluate)
+        moved = stats.wrap("move", moved)
 
     def test_move(move: str, board: Board, depth: int = 2) -> Tuple[float, str]:
         if depth == 0:
             return (0, "")
 
-        b = deepcopy(board)
-        b.step(move) 
-        position_score = score_position(b)
+        b, _, _ = moved(board, move)
+        position_score = evaluate(b)
+        # only moves that change the board are searched, on the last ply none are
+        legal = b.legal_moves() if depth > 1 else 0
+        if stats is not None:
+            expanded = bin(legal).count("1")
+            stats.node("max" if depth > 1 else "leaf", 3 - depth, expanded)
 
-        position_score += test_move("w", b, depth - 1)[0]
-        position_score += test_move("a", b, depth - 1)[0]
-        position_score += test_move("s", b, depth - 1)[0]
-        position_score += test_move("d", b, depth - 1)[0]
+        for child_move in MOVES:
+            if legal & MOVE_BITS[child_move]:
+                position_score += test_move(child_move, b, depth - 1)[0]
 
         return (position_score, move)
 
+    legal = board.legal_moves() & solver.root_moves
+    if stats is not None:
+        # the root is ply 0, like in expectimax
+        stats.node("max", 0, bin(legal).count("1"))
+
+    def test_root(move: str) -> Tuple[float, str]:
+        if not legal & MOVE_BITS[move]:
+            return (float("-inf"), move)
+        return test_move(move, board, 2)
+
     score_up, score_left, score_down, score_right = (
-        test_move("w", board, 2),
-        test_move("a", board, 2),
-        test_move("s", board, 2),
-        test_move("d", board, 2),
+        test_root("w"),
+        test_root("a"),
+        test_root("s"),
+        test_root("d"),
     )
 
-    move = max(score_up, score_left, score_down, score_right)[1]
+    value, move = max(score_up, score_left, score_down, score_right)
+    if legal:
+        solver.last_value, solver.last_depth = value, 2
 
     if score_up == score_left and score_left == score_right and score_right == score_up:
         moves = ["w", "a", "s", "d"]
         current_index = (
-            moves.index(look_ahead_position_aware.last_move)
-            if look_ahead_position_aware.last_move is not None
+            moves.index(solver.last_move)
+            if solver.last_move is not None
             else 0
         )
         current_index = (current_index + 1) % 4 
         move = moves[current_index]
 
-    look_ahead_position_aware.last_move = move
+    solver.last_move = move
     return move
 
+@static_vars(
+    max_depth=3,
+    symmetric=False,
+    incremental=True,
+    parallel_roots=True,
+    root_ties="wasd",
+)
 def expectimax(solver: Solver, board: Board) -> str:
-    MAX_DEPTH = 3
+    MAX_DEPTH = expectimax.max_depth
 
-    def score_board(b: Board) -> float:
-        empty_cells = sum(1 for x in range(b.width) for y in range(b.height) if b[(x, y)] == 0)
-        max_tile = max(cell for row in b._data for cell in row)
-        smoothness = 0
+    # canonicalizing costs about as much as a miss saves at the default depth,
+    # so sharing evaluations between symmetric positions is opt-in
+    evaluate: Callable[[Board], float] = (
+        symmetric_score_board if expectimax.symmetric else score_board
+    )
+    board_key = canonical_key if expectimax.symmetric else lambda b: b.key()
 
-        for x in range(b.width):
-            for y in range(b.height):
-                value = b[(x, y)]
-                if value == 0:
-                    continue
-                for dx, dy in [(1, 0), (0, 1)]:
-                    nx, ny = x + dx, y + dy
-                    if nx < b.width and ny < b.height and b[(nx, ny)] != 0:
-                        smoothness -= abs(value - b[(nx, ny)])
-
-        return (
-            empty_cells * 100
-            + math.log2(max_tile) * 10
-            + smoothness * 0.5
-        )
+    # every position of the search descends from the root, so this is decided
+    # once: leaves either rescore only the lines their moves touched
+    # (IncrementalBoard) or look every line up in a table (BitBoard)
+    if expectimax.incremental and not expectimax.symmetric:
+        board, evaluate = line_evaluator(board, board_heuristic)
+
+    # a solver-owned table survives between turns, otherwise only transpositions
+    # within this search are shared
+    cache = solver.cache if solver.cache is not None else TranspositionTable()
 
-    def get_children_after_move(b: Board, move: str) -> Optional[Board]:
-        new_b = deepcopy(b)
-        if new_b.step(move):
-            return new_b
-        return None
+    def get_children_after_move(b: Board, move: str) -> Board:
+        # only called for legal moves, so the child always differs from b
+        return b.moved(move)[0]
 
     def get_all_random_children(b: Board) -> List[Tuple[Board, float]]:
         children = []
@@ -269,40 +375,265 @@ def expectimax(solver: Solver, board: Board) -> str:
             for y in range(b.height):
                 if b[(x, y)] == 0:
                     for value, prob in [(2, 0.9), (4, 0.1)]:
-                        child = deepcopy(b)
-                        child._data[y][x] = value
-                        children.append((child, prob))
+                        children.append((b.spawn((x, y), value), prob))
         return children
 
     def expectimax_value(b: Board, depth: int, is_player_turn: bool) -> float:
         if depth == 0:
-            return score_board(b)
+            if stats is not None:
+                stats.node("leaf", MAX_DEPTH - depth)
+            return evaluate(b)
 
+        key = (board_key(b), is_player_turn)
+        cached = cache.get(key, depth)
+        if cached is not None:
+            return cached
+
+        value = search_value(b, depth, is_player_turn)
+        cache.put(key, depth, value)
+        return value
+
+    def search_value(b: Board, depth: int, is_player_turn: bool) -> float:
         if is_player_turn:
             max_value = float('-inf')
+            expanded = 0
+            legal = b.legal_moves()
             for move in ['w', 'a', 's', 'd']:
-                child = get_children_after_move(b, move)
-                if child:
+                if legal & MOVE_BITS[move]:
+                    child = get_children_after_move(b, move)
+                    expanded += 1
                     value = expectimax_value(child, depth - 1, False)
                     max_value = max(max_value, value)
-            return max_value if max_value != float('-inf') else score_board(b)
+            if stats is not None:
+                stats.node("max", MAX_DEPTH - depth, expanded)
+            return max_value if max_value != float('-inf') else evaluate(b)
         else:
             children = get_all_random_children(b)
+            if stats is not None:
+                stats.node("chance", MAX_DEPTH - depth, len(children))
             if not children:
-                return score_board(b)
+                return evaluate(b)
             total = 0
             for child, prob in children:
                 total += prob * expectimax_value(child, depth - 1, True)
             return total / len(children)
 
+    stats = solver.stats
+    if stats is not None:
+        evaluate = stats.wrap("evaluation", evaluate)
+        get_children_after_move = stats.wrap("move", get_children_after_move)
+        get_all_random_children = stats.wrap("spawn", get_all_random_children)
+        cache_before = cache.stats()
+
     best_score = float('-inf')
     best_move = 'w'
+    expanded = 0
+    legal = board.legal_moves() & solver.root_moves
     for move in ['w', 'a', 's', 'd']:
-        child = get_children_after_move(board, move)
-        if child:
+        if legal & MOVE_BITS[move]:
+            child = get_children_after_move(board, move)
+            expanded += 1
             value = expectimax_value(child, MAX_DEPTH - 1, False)
             if value > best_score:
                 best_score = value
                 best_move = move
 
+    if stats is not None:
+        stats.node("max", 0, expanded)
+        stats.record_cache(cache_before, cache.stats())
+
+    solver.last_value, solver.last_depth = best_score, MAX_DEPTH
+    return best_move
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+@static_vars(
+    time_budget=0.05,
+    max_depth=8,
+    probability_cutoff=0.0001,
+    incremental=True,
+)
+def expectimax_deepening(solver: Solver, board: Board) -> str:
+    # expectimax searched one move deeper at a time until the time budget runs
+    # out, playing the best move of the deepest search that finished. chance
+    # nodes reached with a probability under probability_cutoff are evaluated
+    # instead of expanded
+    start = time.perf_counter()
+    deadline = start + expectimax_deepening.time_budget
+    cutoff = expectimax_deepening.probability_cutoff
+    moves = ["w", "a", "s", "d"]
+    evaluate: Callable[[Board], float] = score_board
+    if expectimax_deepening.incremental:
+        board, evaluate = line_evaluator(board, board_heuristic)
+
+    def max_value(b: Board, depth: int, probability: float) -> float:
+        best = float("-inf")
+        expanded = 0
+        legal = b.legal_moves()
+        for move in moves:
+            if legal & MOVE_BITS[move]:
+                child, _, _ = b.moved(move)
+                expanded += 1
+                best = max(best, chance_value(child, depth, probability))
+        if stats is not None:
+            stats.node("max", 2 * (target - depth - 1), expanded)
+        return best if best != float("-inf") else evaluate(b)
+
+    def chance_value(b: Board, depth: int, probability: float) -> float:
+        # depth is the number of moves still to search after this spawn
+        if depth == 0 or probability < cutoff:
+            if stats is not None:
+                stats.node("leaf", 2 * (target - depth) - 1)
+            return evaluate(b)
+        if time.perf_counter() > deadline:
+            raise SearchTimeout()
+
+        key = b.key()
+        cached = cache.get(key, depth)
+        if cached is not None:
+            return cached
+
+        empty_cells = b.empty_cells()
+        if stats is not None:
+            stats.node("chance", 2 * (target - depth) - 1, 2 * len(empty_cells))
+        if not empty_cells:
+            return evaluate(b)
+
+        cell_probability = probability / len(empty_cells)
+        total = 0.0
+        for cell in empty_cells:
+            for tile, prob in [(2, 0.9), (4, 0.1)]:
+                child = b.spawn(cell, tile)
+                total += prob * max_value(child, depth - 1, cell_probability * prob)
+        value = total / len(empty_cells)
+
+        cache.put(key, depth, value)
+        return value
+
+    roots = []
+    legal = board.legal_moves()
+    for move in moves:
+        if legal & MOVE_BITS[move]:
+            child, _, _ = board.moved(move)
+            roots.append((move, child))
+    if not roots:
+        return "w"
+
+    stats = solver.stats
+    if stats is not None:
+        evaluate = stats.wrap("evaluation", evaluate)
+        stats.node("max", 0, len(roots))
+
+    # the chance layer fans out over every empty cell, so that's roughly how much
+    # more the next depth costs; don't start one that can't finish in time
+    growth = max(2, 2 * len(board.empty_cells()))
+
+    best_move = roots[0][0]
+    for depth in range(1, expectimax_deepening.max_depth + 1):
+        iteration_start = time.perf_counter()
+        # values depend on the depth they were searched to, so every iteration
+        # gets its own table
+        cache = TranspositionTable()
+        cache_before = cache.stats()
+        target = depth
+        try:
+            values = [
+                (chance_value(child, depth - 1, 1.0), move) for move, child in roots
+            ]
+        except SearchTimeout:
+            break
+        finally:
+            if stats is not None:
+                stats.record_cache(cache_before, cache.stats())
+
+        best_value, best_move = max(values)
+        solver.last_value, solver.last_depth = best_value, depth
+
+        now = time.perf_counter()
+        if now + (now - iteration_start) * growth > deadline:
+            break
+
     return best_move
+
+
+@static_vars(time_budget=0.05, max_rollouts=1_000, rollout_depth=20)
+def monte_carlo(solver: Solver, board: Board) -> str:
+    # scores every move by the mean merge score of random games played after it,
+    # until the time budget (seconds per move) or the rollout count runs out
+    deadline = time.perf_counter() + monte_carlo.time_budget
+    moves = ["w", "a", "s", "d"]
+
+    rng = solver.rng
+
+    def random_tile(b: Board) -> Board:
+        return b.spawn(rng.choice(b.empty_cells()), 4 if rng.randrange(10) == 0 else 2)
+
+    def rollout(b: Board) -> float:
+        score = 0
+        for _ in range(monte_carlo.rollout_depth):
+            if not b.empty_cells():
+                break
+            b = random_tile(b)
+
+            # uniform over the moves that change the board
+            legal = b.legal_moves()
+            if not legal:
+                break
+            move = rng.choice([m for m in moves if legal & MOVE_BITS[m]])
+
+            b, _, merged = b.moved(move)
+            score += merged
+        return score
+
+    roots = []
+    legal = board.legal_moves()
+    for move in moves:
+        if legal & MOVE_BITS[move]:
+            child, _, merged = board.moved(move)
+            roots.append((move, child, merged))
+    if not roots:
+        return "w"
+
+    # a rollout stands in for evaluating the move it starts from, so each one is
+    # a leaf under the root and its time counts as evaluation
+    stats = solver.stats
+    if stats is not None:
+        rollout = stats.wrap("evaluation", rollout)
+        stats.node("max", 0, len(roots))
+
+    totals = [0.0] * len(roots)
+    rollouts = 0
+    while rollouts < monte_carlo.max_rollouts and time.perf_counter() < deadline:
+        i = rollouts % len(roots)
+        _, child, merged = roots[i]
+        totals[i] += merged + rollout(child)
+        rollouts += 1
+        if stats is not None:
+            stats.node("leaf", 1)
+
+    # every move got either the same number of rollouts or one more, so the
+    # means stay comparable
+    counts = [
+        rollouts // len(roots) + (i < rollouts % len(roots)) for i in range(len(roots))
+    ]
+    means = [total / count if count else 0 for total, count in zip(totals, counts)]
+    return roots[means.index(max(means))][0]
+
+
+# every solver by the name used in simulation results
+METHODS: Dict[str, Callable[[Solver, Board], str]] = {
+    "up-left": up_left,
+    "down-right": down_right,
+    "random": random,
+    "circular": circular,
+    "closest_best_simple": closest_best_simple,
+    "closest_best_circular": closest_best_circular,
+    "look_ahead_simple": look_ahead_simple,
+    "look_ahead_position_aware": look_ahead_position_aware,
+    "expectimax": expectimax,
+    "expectimax_deepening": expectimax_deepening,
+    "monte_carlo": monte_carlo,
+}
@@ -0,0 +1,171 @@
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from .board import Board
+from .cache import TranspositionTable
+
+"""
+the 8 symmetries of a square board (4 for rectangular ones, which can't be
+transposed) are numbered 0..7, each bit is one step applied in this order:
+
+    1   flip horizontally, x -> width - 1 - x
+    2   flip vertically, y -> height - 1 - y
+    4   transpose, (x, y) -> (y, x)
+
+so 0 is the identity and 3 is a rotation by 180 degrees
+"""
+
+FLIP_X = 1
+FLIP_Y = 2
+TRANSPOSE = 4
+
+_FLIP_X_MOVES = {"a": "d", "d": "a", "w": "w", "s": "s"}
+_FLIP_Y_MOVES = {"a": "a", "d": "d", "w": "s", "s": "w"}
+_TRANSPOSE_MOVES = {"a": "w", "w": "a", "d": "s", "s": "d"}
+_SHORT_MOVES = {"left": "a", "right": "d", "up": "w", "down": "s"}
+
+
+def symmetries(board: Board) -> range:
+    return range(8) if board.width == board.height else range(4)
+
+
+def _flip_x_int(board: int) -> int:
+    return (
+        ((board & 0x000F_000F_000F_000F) << 12)
+        | ((board & 0x00F0_00F0_00F0_00F0) << 4)
+        | ((board >> 4) & 0x00F0_00F0_00F0_00F0)
+        | ((board >> 12) & 0x000F_000F_000F_000F)
+    )
+
+
+def _flip_y_int(board: int) -> int:
+    return (
+        ((board & 0xFFFF) << 48)
+        | ((board & 0xFFFF_0000) << 16)
+        | ((board >> 16) & 0xFFFF_0000)
+        | (board >> 48)
+    )
+
+
+def transform_key(key: Hashable, symmetry: int) -> Any:
+    # BitBoard keys are packed ints, Board keys are tuples of rows; bitboard is
+    # imported lazily so plain Board users don't pay for building its tables
+    if isinstance(key, int):
+        from .bitboard import transpose
+
+        if symmetry & FLIP_X:
+            key = _flip_x_int(key)
+        if symmetry & FLIP_Y:
+            key = _flip_y_int(key)
+        if symmetry & TRANSPOSE:
+            key = transpose(key)
+        return key
+
+    rows: Any = key
+    if symmetry & FLIP_X:
+        rows = tuple(row[::-1] for row in rows)
+    if symmetry & FLIP_Y:
+        rows = rows[::-1]
+    if symmetry & TRANSPOSE:
+        rows = tuple(zip(*rows))
+    return rows
+
+
+def _variants_int(key: int, square: bool) -> List[int]:
+    from .bitboard import transpose
+
+    flipped_x = _flip_x_int(key)
+    variants = [key, flipped_x, _flip_y_int(key), _flip_y_int(flipped_x)]
+    if square:
+        variants += [transpose(variant) for variant in variants]
+    return variants
+
+
+def _variants_rows(rows: Any, square: bool) -> List[Any]:
+    # builds all of them from one row flip and one transpose, indexed by symmetry
+    flipped_x = tuple(row[::-1] for row in rows)
+    variants = [rows, flipped_x, rows[::-1], flipped_x[::-1]]
+    if square:
+        columns = tuple(zip(*rows))
+        flipped_columns = tuple(column[::-1] for column in columns)
+        variants += [columns, columns[::-1], flipped_columns]
+        variants.append(flipped_columns[::-1])
+    return variants
+
+
+def canonical(board: Board) -> Tuple[Any, int]:
+    # smallest key over every symmetry, with the symmetry that produced it
+    key = board.key()
+    square = board.width == board.height
+    if isinstance(key, int):
+        variants = _variants_int(key, square)
+    else:
+        variants = _variants_rows(key, square)
+
+    best = min(variants)
+    return best, variants.index(best)
+
+
+def canonical_key(board: Board) -> Any:
+    return canonical(board)[0]
+
+
+def apply_symmetry(board: Board, symmetry: int) -> Board:
+    key = transform_key(board.key(), symmetry)
+    if isinstance(key, int):
+        from .bitboard import BitBoard
+
+        return BitBoard.from_int(key, board.rng)  # type: ignore[return-value]
+
+    new = board.copy()
+    new._data = [list(row) for row in key]
+    if symmetry & TRANSPOSE:
+        new.width, new.height = board.height, board.width
+    return new
+
+
+def map_move(move: str, symmetry: int) -> str:
+    # the move on apply_symmetry(board, symmetry) that mirrors `move` on board
+    move = _SHORT_MOVES.get(move, move)
+    if symmetry & FLIP_X:
+        move = _FLIP_X_MOVES[move]
+    if symmetry & FLIP_Y:
+        move = _FLIP_Y_MOVES[move]
+    if symmetry & TRANSPOSE:
+        move = _TRANSPOSE_MOVES[move]
+    return move
+
+
+def unmap_move(move: str, symmetry: int) -> str:
+    # inverse of map_move, turns a move found on the canonical board back into
+    # a move on the original one
+    move = _SHORT_MOVES.get(move, move)
+    if symmetry & TRANSPOSE:
+        move = _TRANSPOSE_MOVES[move]
+    if symmetry & FLIP_Y:
+        move = _FLIP_Y_MOVES[move]
+    if symmetry & FLIP_X:
+        move = _FLIP_X_MOVES[move]
+    return move
+
+
+class SymmetricEvaluator:
+    """
+    memoizes a heuristic that gives the same score for all symmetries of a
+    board, so the 8 rotations/reflections of a position share one evaluation
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[Board], float],
+        table: Optional[TranspositionTable] = None,
+    ) -> None:
+        self.evaluate = evaluate
+        self.table = table if table is not None else TranspositionTable(200_000)
+
+    def __call__(self, board: Board) -> float:
+        key = canonical_key(board)
+        value = self.table.get(key, 0)
+        if value is None:
+            value = self.evaluate(board)
+            self.table.put(key, 0, value)
+        return value
@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import Callable, List
+
+from .bitboard import MAX_EXPONENT, ROW_MASK, _unpack_row, transpose
+from .board import Board
+from .incremental import Line, LineHeuristic
+
+"""
+LineHeuristics evaluated on BitBoards through precomputed tables
+
+a RowTables holds the heuristic's value of every one of the 65536 packed rows,
+as a row and as a (transposed) column, so scoring a board is 4 row lookups, a
+transpose and 4 column lookups, plus 4 more to find the largest tile. weights
+are baked in when the tables are built, build a new RowTables (or use
+row_tables() with another heuristic) to change them
+"""
+
+# log2 of the largest tile of every packed row
+_ROW_LARGEST: List[int] = [max(_unpack_row(row)) for row in range(ROW_MASK + 1)]
+
+
+def _tiles(row: int) -> Line:
+    return tuple(1 << e if e else 0 for e in _unpack_row(row))
+
+
+def _build(
+    lines: List[Line], score: Callable[[int, Line, int], float], positional: bool
+) -> List[List[float]]:
+    # one table per line index, or the same table for all of them
+    if not positional:
+        table = [score(0, line, 4) for line in lines]
+        return [table] * 4
+    return [[score(i, line, 4) for line in lines] for i in range(4)]
+
+
+class RowTables:
+    def __init__(self, heuristic: LineHeuristic) -> None:
+        self.heuristic = heuristic
+        lines = [_tiles(row) for row in range(ROW_MASK + 1)]
+
+        self.rows = _build(lines, heuristic.row, heuristic.positional_rows)
+        if type(heuristic).column is LineHeuristic.column:
+            self.columns = [[0.0] * (ROW_MASK + 1)] * 4
+        else:
+            self.columns = _build(
+                lines, heuristic.column, heuristic.positional_columns
+            )
+        self.largest = [
+            heuristic.largest(1 << e if e else 0) for e in range(MAX_EXPONENT + 1)
+        ]
+
+    def evaluate(self, board: int) -> float:
+        r0, r1, r2, r3 = self.rows
+        c0, c1, c2, c3 = self.columns
+
+        row0 = board & ROW_MASK
+        row1 = (board >> 16) & ROW_MASK
+        row2 = (board >> 32) & ROW_MASK
+        row3 = board >> 48
+        t = transpose(board)
+        largest = _ROW_LARGEST
+        exponent = max(largest[row0], largest[row1], largest[row2], largest[row3])
+        return (
+            r0[row0]
+            + r1[row1]
+            + r2[row2]
+            + r3[row3]
+            + c0[t & ROW_MASK]
+            + c1[(t >> 16) & ROW_MASK]
+            + c2[(t >> 32) & ROW_MASK]
+            + c3[t >> 48]
+            + self.largest[exponent]
+        )
+
+    def __call__(self, board: Board) -> float:
+        return self.evaluate(board.key())  # type: ignore[arg-type]
+
+
+@lru_cache(maxsize=None)
+def row_tables(heuristic: LineHeuristic) -> RowTables:
+    # tables are built on first use and shared by everyone using `heuristic`
+    return RowTables(heuristic)
+
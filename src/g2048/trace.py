@@ -0,0 +1,263 @@
+import argparse
+import json
+import struct
+import sys
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .board import Board
+
+"""
+game traces: the starting board, then every move with the tile it spawned
+
+a trace is everything needed to play a game again without its solver or its
+rng, so a slow or surprising game can be rerun (and profiled) deterministically.
+on disk it is
+
+    magic, width, height, flags, metadata length, metadata (json)
+    the starting board, one log2 exponent byte per cell, row by row
+    2 bytes per turn: move | 4 if a 4 spawned | 8 if anything spawned, cell
+    (4 more bytes per turn if recorded with checksums: crc32 of the cells)
+
+record one with TraceRecorder (Solver(recorder=...), main.main(trace=...),
+runner.play_game(trace=...)) and rerun it with replay():
+
+    python -m src.g2048.trace record game.trace --method expectimax --seed 7
+    python -m src.g2048.trace replay game.trace
+"""
+
+MAGIC = b"G2048TR1"
+HEADER = struct.Struct("<8sBBBH")
+TURN = struct.Struct("<BB")
+CHECKSUM = struct.Struct("<I")
+
+CHECKSUMS = 1
+
+MOVES = ["w", "a", "s", "d"]
+_SHORT_MOVES = {"up": "w", "left": "a", "down": "s", "right": "d"}
+_FOUR = 4
+_SPAWNED = 8
+
+Spawn = Optional[Tuple[int, int, int]]
+
+
+class TraceMismatch(Exception):
+    pass
+
+
+def cells(board: Board) -> bytes:
+    # the log2 exponent of every cell, row by row, for Boards and BitBoards alike
+    return bytes(
+        board[(x, y)].bit_length() - 1 if board[(x, y)] else 0
+        for y in range(board.height)
+        for x in range(board.width)
+    )
+
+
+def checksum(board: Board) -> int:
+    return zlib.crc32(cells(board))
+
+
+class Trace:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        start: bytes,
+        *,
+        checksums: bool = False,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.start = start
+        self.meta: Dict[str, Any] = meta or {}
+        self.moves: List[str] = []
+        self.spawns: List[Spawn] = []
+        self.checksums: Optional[List[int]] = [] if checksums else None
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __repr__(self) -> str:
+        size = f"{self.width}x{self.height}"
+        return f"Trace({size}, turns={len(self)}, meta={self.meta})"
+
+    def append(self, move: str, spawn: Spawn, state: Optional[int] = None) -> None:
+        self.moves.append(_SHORT_MOVES.get(move, move))
+        self.spawns.append(spawn)
+        if self.checksums is not None:
+            assert state is not None
+            self.checksums.append(state)
+
+    def to_bytes(self) -> bytes:
+        meta = json.dumps(self.meta).encode()
+        flags = CHECKSUMS if self.checksums is not None else 0
+        parts = [HEADER.pack(MAGIC, self.width, self.height, flags, len(meta))]
+        parts += [meta, self.start]
+
+        for i, (move, spawn) in enumerate(zip(self.moves, self.spawns)):
+            code, cell = MOVES.index(move), 0
+            if spawn is not None:
+                x, y, value = spawn
+                code |= _SPAWNED | (_FOUR if value == 4 else 0)
+                cell = y * self.width + x
+            parts.append(TURN.pack(code, cell))
+            if self.checksums is not None:
+                parts.append(CHECKSUM.pack(self.checksums[i]))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Trace":
+        magic, width, height, flags, meta_length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a game trace")
+
+        offset = HEADER.size
+        meta = json.loads(data[offset : offset + meta_length])
+        offset += meta_length
+        start = data[offset : offset + width * height]
+        offset += width * height
+
+        checksums = bool(flags & CHECKSUMS)
+        trace = cls(width, height, start, checksums=checksums, meta=meta)
+        step = TURN.size + (CHECKSUM.size if checksums else 0)
+        for position in range(offset, len(data) - step + 1, step):
+            code, cell = TURN.unpack_from(data, position)
+            spawn = None
+            if code & _SPAWNED:
+                value = 4 if code & _FOUR else 2
+                spawn = (cell % width, cell // width, value)
+            state = None
+            if checksums:
+                (state,) = CHECKSUM.unpack_from(data, position + TURN.size)
+            trace.append(MOVES[code & 3], spawn, state)
+        return trace
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class TraceRecorder:
+    # steps boards for a solver (or main.main) and writes down what happened
+    def __init__(
+        self, *, checksums: bool = True, meta: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self.checksums = checksums
+        self.meta = meta
+        self.trace: Optional[Trace] = None
+
+    def start(self, board: Board) -> None:
+        self.trace = Trace(
+            board.width,
+            board.height,
+            cells(board),
+            checksums=self.checksums,
+            meta=self.meta,
+        )
+
+    def step(self, board: Board, move: str) -> bool:
+        # board.step(move), recording the move and the tile it spawned
+        if self.trace is None:
+            self.start(board)
+        assert self.trace is not None
+
+        moved, _, _ = board.moved(move)
+        result = board.step(move)
+
+        spawn = None
+        for x, y in moved.empty_cells():
+            if board[(x, y)] != 0:
+                spawn = (x, y, board[(x, y)])
+                break
+
+        self.trace.append(move, spawn, checksum(board) if self.checksums else None)
+        return result
+
+
+def board_from_cells(width: int, height: int, exponents: bytes) -> Board:
+    # the inverse of cells()
+    board = Board(width, height)
+    for i, exponent in enumerate(exponents):
+        if exponent:
+            board[(i % width, i // width)] = 1 << exponent
+    return board
+
+
+def start_board(trace: Trace) -> Board:
+    return board_from_cells(trace.width, trace.height, trace.start)
+
+
+def replay(trace: Trace, *, check: bool = True) -> Board:
+    # plays the trace through a Board, no solver and no rng involved. with
+    # check (and a trace recorded with checksums) every state is compared with
+    # the recorded one, raising TraceMismatch at the first difference
+    board = start_board(trace)
+    checksums = trace.checksums if check else None
+
+    for turn, (move, spawn) in enumerate(zip(trace.moves, trace.spawns)):
+        board._apply(move)
+        if spawn is not None:
+            x, y, value = spawn
+            board[(x, y)] = value
+
+        if checksums is not None and checksum(board) != checksums[turn]:
+            raise TraceMismatch(f"turn {turn} ('{move}') diverged from the trace")
+    return board
+
+
+def replay_file(path: str, *, check: bool = True) -> Board:
+    # replays the trace at `path`, printing the final board and how fast it went
+    trace = Trace.load(path)
+    start = time.perf_counter()
+    board = replay(trace, check=check)
+    seconds = time.perf_counter() - start
+    print(board)
+    print(
+        f"---replayed {len(trace)} turns in {seconds:.3f}s "
+        f"({len(trace) / seconds:.0f} turns/s), meta={trace.meta}---"
+    )
+    return board
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from . import solvers
+    from .runner import play_game
+
+    parser = argparse.ArgumentParser(description="record and replay 2048 games")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="play a game into a trace")
+    record_parser.add_argument("path")
+    record_parser.add_argument(
+        "--method", default="expectimax", choices=list(solvers.METHODS)
+    )
+    record_parser.add_argument("--seed", type=int, default=0)
+
+    replay_parser = commands.add_parser("replay", help="rerun a recorded game")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--no-check", action="store_true")
+
+    args = parser.parse_args(argv)
+
+    match args.command:
+        case "record":
+            result = play_game(args.method, args.seed, trace=args.path)
+            print(
+                f"---recorded {result.turns} turns of '{args.method}' "
+                f"(score={result.score}, {result.seconds:.2f}s) to '{args.path}'---"
+            )
+        case "replay":
+            replay_file(args.path, check=not args.no_check)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import multiprocessing
+import queue
+from random import Random
+from typing import Any, Dict, Optional
+
+from .board import ALL_MOVES, Board
+from .trace import board_from_cells, cells
+
+"""
+searches run in a separate process, so a front-end can keep drawing and
+handling events while the solver thinks
+
+the front-end hands positions over with request() and checks for the answer
+with poll() once per frame, so its latency is one frame however deep the
+search goes. the worker process owns the Solver (and with it the transposition
+table and the solver rng) for the whole game; cancel() kills an in-flight
+search outright, the next request() starts a fresh worker
+"""
+
+def _serve(
+    method_name: str,
+    seed: int,
+    book: Optional[str],
+    settings: Dict[str, Any],
+    requests: Any,
+    moves: Any,
+) -> None:
+    from . import solvers
+    from .cache import TranspositionTable
+    from .runner import derive_seed, open_book
+    from .solver import Solver
+
+    method = solvers.METHODS[method_name]
+    for name, value in settings.items():
+        setattr(method, name, value)
+
+    solver = Solver(
+        method_name,
+        method,
+        cache=TranspositionTable(),
+        rng=Random(derive_seed(seed, "solver")),
+        book=open_book(book, method_name) if book is not None else None,
+    )
+    try:
+        # requests are (id, width, height, cell exponents, turn, root moves),
+        # None to stop
+        while (request := requests.get()) is not None:
+            request_id, width, height, exponents, turn, roots = request
+            board = board_from_cells(width, height, exponents)
+            solver.turns, solver.root_moves = turn, roots
+            move = solver.choose(board)
+            moves.put((request_id, move, solver.last_value, solver.last_depth))
+    finally:
+        if solver.book is not None:
+            solver.book.close()
+
+
+class SearchWorker:
+    def __init__(
+        self,
+        method_name: str,
+        *,
+        seed: int = 0,
+        book: Optional[str] = None,
+        settings: Optional[Dict[str, Any]] = None,
+        start_method: Optional[str] = None,
+    ) -> None:
+        # `settings` are static vars of the method to search with (see
+        # utils.decorators.settings), the worker only inherits changed ones
+        # from this process when it's forked
+        self.method_name = method_name
+        self.seed = seed
+        self.book = book
+        self.settings = settings or {}
+
+        self._context: Any = multiprocessing.get_context(start_method)
+        self._process: Optional[Any] = None
+        self._requests: Any = None
+        self._moves: Any = None
+        self._last_request = 0
+        # id of the request whose move hasn't come back yet
+        self._pending: Optional[int] = None
+        # value and depth of the search behind the last move, see Solver
+        self.last_value: Optional[float] = None
+        self.last_depth = 0
+
+    def __enter__(self) -> "SearchWorker":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def busy(self) -> bool:
+        return self._pending is not None
+
+    def _start(self) -> None:
+        self._requests = self._context.Queue()
+        self._moves = self._context.Queue()
+        self._process = self._context.Process(
+            target=_serve,
+            args=(
+                self.method_name,
+                self.seed,
+                self.book,
+                self.settings,
+                self._requests,
+                self._moves,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+
+    def request(self, board: Board, turn: int = 0, roots: int = ALL_MOVES) -> int:
+        # starts searching `board` (only the root moves in `roots`, see
+        # Solver.root_moves), replacing (and ignoring the answer to) any search
+        # still running. returns the request's id
+        if self._process is None or not self._process.is_alive():
+            self._start()
+
+        self._last_request += 1
+        self._pending = self._last_request
+        self._requests.put(
+            (self._pending, board.width, board.height, cells(board), turn, roots)
+        )
+        return self._pending
+
+    def poll(self, timeout: Optional[float] = None) -> Optional[str]:
+        # the move for the last request once it's ready, None until then.
+        # without a timeout this never blocks
+        if self._pending is None:
+            return None
+
+        while True:
+            try:
+                if timeout is None:
+                    reply = self._moves.get_nowait()
+                else:
+                    reply = self._moves.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            request_id, move, value, depth = reply
+            if request_id == self._pending:
+                self._pending = None
+                self.last_value, self.last_depth = value, depth
+                return move
+
+    def cancel(self) -> None:
+        # stops the search in flight, if any, by stopping the worker
+        if self._pending is not None:
+            self._stop(kill=True)
+
+    def close(self) -> None:
+        self._stop(kill=self._pending is not None)
+
+    def _stop(self, *, kill: bool) -> None:
+        self._pending = None
+        if self._process is None:
+            return
+
+        if kill:
+            self._process.terminate()
+        else:
+            self._requests.put(None)
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+
+        self._requests.close()
+        self._moves.close()
+        self._process = None
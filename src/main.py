@@ -1,15 +1,17 @@
-from collections import Counter
-from random import random, randrange
-from typing import List, Tuple
 import os
+import time
+from random import Random
+from typing import List, Optional
 
 # from .g2048.input import get_input
-from .g2048.pygame.input import get_input
 from .g2048 import solvers
-from .g2048.board import Board
-from .g2048.pygame.board import PyBoard
+from .g2048.aggregate import SweepStats
+from .g2048.cache import TranspositionTable
+from .g2048.results import open_writer, result_files
+from .g2048.runner import derive_seed, open_book, place_starting_tiles, run_games
 from .g2048.solver import Solver
-from .utils.cli import cls
+from .g2048.trace import TraceRecorder
+from .g2048.worker import SearchWorker
 
 """
     |---------------|
@@ -22,104 +24,186 @@ Y   |---------------|
 """
 
 
-def main() -> None:
-    board: PyBoard = PyBoard(4, 4)
+def main(
+    seed: Optional[int] = None,
+    book: Optional[str] = None,
+    trace: Optional[str] = None,
+    background: bool = True,
+    method: str = "expectimax",
+    width: int = 4,
+    height: int = 4,
+    headless: bool = False,
+) -> None:
+    # same streams as runner.play_game, so a game seen here can be replayed there.
+    # with `background` the solver searches in a worker process and the window
+    # keeps drawing and handling events at board._FPS while it does
+    # pygame is only imported (and initialized) for the window, not for auto().
+    # `headless` draws the same frames offscreen, without a display
+    from .g2048.pygame.backend import HeadlessBackend
+    from .g2048.pygame.board import PyBoard
+    from .g2048.pygame.input import get_input
+
+    if seed is None:
+        seed = Random().getrandbits(63)
+    print(f"{seed=}")
+
+    board: PyBoard = PyBoard(
+        width,
+        height,
+        rng=Random(derive_seed(seed, "board")),
+        # waiting on the frame rate leaves the cpu to a background search
+        backend=HeadlessBackend(realtime=background) if headless else None,
+    )
+
+    place_starting_tiles(board)
+
+    # with `background` this solver only counts turns, the worker searches with
+    # its own cache and book
+    solver = Solver(
+        method,
+        solvers.METHODS[method],
+        cache=None if background else TranspositionTable(),
+        rng=Random(derive_seed(seed, "solver")),
+        # only a book built by `method` is played from, like in runner.play_game
+        book=open_book(book, method) if book is not None and not background else None,
+    )
+    recorder = TraceRecorder(meta={"method": method, "seed": seed})
+    worker = SearchWorker(method, seed=seed, book=book) if background else None
 
-    num_of_blocks = randrange(1, 4)
-    for i in range(num_of_blocks):
-        x, y = randrange(0, board.width), randrange(0, board.height)
-        board[(x, y)] = 4 if random() > 0.7 else 2
-
-    solver = Solver('i-do-not-rember', solvers.expectimax)
-
-    while not board.done():
-        # cls()
-        board.render()
-
-        # move = get_input(board)
-        move = solvers.expectimax(solver, board)
-
-        allowed = ["up", "down", "left", "right"]
-        short = ["w", "s", "a", "d"]
-        if move not in allowed and move not in short:
-            continue
-
-        board.step(move)
-
-        board.tick()
+    try:
+        while not board.done():
+            # cls()
+            board.render()
+
+            if worker is not None:
+                # drains the event queue, so quitting works mid-search
+                get_input(board)
+                if board.done():
+                    break
+                if not worker.busy:
+                    worker.request(board, solver.turns)
+                move = worker.poll()
+                if move is None:
+                    board.tick()
+                    continue
+            else:
+                # move = get_input(board)
+                move = solver.choose(board)
+
+            allowed = ["up", "down", "left", "right"]
+            short = ["w", "s", "a", "d"]
+            if move not in allowed and move not in short:
+                continue
+
+            if trace is not None:
+                recorder.step(board, move)
+            else:
+                board.step(move)
+            solver.turns += 1
+
+            board.tick()
+    finally:
+        if worker is not None:
+            # kills a search still in flight instead of waiting it out
+            worker.close()
+        if solver.book is not None:
+            solver.book.close()
+        # an interrupted game is worth keeping too
+        if trace is not None and recorder.trace is not None:
+            recorder.trace.save(trace)
+            print(f"---trace written to '{trace}'---")
 
     print("\n---game over---")
     print(board)
 
 
-def auto() -> None:
-    scores: List[Tuple[float, int, str]] = []
-
-    NUMBER_OF_ITERATIONS: int = 1_000
-
-    methods = [
-        ("up-left", solvers.up_left),
-        ("down-right", solvers.down_right),
-        ("random", solvers.random),
-        ("circular", solvers.circular),
-        ("closest_best_simple", solvers.closest_best_simple),
-        ("closest_best_circular", solvers.closest_best_circular),
-        ("look_ahead_simple", solvers.look_ahead_simple),
-        ("look_ahead_position_aware", solvers.look_ahead_position_aware),
-        ("expectimax", solvers.expectimax),
-    ]
-
-    try:
-        for method in methods:
-            print(f"{method=}")
-            for n in range(NUMBER_OF_ITERATIONS):
-                board: Board = Board(4, 4)
-
-                num_of_blocks = randrange(1, 4)
-                for i in range(num_of_blocks):
-                    x, y = randrange(0, board.width), randrange(0, board.height)
-                    board[(x, y)] = 4 if random() > 0.7 else 2
-
-                solver = Solver(method_name=method[0], method=method[1])
-
-                solver.solve(
-                    board=board,
-                    iteration=n,
-                    prev_score=(scores[-1] if len(scores) > 0 else (0, 0, "")),
-                    max_score=(max(scores) if len(scores) > 0 else (0, 0, "")),
-                )
-
-                scores.append((board.score(), solver.turns, method[0]))
-    except AssertionError as e:
-        print(e)
-    except KeyboardInterrupt:
-        print("---simulation stopped---")
-        pass
+def auto(
+    workers: Optional[int] = None,
+    seed: int = 0,
+    book: Optional[str] = None,
+    format: str = "csv",
+    games: int = 1_000,
+    methods: Optional[List[str]] = None,
+    width: int = 4,
+    height: int = 4,
+) -> None:
+    NUMBER_OF_ITERATIONS: int = games
+    SUMMARY_SECONDS: float = 10.0
 
-    final_scores = sorted(Counter(scores), key=lambda x: (-x[0], x[1]))
-    print("\n---simulation done---")
-    if len(scores) > 0:
-        print(f"max_score={final_scores[0]}")
-    print("scores")
-    for score in final_scores:
-        print(f"\tmethod='{score[2]}'\t\t\tscore={score[0]}\tturns={score[1]}")
+    methods = methods or list(solvers.METHODS)
 
-    base_filename = "results/simulation_results.txt"
+    base_filename = "results/simulation_results"
     filename = base_filename
     counter = 1
 
-    while os.path.exists(filename):
-        name, ext = os.path.splitext(base_filename)
-        filename = f"{name}_{counter}{ext}"
+    while result_files(filename) or os.path.exists(f"{filename}.txt"):
+        filename = f"{base_filename}_{counter}"
         counter += 1
 
-    with open(filename, "w") as f:
-        if len(scores) > 0:
+    # every game goes to disk as it finishes and is folded into the per-method
+    # stats, nothing else of it is kept. the stats are printed every
+    # SUMMARY_SECONDS while the sweep runs
+    stats = SweepStats()
+    last_summary = time.monotonic()
+
+    with open_writer(filename, format) as writer:
+        try:
+            for result in run_games(
+                methods,
+                NUMBER_OF_ITERATIONS,
+                seed=seed,
+                workers=workers,
+                book=book,
+                width=width,
+                height=height,
+            ):
+                writer.write(result)
+                stats.add(result)
+                print(
+                    f"game={writer.rows}/{len(methods) * NUMBER_OF_ITERATIONS}, "
+                    f"method='{result.method}', seed={result.seed}, "
+                    f"score={result.score}, turns={result.turns}"
+                )
+                if time.monotonic() - last_summary > SUMMARY_SECONDS:
+                    print(f"\n{stats.summary()}\n")
+                    last_summary = time.monotonic()
+        except AssertionError as e:
+            print(e)
+        except KeyboardInterrupt:
+            print("---simulation stopped---")
+            pass
+
+    final_scores = sorted(
+        (
+            (method.best[0], method.best[1], method.method)
+            for method in stats.methods.values()
+            if method.best is not None
+        ),
+        key=lambda x: (-x[0], x[1]),
+    )
+    print("\n---simulation done---")
+    if len(final_scores) > 0:
+        print(f"max_score={final_scores[0]}")
+    print("best scores")
+    for score in final_scores:
+        print(
+            f"\tmethod='{score[2]}'\t\t\tscore={score[0]}\tturns={score[1]}"
+            f"\tgames={stats.methods[score[2]].games}"
+        )
+    print(f"\n{stats.summary()}")
+
+    with open(f"{filename}.txt", "w") as f:
+        if len(final_scores) > 0:
             f.write(
-                f"max_score: method={final_scores[0][2]}, score={final_scores[0][0]}, turns={final_scores[0][1]}\n"
+                f"max_score: method={final_scores[0][2]}, "
+                f"score={final_scores[0][0]}, turns={final_scores[0][1]}\n"
             )
-        f.write("scores\n")
+        f.write("best scores\n")
         for score in final_scores:
-            print(f"\tmethod='{score[2]}'\t\t\tscore={score[0]}\tturns={score[1]}\n")
+            f.write(
+                f"\tmethod='{score[2]}'\t\t\tscore={score[0]}\tturns={score[1]}"
+                f"\tgames={stats.methods[score[2]].games}\n"
+            )
+        f.write(f"\n{stats.summary()}\n")
 
-    print(f"\n---results written to '{filename}'---")
+    print(f"\n---results written to {writer.paths}, summary to '{filename}.txt'---")
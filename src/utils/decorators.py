@@ -1,10 +1,18 @@
-from typing import Any, Callable
+from typing import Any, Callable, Dict
 
 
 def static_vars(**kwargs: Any) -> Callable:
     def decorate(func: Callable) -> Callable:
         for k in kwargs:
             setattr(func, k, kwargs[k])
+        # their names, so their current values can be read back (see settings)
+        setattr(func, "static_vars", tuple(kwargs))
         return func
 
     return decorate
+
+
+def settings(func: Callable) -> Dict[str, Any]:
+    # the current values of func's static vars, e.g. to hand them to another
+    # process, which starts out with the values func was declared with
+    return {k: getattr(func, k) for k in getattr(func, "static_vars", ())}
@@ -0,0 +1,45 @@
+from random import Random
+from typing import Any, Callable, Sequence
+
+import pytest
+
+from src.g2048.board import Board
+
+"""
+board factories shared by the test modules, handed out as fixtures:
+
+    def test_moved(make_board: Callable[..., Any]) -> None:
+        board = make_board([[2, 2, 0, 0], [0, 0, 0, 0], ...])
+        bitboard = make_board(list(board), BitBoard)
+"""
+
+
+def _make_board(
+    rows: Sequence[Sequence[int]], board_class: Callable[[int, int], Any] = Board
+) -> Any:
+    # a board_class board holding `rows`, rows[y][x] being the tile at (x, y)
+    board = board_class(len(rows[0]), len(rows))
+    for y, row in enumerate(rows):
+        for x, value in enumerate(row):
+            board[(x, y)] = value
+    return board
+
+
+def _random_board(
+    board: Board, rng: Random, values: Sequence[int] = (0, 0, 2, 4, 8, 16)
+) -> Board:
+    # fills every cell of `board` with one of `values`
+    for x in range(board.width):
+        for y in range(board.height):
+            board[(x, y)] = rng.choice(values)
+    return board
+
+
+@pytest.fixture
+def make_board() -> Callable[..., Any]:
+    return _make_board
+
+
+@pytest.fixture
+def random_board() -> Callable[..., Board]:
+    return _random_board
@@ -0,0 +1,140 @@
+import statistics
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from src.g2048.aggregate import Moments, QuantileSketch, SweepStats
+from src.g2048.results import ResultRow, open_writer, read_results, result_files
+from src.g2048.runner import GameResult, play_game
+
+
+def rows(count: int, seed: int = 0) -> list:
+    rng = Random(seed)
+    return [
+        ResultRow(
+            seed=n,
+            method=["expectimax", "random"][n % 2],
+            max_tile=2 ** rng.randrange(6, 13),
+            turns=rng.randrange(100, 2_000),
+            moves_per_sec=rng.uniform(10, 1_000),
+            seconds=rng.uniform(0.1, 10),
+        )
+        for n in range(count)
+    ]
+
+
+def test_moments_match_statistics() -> None:
+    rng = Random(1)
+    values = [rng.gauss(1_000, 50) for _ in range(1_000)]
+    moments = Moments()
+    for value in values:
+        moments.add(value)
+
+    assert moments.count == 1_000
+    assert moments.mean == pytest.approx(statistics.mean(values))
+    assert moments.variance == pytest.approx(statistics.variance(values))
+    assert (moments.min, moments.max) == (min(values), max(values))
+
+
+def test_merged_moments_match_one_pass() -> None:
+    rng = Random(2)
+    values = [rng.expovariate(0.01) for _ in range(500)]
+    whole, parts = Moments(), [Moments() for _ in range(3)]
+    for n, value in enumerate(values):
+        whole.add(value)
+        parts[n % 7 % 3].add(value)
+
+    merged = Moments()
+    for part in [*parts, Moments()]:
+        merged.merge(part)
+    assert merged.count == whole.count
+    assert merged.mean == pytest.approx(whole.mean)
+    assert merged.variance == pytest.approx(whole.variance)
+
+
+def test_quantiles_are_within_the_accuracy() -> None:
+    rng = Random(3)
+    values = sorted(rng.lognormvariate(-6, 1.5) for _ in range(10_000))
+    sketch = QuantileSketch(accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    for fraction in [0.0, 0.1, 0.5, 0.9, 0.99, 1.0]:
+        exact = values[int(fraction * (len(values) - 1))]
+        assert sketch.quantile(fraction) == pytest.approx(exact, rel=0.01)
+    assert len(sketch.buckets) < 1_000
+
+
+def test_sketches_merge_and_stay_bounded() -> None:
+    rng = Random(4)
+    values = [rng.uniform(0, 1) for _ in range(2_000)]
+    whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for n, value in enumerate(values):
+        whole.add(value)
+        (left if n % 2 else right).add(value)
+    left.merge(right)
+    assert left == whole and left.count == 2_000
+
+    with pytest.raises(ValueError):
+        left.merge(QuantileSketch(accuracy=0.05))
+
+    small = QuantileSketch(max_buckets=16)
+    for value in values:
+        small.add(value)
+    assert len(small.buckets) == 16
+    assert small.quantile(0.99) == pytest.approx(0.99, rel=0.05)
+
+
+def test_sweep_stats() -> None:
+    stats = SweepStats.from_rows(rows(200))
+    random = [row for row in rows(200) if row.method == "random"]
+    method = stats.methods["random"]
+
+    assert stats.games == 200 and method.games == 100
+    assert method.turns.mean == pytest.approx(statistics.mean(r.turns for r in random))
+    assert method.reach_rate(2048) == sum(r.max_tile >= 2048 for r in random) / 100
+    assert method.reach_rate(64) == 1.0
+    best = max(random, key=lambda r: (r.max_tile, -r.turns))
+    assert method.best == (best.max_tile, best.turns)
+    assert "expectimax" in stats.summary() and "random" in stats.summary()
+
+
+def test_partial_sweeps_merge_into_the_whole_one() -> None:
+    whole = SweepStats.from_rows(rows(300))
+    merged = SweepStats()
+    for part in [rows(300)[:100], rows(300)[100:250], rows(300)[250:]]:
+        merged.merge(SweepStats.from_rows(part))
+
+    for name, method in whole.methods.items():
+        other = merged.methods[name]
+        assert other.games == method.games
+        assert other.max_tiles == method.max_tiles
+        assert other.best == method.best
+        assert other.moves_per_sec.mean == pytest.approx(method.moves_per_sec.mean)
+        assert other.turns.variance == pytest.approx(method.turns.variance)
+
+
+def test_games_carry_their_move_latencies(tmp_path: Path) -> None:
+    result = play_game("up-left", 5)
+    assert result.latency is not None
+    assert result.latency.count == result.turns
+    assert 0 < result.latency.quantile(0.5) < result.seconds
+
+    stats = SweepStats()
+    stats.add(result)
+    assert stats.methods["up-left"].latency == result.latency
+
+    # results files keep no latencies, but everything else reads back the same
+    base = str(tmp_path / "results")
+    with open_writer(base) as writer:
+        writer.write(result)
+    read = SweepStats.from_rows(read_results(result_files(base)))
+    assert read.methods["up-left"].best == stats.methods["up-left"].best
+    assert read.methods["up-left"].latency.count == 0
+
+
+def test_results_without_latencies() -> None:
+    stats = SweepStats()
+    stats.add(GameResult("random", 1, 256.0, 100, 0.5))
+    assert stats.methods["random"].moves_per_sec.mean == 200.0
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from random import Random
+from typing import Any
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from src.g2048.pygame.backend import Backend, HeadlessBackend  # noqa: E402
+from src.g2048.pygame.board import PyBoard  # noqa: E402
+
+
+def test_headless_frames_match_full_redraws() -> None:
+    backend = HeadlessBackend((800, 800), raw=True)
+    board = PyBoard(4, 4, rng=Random(1), backend=backend)
+    board[(0, 0)] = 2
+    board.render()
+    board.step("d")
+    board.render()
+    board.render()
+    assert backend.frames == len(backend.buffers or []) == 3
+
+    # an incrementally drawn frame is the same as one drawn from scratch
+    board.redraw()
+    board.render()
+    assert backend.buffers is not None
+    assert backend.buffers[-1] == backend.buffers[-2]
+    assert backend.buffers[-1] != backend.buffers[0]
+    assert backend.fps > 0
+
+
+def test_capture_saves_pngs(tmp_path: Path) -> None:
+    backend = HeadlessBackend(capture=str(tmp_path / "frames" / "{frame:03d}.png"))
+    board = PyBoard(4, 4, backend=backend)
+    board.render()
+    board.render()
+
+    assert sorted(os.listdir(tmp_path / "frames")) == ["001.png", "002.png"]
+
+
+def test_backends_must_open_and_present() -> None:
+    class Incomplete(Backend):
+        def _open(self) -> Any:
+            return pygame.Surface(self.size)
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
+
+
+def test_main_does_not_import_pygame() -> None:
+    # the CLI entry points only pay for pygame when a window is opened
+    code = "import sys, src.main; sys.exit('pygame' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
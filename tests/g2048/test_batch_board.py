@@ -0,0 +1,99 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+import pytest
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+np = pytest.importorskip("numpy")
+
+from src.g2048 import batch_solvers  # noqa: E402
+from src.g2048.batch_board import MOVES, BatchBoard  # noqa: E402
+from src.g2048.board import Board  # noqa: E402
+from src.g2048.runner import run_games  # noqa: E402
+
+
+@pytest.fixture
+def to_board(make_board: Callable[..., Any]) -> Callable[["npt.NDArray[Any]"], Board]:
+    # the Board of one game's cell exponents
+    def convert(cells: "npt.NDArray[Any]") -> Board:
+        return make_board([[1 << int(e) if e else 0 for e in row] for row in cells])
+
+    return convert
+
+
+def test_moved_matches_board(to_board: Callable[["npt.NDArray[Any]"], Board]) -> None:
+    rng = np.random.default_rng(4)
+    batch = BatchBoard(300, seed=5)
+    batch.cells[:] = rng.choice([0, 0, 1, 1, 2, 3, 4], (300, 4, 4))
+    moves = rng.integers(0, 4, 300)
+
+    new, changed, scores = batch.moved(moves)
+
+    for n in range(300):
+        expected, expected_changed, expected_score = to_board(batch.cells[n]).moved(
+            str(MOVES[moves[n]])
+        )
+        assert list(to_board(new[n])) == list(expected)
+        assert (changed[n], scores[n]) == (expected_changed, expected_score)
+
+
+def test_step_spawns_and_ends_games() -> None:
+    batch = BatchBoard(2, seed=6)
+    batch.cells[0, 0, 0] = 1
+    batch.cells[1] = np.indices((4, 4)).sum(axis=0) % 2 + 1
+
+    alive = batch.step(np.array([2, 0]))
+
+    assert alive.tolist() == [True, False]
+    assert (batch.cells[0] != 0).sum() == 2
+    assert batch.turns.tolist() == [1, 0]
+
+
+def test_play_finishes_every_game() -> None:
+    batch = batch_solvers.play(batch_solvers.random, 200, seed=7)
+
+    assert batch.done()
+    assert batch.full().all()
+    assert (batch.turns > 0).all()
+    assert (batch.score() >= 2).all()
+
+
+def test_legal_moves_match_board(
+    to_board: Callable[["npt.NDArray[Any]"], Board],
+) -> None:
+    rng = np.random.default_rng(8)
+    batch = BatchBoard(300, seed=9)
+    batch.cells[:] = rng.choice([1, 1, 2, 3, 4], (300, 4, 4))
+    batch.cells[::3, 0, 0] = 0
+
+    legal = batch.legal_moves()
+
+    for n in range(300):
+        assert legal[n] == to_board(batch.cells[n]).legal_moves()
+
+
+def test_dead_moves_on_full_boards_play_a_legal_one() -> None:
+    batch = BatchBoard(1, seed=10)
+    batch.cells[0] = np.indices((4, 4)).sum(axis=0) % 2 + 1
+    batch.cells[0, 3, 2] = batch.cells[0, 3, 3]
+
+    # left merges the last row, up changes nothing
+    assert batch.step(np.array([0])).tolist() == [True]
+    assert batch.turns.tolist() == [1]
+
+
+@pytest.mark.parametrize("method", ["up-left", "circular"])
+def test_batches_play_like_the_runner(method: str) -> None:
+    # different random streams, so only the averages can agree
+    batch = batch_solvers.play(batch_solvers.METHODS[method], 2_000, seed=11)
+    results = list(run_games([method], 300, seed=11, workers=1))
+
+    # and like Solver.solve, every game ran until nothing could move
+    batch.alive[:] = True
+    assert not batch.legal_moves().any()
+
+    turns = sum(result.turns for result in results) / len(results)
+    score = sum(result.score for result in results) / len(results)
+    assert batch.turns.mean() == pytest.approx(turns, rel=0.03)
+    assert batch.score().mean() == pytest.approx(score, rel=0.06)
@@ -0,0 +1,32 @@
+from src.g2048 import bench
+
+
+def test_positions_are_reproducible() -> None:
+    first = [list(board) for board in bench.positions(5, seed=1)]
+    second = [list(board) for board in bench.positions(5, seed=1)]
+
+    assert first == second
+    assert len(first) == 5
+
+
+def test_run_reports_every_benchmark() -> None:
+    results = bench.run(count=2, min_seconds=0, methods=["circular", "expectimax"])
+
+    assert "board.step" in results
+    assert "heuristic.score_board" in results
+    assert results["solver.expectimax"]["nodes"] > 0
+    assert results["solver.circular"]["p50_ms"] <= results["solver.circular"]["p99_ms"]
+
+
+def test_compare() -> None:
+    baseline = {"a": {"calls_per_sec": 100.0}, "b": {"calls_per_sec": 100.0}}
+    current = {
+        "a": {"calls_per_sec": 95.0},
+        "b": {"calls_per_sec": 50.0},
+        "c": {"calls_per_sec": 1.0},
+    }
+
+    regressions = bench.compare(current, baseline, tolerance=0.1)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b:")
@@ -0,0 +1,109 @@
+from copy import deepcopy
+from random import Random
+from typing import Any, Callable
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bitboard import BitBoard, transpose
+from src.g2048.board import Board
+from src.g2048.solver import Solver
+
+
+@pytest.fixture
+def random_boards(
+    make_board: Callable[..., Any], random_board: Callable[..., Board]
+) -> Callable[..., list]:
+    # (board, the same bitboard) pairs
+    def boards(count: int, seed: int = 2048) -> list:
+        rng = Random(seed)
+        pairs = []
+        for _ in range(count):
+            board = random_board(Board(4, 4), rng, [0, 0, 2, 2, 4, 8, 16, 32])
+            pairs.append((board, make_board(list(board), BitBoard)))
+        return pairs
+
+    return boards
+
+
+def test_cells_round_trip() -> None:
+    bitboard = BitBoard(4, 4)
+    bitboard[(1, 2)] = 32768
+    bitboard[(3, 0)] = 2
+
+    assert bitboard[(1, 2)] == 32768
+    assert bitboard[(3, 0)] == 2
+    assert bitboard[(0, 0)] == 0
+    assert bitboard.score() == 32768
+    assert list(bitboard)[2] == [0, 32768, 0, 0]
+
+
+def test_tiles_stop_at_32768() -> None:
+    bitboard = BitBoard(4, 4)
+    with pytest.raises(ValueError):
+        bitboard[(0, 0)] = 65536
+    assert bitboard.key() == 0
+
+    # two 32768s have no nibble to merge into, smaller tiles still merge
+    bitboard[(0, 0)] = bitboard[(1, 0)] = 32768
+    bitboard[(2, 0)] = bitboard[(3, 0)] = 16384
+    moved, changed, merged = bitboard.moved("a")
+    assert list(moved)[0] == [32768, 32768, 32768, 0]
+    assert (changed, merged) == (True, 32768)
+    assert sorted(moved.empty_cells()) == sorted(bitboard.empty_cells() + [(3, 0)])
+
+
+def test_transpose(random_boards: Callable[..., list]) -> None:
+    for _, bitboard in random_boards(50):
+        transposed = BitBoard.from_int(transpose(bitboard._board))
+        for x in range(4):
+            for y in range(4):
+                assert transposed[(y, x)] == bitboard[(x, y)]
+
+
+def test_shifts_match_board(random_boards: Callable[..., list]) -> None:
+    for board, bitboard in random_boards(500):
+        for shift in ["shift_up", "shift_down", "shift_left", "shift_right"]:
+            expected, actual = deepcopy(board), deepcopy(bitboard)
+            getattr(expected, shift)()
+            getattr(actual, shift)()
+            assert list(actual) == list(expected), (list(board), shift)
+
+
+def test_full() -> None:
+    bitboard = BitBoard(4, 4)
+    assert not bitboard.full()
+
+    for x in range(4):
+        for y in range(4):
+            bitboard[(x, y)] = 2 if (x + y) % 2 else 4
+    assert bitboard.full()
+    assert not bitboard.step("w")
+
+
+def test_solvers_run_unchanged(random_boards: Callable[..., list]) -> None:
+    _, bitboard = random_boards(1)[0]
+    for method in [
+        solvers.up_left,
+        solvers.closest_best_simple,
+        solvers.look_ahead_position_aware,
+        solvers.expectimax,
+    ]:
+        move = method(Solver(method.__name__, method), deepcopy(bitboard))
+        assert move in ["w", "a", "s", "d"]
+
+
+def test_moved_matches_board(random_boards: Callable[..., list]) -> None:
+    for board, bitboard in random_boards(200, seed=4096):
+        for move in ["w", "a", "s", "d"]:
+            expected, expected_changed, expected_merged = board.moved(move)
+            actual, changed, merged = bitboard.moved(move)
+            assert list(actual) == list(expected)
+            assert (changed, merged) == (expected_changed, expected_merged)
+        assert bitboard.empty_cells() == board.empty_cells()
+
+
+def test_legal_moves_match_board(random_boards: Callable[..., list]) -> None:
+    for board, bitboard in random_boards(200, seed=8192):
+        assert bitboard.legal_moves() == board.legal_moves()
+        assert bitboard.is_terminal() == board.is_terminal()
@@ -0,0 +1,108 @@
+from random import Random
+from typing import Any, Callable
+
+from src.g2048.board import DOWN, MOVE_BITS, MOVES, RIGHT, UP, Board
+
+
+def test_moved_is_pure(make_board: Callable[..., Any]) -> None:
+    board = make_board([[0, 0, 4, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 2]])
+    before = [row[:] for row in board]
+
+    after, changed, merged = board.moved("a")
+
+    assert changed
+    assert list(board) == before
+    assert list(after)[0] == [4, 0, 0, 0]
+    assert list(after)[3] == [2, 0, 0, 0]
+    assert merged == 0
+
+
+def test_moved_unchanged(make_board: Callable[..., Any]) -> None:
+    board = make_board([[2, 4, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+
+    after, changed, merged = board.moved("a")
+
+    assert not changed
+    assert merged == 0
+    assert list(after) == list(board)
+    assert after is not board
+
+
+def test_moved_merge_score(make_board: Callable[..., Any]) -> None:
+    board = make_board([[2, 2, 0, 0], [4, 0, 4, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+
+    after, _, merged = board.moved("left")
+
+    assert list(after)[:2] == [[4, 0, 0, 0], [8, 0, 0, 0]]
+    assert merged == 12
+
+
+def test_spawn() -> None:
+    board = Board(4, 4)
+
+    child = board.spawn((1, 3), 4)
+
+    assert child[(1, 3)] == 4
+    assert board[(1, 3)] == 0
+    assert (1, 3) not in child.empty_cells()
+    assert len(child.empty_cells()) == 15
+
+
+def test_legal_moves(make_board: Callable[..., Any]) -> None:
+    board = make_board([[2, 4, 0, 0], [4, 2, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]])
+    assert board.legal_moves() == DOWN | RIGHT
+
+    full = make_board([[2, 4, 2, 4], [4, 2, 4, 2], [2, 4, 2, 4], [4, 2, 4, 8]])
+    assert full.legal_moves() == 0
+    assert full.is_terminal() and full.done()
+    assert not full.step("w")
+
+    # full, but the two 8s still merge
+    full[(3, 2)] = 8
+    assert full.legal_moves() == UP | DOWN
+    assert not full.is_terminal()
+
+
+def test_legal_moves_match_moved(make_board: Callable[..., Any]) -> None:
+    rng = Random(7)
+    for _ in range(200):
+        board = make_board(
+            [[rng.choice([0, 2, 2, 4, 8]) for _ in range(4)] for _ in range(4)]
+        )
+        legal = board.legal_moves()
+        for move in MOVES:
+            assert bool(legal & MOVE_BITS[move]) == board.moved(move)[1]
+
+
+def test_rectangular_boards() -> None:
+    board = Board(5, 3)
+    assert list(board) == [[0] * 5] * 3
+    board[(4, 2)] = 2
+    board[(4, 0)] = 2
+    board[(0, 2)] = 4
+
+    up, changed, merged = board.moved("w")
+    assert changed and merged == 4
+    assert list(up) == [[4, 0, 0, 0, 4], [0] * 5, [0] * 5]
+
+    left, _, _ = board.moved("a")
+    assert list(left) == [[2, 0, 0, 0, 0], [0] * 5, [4, 2, 0, 0, 0]]
+
+    board.reset()
+    assert board.empty_cells() == [(x, y) for y in range(3) for x in range(5)]
+
+
+def test_long_rows_match_short_ones() -> None:
+    # an 8x8 board holding a 4x4 one in its top left corner plays the same
+    # moves towards that corner
+    rng = Random(3)
+    for _ in range(50):
+        small, big = Board(4, 4), Board(8, 8)
+        for x in range(4):
+            for y in range(4):
+                small[(x, y)] = big[(x, y)] = rng.choice([0, 2, 2, 4, 8])
+        for move in ["w", "a"]:
+            expected, _, expected_merged = small.moved(move)
+            actual, _, merged = big.moved(move)
+            assert [row[:4] for row in list(actual)[:4]] == list(expected)
+            assert merged == expected_merged
@@ -0,0 +1,151 @@
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bitboard import BitBoard
+from src.g2048.board import Board
+from src.g2048.book import RECORD, OpeningBook, canonical, compact, merge
+from src.g2048.runner import open_book, run_games
+from src.g2048.solver import Solver
+
+
+@pytest.fixture
+def board(make_board: Callable[..., Any]) -> Board:
+    return make_board([[2, 0, 0, 0], [4, 0, 0, 0], [8, 0, 0, 0], [16, 2, 0, 0]])
+
+
+def test_put_get(tmp_path: Path) -> None:
+    with OpeningBook(str(tmp_path / "book"), slots=64) as book:
+        assert book.get(1234) is None
+        assert book.put(1234, "a", 1.5, 3)
+        assert book.get(1234) == ("a", 1.5, 3)
+
+        # deeper entries win, shallower ones don't replace them
+        assert not book.put(1234, "d", 0.0, 2)
+        assert book.put(1234, "w", 2.5, 4)
+        assert book.get(1234) == ("w", 2.5, 4)
+        assert len(book) == 1
+
+
+def test_symmetric_positions_share_entries(
+    tmp_path: Path, board: Board, make_board: Callable[..., Any]
+) -> None:
+    mirrored = make_board([[0, 0, 0, 2], [0, 0, 0, 4], [0, 0, 0, 8], [0, 0, 2, 16]])
+
+    with OpeningBook(str(tmp_path / "book"), slots=64) as book:
+        book.store(board, "a", 1.0, 3)
+
+        assert book.lookup(mirrored) == ("d", 1.0, 3)
+        bitboard = make_board(list(board), BitBoard)
+        assert book.lookup(bitboard) == ("a", 1.0, 3)
+
+
+def test_torn_records_read_as_misses(tmp_path: Path, board: Board) -> None:
+    with OpeningBook(str(tmp_path / "book"), slots=8) as book:
+        book.store(board, "s", 1.0, 3)
+        key, _ = canonical(board)  # type: ignore[misc]
+        offset = next(
+            book._offset(slot)
+            for slot in range(book.slots)
+            if RECORD.unpack_from(book._map, book._offset(slot))[1]
+        )
+        check, data = RECORD.unpack_from(book._map, offset)
+        RECORD.pack_into(book._map, offset, check, data ^ 1 << 40)
+
+        assert book.get(key) is None
+
+
+def test_merge_and_compact(tmp_path: Path) -> None:
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    with OpeningBook(first, slots=1024, method="expectimax") as book:
+        for key in range(1, 101):
+            book.put(key, "a", 0.0, 1)
+    with OpeningBook(second, slots=1024, method="expectimax") as book:
+        for key in range(51, 151):
+            book.put(key, "d", 0.0, 2)
+
+    merge(first, [second])
+    with OpeningBook(first, readonly=True) as book:
+        assert len(book) == 150
+        assert book.get(10) == ("a", 0.0, 1)
+        assert book.get(60) == ("d", 0.0, 2)
+
+    assert compact(first) == 150
+    with OpeningBook(first, readonly=True) as book:
+        assert book.slots == 600
+        assert book.method == "expectimax"
+        assert book.get(150) == ("d", 0.0, 2)
+
+    # shrinking below the entry count keeps the deepest entries
+    kept = compact(first, slots=40)
+    with OpeningBook(first, readonly=True) as book:
+        assert len(book) == kept <= 40
+        assert all(entry.depth == 2 for _, entry in book)
+
+    with OpeningBook(str(tmp_path / "other"), slots=8, method="monte_carlo"):
+        pass
+    with pytest.raises(ValueError):
+        merge(first, [str(tmp_path / "other")])
+
+
+def test_solver_uses_and_fills_the_book(tmp_path: Path, board: Board) -> None:
+    path = str(tmp_path / "book")
+    with OpeningBook(path, slots=64, method="expectimax") as book:
+        solver = Solver("expectimax", solvers.expectimax, book=book)
+        move = solver.choose(board)
+        assert book.lookup(board) == (
+            move,
+            pytest.approx(solver.last_value),
+            solvers.expectimax.max_depth,
+        )
+
+        # a hit doesn't search at all
+        book.store(board, "w", 0.0, 99)
+        assert Solver("expectimax", lambda *_: "unreachable", book=book).choose(
+            board
+        ) == "w"
+
+    assert open_book(path, "expectimax") is not None
+    assert open_book(path, "monte_carlo") is None
+
+
+def test_books_are_created_for_their_method(tmp_path: Path, board: Board) -> None:
+    path = str(tmp_path / "book")
+    book = open_book(path, "up-left")
+    assert book is not None and book.method == "up-left"
+    book.close()
+    assert open_book(path, "closest_best_simple") is None
+
+    # nothing says which method filled an untagged book
+    untagged = str(tmp_path / "untagged")
+    OpeningBook(untagged, slots=64).close()
+    book = open_book(untagged, "expectimax")
+    assert book is not None
+    book.store(board, "a", 1.0, 3)
+    book.close()
+    assert open_book(untagged, "expectimax") is None
+
+
+def test_existing_books_are_not_recreated(tmp_path: Path, board: Board) -> None:
+    path = str(tmp_path / "book")
+    with OpeningBook(path, slots=64) as book:
+        book.store(board, "a", 1.0, 3)
+
+    with OpeningBook(path, slots=8, method="expectimax") as book:
+        assert (book.slots, book.method) == (64, "")
+        assert book.lookup(board) == ("a", 1.0, 3)
+    assert os.listdir(tmp_path) == ["book"]
+
+
+def test_workers_share_a_fresh_book(tmp_path: Path) -> None:
+    path = str(tmp_path / "book")
+    for _ in run_games(["closest_best_simple"], 8, workers=4, book=path):
+        pass
+
+    with OpeningBook(path, readonly=True) as book:
+        assert book.method == "closest_best_simple"
+        assert len(book) > 0
+    assert os.listdir(tmp_path) == ["book"]
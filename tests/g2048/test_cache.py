@@ -0,0 +1,69 @@
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bitboard import BitBoard
+from src.g2048.cache import TranspositionTable
+from src.g2048.solver import Solver
+
+
+def test_lru_eviction() -> None:
+    table = TranspositionTable(2)
+    table.put("a", 1, 1.0)
+    table.put("b", 1, 2.0)
+    assert table.get("a", 1) == 1.0
+
+    table.put("c", 1, 3.0)
+
+    assert table.get("b", 1) is None
+    assert table.get("a", 1) == 1.0
+    assert table.get("c", 1) == 3.0
+    assert table.stats() == {"entries": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_depth_is_part_of_the_key() -> None:
+    table = TranspositionTable(8)
+    table.put("a", 2, 1.0)
+
+    assert table.get("a", 1) is None
+    assert table.get("a", 2) == 1.0
+
+
+def test_depth_preferred_replacement() -> None:
+    table = TranspositionTable(1, policy="depth")
+    table.put("deep", 3, 1.0)
+    table.put("shallow", 1, 2.0)
+
+    assert table.get("shallow", 1) is None
+    assert table.get("deep", 3) == 1.0
+
+    table.put("deeper", 4, 3.0)
+    assert table.get("deeper", 4) == 3.0
+    assert table.evictions == 1
+    assert len(table) == 1
+
+
+def test_limits() -> None:
+    assert TranspositionTable(max_bytes=10_000).max_entries == 50
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+    with pytest.raises(ValueError):
+        TranspositionTable(policy="fifo")
+
+
+def test_expectimax_cache_persists_across_turns() -> None:
+    board = BitBoard(4, 4)
+    board[(0, 0)] = 2
+    board[(1, 0)] = 2
+    board[(3, 3)] = 4
+
+    cache = TranspositionTable()
+    cached = Solver("expectimax", solvers.expectimax, cache=cache)
+    uncached = Solver("expectimax", solvers.expectimax)
+
+    assert solvers.expectimax(cached, board) == solvers.expectimax(uncached, board)
+    size = len(cache)
+    assert size > 0
+
+    solvers.expectimax(cached, board)
+    assert len(cache) == size
+    assert cache.hits >= 4
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src import cli
+from src.g2048.runner import play_game
+
+
+def test_startup_imports_nothing_heavy() -> None:
+    code = (
+        "import sys, src.cli; "
+        "sys.exit(any(m in sys.modules for m in "
+        "['pygame', 'src.main', 'src.g2048.solvers']))"
+    )
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+
+def test_replay_skips_the_solvers(tmp_path: Path) -> None:
+    path = str(tmp_path / "game.trace")
+    play_game("up-left", 3, trace=path)
+
+    code = (
+        "import sys; from src import cli; cli.main(['replay', sys.argv[1]]); "
+        "sys.exit('src.g2048.solvers' in sys.modules)"
+    )
+    run = subprocess.run(
+        [sys.executable, "-c", code, path], capture_output=True, text=True
+    )
+    assert run.returncode == 0
+    assert "replayed" in run.stdout
+
+
+def test_simulate(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    argv = ["simulate", "--games", "2", "--method", "up-left", "--workers", "1"]
+    assert cli.main(argv + ["--width", "3", "--height", "5"]) == 0
+
+    summary = (tmp_path / "results" / "simulation_results.txt").read_text()
+    assert "method='up-left'" in summary
+    assert "games=2" in summary
+
+    # a second sweep, summarized together with the first
+    assert cli.main(argv) == 0
+    capsys.readouterr()
+    bases = ["results/simulation_results", "results/simulation_results_1"]
+    assert cli.main(["stats", *bases]) == 0
+    assert "---4 games---" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["simulate", "--method", "nope"],
+        ["simulate", "--format", "xml"],
+        ["simulate", "--games", "0"],
+        ["replay", "game.trace", "--bogus"],
+        ["stats", "no/such/results"],
+    ],
+)
+def test_bad_arguments(argv: list) -> None:
+    with pytest.raises(SystemExit) as error:
+        cli.main(argv)
+    assert error.value.code == 2
@@ -0,0 +1,110 @@
+from random import Random
+from typing import Callable, cast
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bench import CountingBoard, positions
+from src.g2048.board import Board
+from src.g2048.incremental import (
+    IncrementalBoard,
+    LineHeuristic,
+    PositionHeuristic,
+    Weights,
+    WeightedHeuristic,
+    incremental,
+    monotonicity,
+)
+from src.g2048.solver import Solver
+
+
+@pytest.mark.parametrize(
+    "heuristic, reference",
+    [
+        (WeightedHeuristic(), solvers.score_board),
+        (PositionHeuristic(), solvers.score_position),
+    ],
+)
+def test_matches_full_rescan(
+    heuristic: LineHeuristic, reference: Callable[[Board], float]
+) -> None:
+    for board in positions(10, seed=3):
+        tracked = incremental(board, heuristic)
+        assert tracked.evaluate() == pytest.approx(reference(board))
+
+        for move in "wasd":
+            child = cast(IncrementalBoard, tracked.moved(move)[0])
+            assert child.evaluate() == pytest.approx(reference(child))
+
+            for cell in child.empty_cells():
+                spawned = cast(IncrementalBoard, child.spawn(cell, 4))
+                assert spawned.evaluate() == pytest.approx(reference(spawned))
+
+
+def test_step_and_assignment_keep_terms_current() -> None:
+    board = IncrementalBoard(4, 4, rng=Random(1))
+    board[(0, 3)] = 2
+    board[(1, 3)] = 2
+    assert board.evaluate() == pytest.approx(solvers.score_board(board))
+
+    for move in "wasdwasdwwaa":
+        board.step(move)
+        assert board.evaluate() == pytest.approx(solvers.score_board(board))
+
+
+def test_keeps_the_board_subclass() -> None:
+    board = positions(1)[0]
+    tracked = incremental(board)
+
+    assert isinstance(tracked, CountingBoard)
+    assert isinstance(tracked, IncrementalBoard)
+    assert incremental(tracked) is tracked
+    assert type(incremental(Board(4, 4))) is type(incremental(Board(4, 4)))
+
+
+def test_weights() -> None:
+    assert monotonicity((2, 4, 8, 16)) == 0
+    assert monotonicity((16, 4, 8, 2)) == -1
+
+    board = Board(4, 4)
+    board[(3, 3)] = 8
+    board[(0, 0)] = 2
+    weights = Weights(empty=0, max_tile=0, smoothness=0, corner=1)
+    heuristic = WeightedHeuristic(weights)
+
+    # 1 * log2(8) in the bottom right corner, 0 * log2(2) in the top left one
+    assert incremental(board, heuristic).evaluate() == 3
+
+
+def test_expectimax_plays_the_same_moves(monkeypatch: pytest.MonkeyPatch) -> None:
+    def play(board: Board) -> str:
+        return solvers.expectimax(Solver("expectimax", solvers.expectimax), board)
+
+    for board in positions(5, seed=9):
+        monkeypatch.setattr(solvers.expectimax, "incremental", True)
+        move = play(board)
+
+        monkeypatch.setattr(solvers.expectimax, "incremental", False)
+        assert move == play(board)
+
+
+def test_line_memos_stay_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    from src.g2048 import board as board_module
+
+    monkeypatch.setattr(board_module, "MAX_LINES", 64)
+    monkeypatch.setattr(board_module, "_LINE_MOVES", {})
+    monkeypatch.setattr(board_module, "_SLIDES", {})
+    heuristic = PositionHeuristic()
+
+    board = incremental(Board(8, 8, rng=Random(4)), heuristic)
+    board[(0, 0)] = 2
+    for turn in range(300):
+        if not board.step("wasd"[turn % 4]):
+            break
+        board.evaluate()
+
+    assert len(board_module._LINE_MOVES) == 64
+    assert len(board_module._SLIDES) == 64
+    assert len(heuristic._rows) == len(heuristic._columns) == 64
+    # and the values past the cap are still right
+    assert board.evaluate() == pytest.approx(solvers.score_position(board))
@@ -0,0 +1,90 @@
+from random import Random
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.board import MOVES, Board
+from src.g2048.instrumentation import SearchStats
+from src.g2048.runner import place_starting_tiles, play_game
+from src.g2048.solver import Solver
+
+
+def played_board(seed: int) -> Board:
+    board = Board(4, 4, rng=Random(seed))
+    place_starting_tiles(board)
+    for move in "wasdwasd":
+        board.step(move)
+    return board
+
+
+def test_node_counts() -> None:
+    stats = SearchStats()
+    stats.node("max", 0, 3)
+    stats.node("chance", 1, 4)
+    stats.node("leaf", 2)
+    stats.node("leaf", 2)
+
+    assert stats.nodes == 4
+    assert stats.nodes_per_ply == [1, 1, 2]
+    assert (stats.max_nodes, stats.chance_nodes, stats.leaves) == (1, 1, 2)
+    assert stats.branching_factor() == 3.5
+
+
+def test_wrap_times_calls() -> None:
+    stats = SearchStats()
+    double = stats.wrap("evaluation", lambda x: 2 * x)
+
+    assert double(21) == 42
+    assert stats.time["evaluation"] > 0
+
+
+@pytest.mark.parametrize("method", ["expectimax", "look_ahead_simple"])
+def test_instrumented_search_plays_the_same_move(method: str) -> None:
+    board = played_board(3)
+    plain = Solver(method, solvers.METHODS[method])
+    instrumented = Solver(method, solvers.METHODS[method], stats=SearchStats())
+
+    instrumented.stats.begin_move()  # type: ignore[union-attr]
+    move = instrumented.method(instrumented, board)
+    instrumented.stats.end_move(0)  # type: ignore[union-attr]
+
+    assert move == plain.method(plain, board)
+    stats = instrumented.stats.as_dict()  # type: ignore[union-attr]
+    assert stats["nodes"] > 0
+    assert stats["leaves"] > 0
+    assert stats["time"]["evaluation"] > 0
+    assert stats["slowest_moves"][0]["nodes"] == stats["nodes"]
+
+
+def test_expectimax_cache_counters() -> None:
+    stats = SearchStats()
+    solver = Solver("expectimax", solvers.expectimax, stats=stats)
+    solvers.expectimax(solver, played_board(4))
+
+    assert stats.cache["misses"] > 0
+    assert stats.nodes_per_ply[0] == 1
+    assert len(stats.nodes_per_ply) == solvers.expectimax.max_depth + 1
+
+
+def test_look_ahead_nodes_per_ply() -> None:
+    board = played_board(5)
+    stats = SearchStats()
+    method = solvers.look_ahead_position_aware
+    solver = Solver("look_ahead_position_aware", method, stats=stats)
+    method(solver, board)
+
+    children = [board.moved(move)[0] for move in MOVES if board.moved(move)[1]]
+    grandchildren = sum(bin(child.legal_moves()).count("1") for child in children)
+    assert stats.nodes_per_ply == [1, len(children), grandchildren]
+    assert stats.max_nodes == 1 + len(children)
+    assert stats.leaves == grandchildren
+
+
+def test_play_game_collects_stats_only_when_asked() -> None:
+    assert play_game("circular", seed=1).stats is None
+
+    result = play_game("look_ahead_simple", seed=1, instrument=True)
+    assert result.stats is not None
+    # the game ends before a move is chosen for the final board
+    assert result.stats["moves"] == result.turns
+    assert result.stats["nodes"] > 0
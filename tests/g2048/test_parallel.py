@@ -0,0 +1,101 @@
+from random import Random
+from typing import Any, Callable, List
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.board import Board
+from src.g2048.instrumentation import SearchStats
+from src.g2048.parallel import RootPool
+from src.g2048.runner import place_starting_tiles
+from src.g2048.solver import Solver
+
+
+def positions(count: int) -> List[Board]:
+    boards: List[Board] = []
+    board = Board(4, 4, rng=Random(11))
+    place_starting_tiles(board)
+    solver = Solver("closest_best_simple", solvers.closest_best_simple, rng=Random(1))
+    while len(boards) < count and board.step(solver.choose(board)):
+        boards.append(board.copy())
+    return boards[::3]
+
+
+@pytest.mark.parametrize(
+    "method",
+    [solvers.expectimax, solvers.look_ahead_simple, solvers.look_ahead_position_aware],
+)
+def test_parallel_moves_match_serial(method: Callable) -> None:
+    with RootPool(workers=2) as pool:
+        for board in positions(24):
+            serial = Solver(method.__name__, method)
+            parallel = Solver(method.__name__, method, parallel=pool)
+            assert parallel.choose(board) == serial.choose(board)
+            assert parallel.last_value == pytest.approx(serial.last_value)
+            assert parallel.last_depth == serial.last_depth
+            assert parallel.last_move == serial.last_move
+        assert pool.timeouts == 0
+
+
+@pytest.mark.parametrize("method", [solvers.expectimax, solvers.look_ahead_simple])
+def test_ties_go_to_the_serial_move(
+    method: Callable, make_board: Callable[..., Any]
+) -> None:
+    # left and right are worth the same, up and down change nothing
+    board = make_board([[2, 4, 4, 2], [4, 2, 2, 4], [2, 4, 4, 2], [4, 2, 2, 4]])
+
+    with RootPool(workers=2) as pool:
+        serial = Solver(method.__name__, method)
+        parallel = Solver(method.__name__, method, parallel=pool)
+        assert parallel.choose(board) == serial.choose(board)
+
+
+def test_parallel_searches_are_not_instrumented() -> None:
+    with RootPool(workers=2) as pool:
+        with pytest.raises(ValueError):
+            Solver("expectimax", solvers.expectimax, stats=SearchStats(), parallel=pool)
+        # methods the pool doesn't split still search in this process
+        Solver("monte_carlo", solvers.monte_carlo, stats=SearchStats(), parallel=pool)
+
+
+def test_workers_search_with_the_callers_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # spawned workers start from the declared static vars, the pool hands them
+    # the current ones
+    monkeypatch.setattr(solvers.expectimax, "max_depth", 1)
+    with RootPool(workers=2, start_method="spawn") as pool:
+        for board in positions(12)[:2]:
+            serial = Solver("expectimax", solvers.expectimax)
+            parallel = Solver("expectimax", solvers.expectimax, parallel=pool)
+            assert parallel.choose(board) == serial.choose(board)
+            assert parallel.last_value == pytest.approx(serial.last_value)
+            assert parallel.last_depth == serial.last_depth == 1
+
+        # and restarts them when the settings change
+        workers = pool._workers["expectimax"]
+        monkeypatch.setattr(solvers.expectimax, "max_depth", 2)
+        board = positions(3)[0]
+        parallel = Solver("expectimax", solvers.expectimax, parallel=pool)
+        parallel.choose(board)
+        assert pool._workers["expectimax"] != workers
+        assert parallel.last_depth == 2
+
+
+def test_timeout_falls_back_to_a_legal_move() -> None:
+    board = positions(3)[0]
+    with RootPool(workers=2, timeout=0.0) as pool:
+        solver = Solver("expectimax", solvers.expectimax, parallel=pool)
+        move = solver.choose(board)
+
+        assert move in ["w", "a", "s", "d"]
+        assert board.moved(move)[1]
+        assert pool.timeouts == 1
+
+
+def test_unsupported_methods_run_serially() -> None:
+    board = positions(3)[0]
+    with RootPool(workers=2) as pool:
+        solver = Solver("monte_carlo", solvers.monte_carlo, parallel=pool)
+        solver.choose(board)
+        assert not pool._workers
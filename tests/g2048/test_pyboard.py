@@ -0,0 +1,48 @@
+from typing import Any, List, Optional, Sequence
+
+import pytest
+
+pg = pytest.importorskip("pygame")
+
+from src.g2048.pygame.backend import HeadlessBackend  # noqa: E402
+from src.g2048.pygame.board import PyBoard, _tile  # noqa: E402
+
+
+class RecordingBackend(HeadlessBackend):
+    # the rects (pygame.Rect) of every present(), None for a full frame
+    def __init__(self) -> None:
+        super().__init__()
+        self.presented: List[Optional[List[Any]]] = []
+
+    def _present(self, rects: Optional[Sequence[Any]]) -> None:
+        self.presented.append(None if rects is None else list(rects))
+
+
+def test_tiles_are_rendered_once() -> None:
+    first = _tile(8, (190, 190))
+
+    assert _tile(8, (190, 190)) is first
+    assert _tile(16, (190, 190)) is not first
+    assert _tile(8, (95, 95)).get_size() == (95, 95)
+
+
+def test_only_changed_cells_are_redrawn() -> None:
+    backend = RecordingBackend()
+    board = PyBoard(4, 4, backend=backend)
+    board[(0, 0)] = 2
+    board.render()
+
+    board[(3, 0)] = 4
+    board[(1, 2)] = 8
+    board.render()
+    board.render()
+
+    assert backend.presented[0] is None
+    changed = backend.presented[1]
+    assert changed is not None
+    assert sorted(rect.topleft for rect in changed) == [(210, 400), (590, 20)]
+    assert backend.presented[2] == []
+
+    board.redraw()
+    board.render()
+    assert backend.presented[3] is None
@@ -0,0 +1,60 @@
+import random
+from typing import List
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.board import Board
+from src.g2048.reporters import Reporter, SampledReporter
+from src.g2048.solver import Solver
+
+
+class RecordingReporter(Reporter):
+    def __init__(self) -> None:
+        self.turns: List[int] = []
+        self.finished = False
+
+    def report(self, solver: Solver, board: Board, iteration: int) -> None:
+        self.turns.append(solver.turns)
+
+    def finish(self, solver: Solver, board: Board, iteration: int) -> None:
+        self.finished = True
+
+
+def new_game() -> Board:
+    random.seed(1)
+    board = Board(4, 4)
+    board[(0, 0)] = 2
+    return board
+
+
+def test_headless_solve_skips_the_terminal(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("os.system", lambda command: pytest.fail(command))
+
+    solver = Solver("circular", solvers.circular)
+    solver.solve(new_game(), headless=True)
+
+    assert solver.turns > 0
+
+
+def test_sampled_reporter() -> None:
+    recording = RecordingReporter()
+    solver = Solver("circular", solvers.circular)
+
+    solver.solve(
+        new_game(), headless=True, reporter=SampledReporter(recording, every_turns=10)
+    )
+
+    assert recording.turns == list(range(0, solver.turns + 1, 10))
+    assert recording.finished
+
+
+def test_sampled_reporter_by_time() -> None:
+    recording = RecordingReporter()
+    solver = Solver("circular", solvers.circular)
+
+    solver.solve(
+        new_game(), headless=True, reporter=SampledReporter(recording, every_seconds=60)
+    )
+
+    assert recording.turns == [0]
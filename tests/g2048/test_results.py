@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from src.g2048.results import (
+    BinaryResultWriter,
+    ResultRow,
+    ResultWriter,
+    open_writer,
+    read_results,
+    result_files,
+)
+from src.g2048.runner import GameResult
+
+
+def results(count: int) -> list:
+    return [
+        GameResult(["expectimax", "random"][n % 2], n, 2 ** (n % 11 + 1), n, 0.25)
+        for n in range(count)
+    ]
+
+
+@pytest.mark.parametrize("format", ["csv", "binary"])
+def test_round_trip(tmp_path: Path, format: str) -> None:
+    base = str(tmp_path / "results")
+    with open_writer(base, format) as writer:
+        for result in results(10):
+            writer.write(result)
+
+    rows = list(read_results(result_files(base)))
+    assert rows == [ResultRow.from_result(result) for result in results(10)]
+    assert rows[3].moves_per_sec == 12.0
+
+
+def test_flushes_in_chunks(tmp_path: Path) -> None:
+    base = str(tmp_path / "results")
+    writer = open_writer(base, flush_every=4, flush_seconds=60)
+    for result in results(6):
+        writer.write(result)
+
+    # the first chunk is on disk before the writer is closed
+    assert len(list(read_results(writer.paths))) == 4
+
+    writer.close()
+    assert len(list(read_results(writer.paths))) == 6
+
+
+def test_rotates_by_size(tmp_path: Path) -> None:
+    base = str(tmp_path / "results")
+    record = BinaryResultWriter.RECORD.size
+    max_bytes = len(BinaryResultWriter.MAGIC) + 10 * record
+    with open_writer(base, "binary", flush_every=5, max_bytes=max_bytes) as writer:
+        for result in results(25):
+            writer.write(result)
+
+    assert len(writer.paths) == 3
+    assert result_files(base) == writer.paths
+    assert all(Path(path).stat().st_size <= max_bytes for path in writer.paths)
+    assert [row.seed for row in read_results(writer.paths)] == list(range(25))
+
+
+def test_interrupted_writes_are_kept(tmp_path: Path) -> None:
+    base = str(tmp_path / "results")
+    with pytest.raises(KeyboardInterrupt):
+        with open_writer(base, flush_every=100) as writer:
+            for result in results(3):
+                writer.write(result)
+            raise KeyboardInterrupt
+
+    assert len(list(read_results(result_files(base)))) == 3
+
+    # a record cut short by a hard kill is skipped
+    with open(result_files(base)[0], "a") as f:
+        f.write("3,random,8")
+    assert len(list(read_results(result_files(base)))) == 3
+
+
+def test_writers_must_encode(tmp_path: Path) -> None:
+    class Incomplete(ResultWriter):
+        suffix = ".txt"
+
+    with pytest.raises(TypeError):
+        Incomplete(str(tmp_path / "results"))  # type: ignore[abstract]
@@ -0,0 +1,59 @@
+from random import Random
+
+from src.g2048.board import Board
+from src.g2048.runner import derive_seed, place_starting_tiles, play_game, run_games
+
+
+def test_play_game_is_reproducible() -> None:
+    first = play_game("random", seed=7)
+    second = play_game("random", seed=7)
+
+    assert (first.score, first.turns) == (second.score, second.turns)
+    assert first.turns > 0
+
+
+def test_run_games_in_parallel_matches_serial() -> None:
+    methods = ["up-left", "random", "circular"]
+
+    serial = list(run_games(methods, 4, seed=100, workers=1))
+    parallel = list(run_games(methods, 4, seed=100, workers=2, chunk_size=3))
+
+    def key(result: tuple) -> tuple:
+        return (result[0], result[1], result[2], result[3])
+
+    assert len(parallel) == 12
+    assert sorted(map(key, parallel)) == sorted(map(key, serial))
+
+
+def test_derived_seeds() -> None:
+    assert derive_seed(1, 2) == derive_seed(1, 2)
+    assert len({derive_seed(1, n) for n in range(1_000)}) == 1_000
+    assert derive_seed(1, 2, "board") != derive_seed(1, 2, "solver")
+
+
+def test_seeded_boards_replay_the_same_spawns() -> None:
+    boards = [Board(4, 4, rng=Random(5)), Board(4, 4, rng=Random(5))]
+    for board in boards:
+        place_starting_tiles(board)
+        for move in "wasdwasdwasd":
+            board.step(move)
+
+    assert list(boards[0]) == list(boards[1])
+
+
+def test_every_method_plays_the_same_deals() -> None:
+    results = list(run_games(["up-left", "circular"], 3, seed=3, workers=1))
+
+    up_left = [result.seed for result in results if result.method == "up-left"]
+    circular = [result.seed for result in results if result.method == "circular"]
+    assert up_left == circular
+
+
+def test_play_game_on_other_sizes() -> None:
+    for method, width, height in [
+        ("expectimax", 3, 3),
+        ("look_ahead_position_aware", 5, 3),
+        ("look_ahead_position_aware", 3, 6),
+    ]:
+        result = play_game(method, seed=1, width=width, height=height)
+        assert result.turns > 0 and result.score >= 8
@@ -0,0 +1,91 @@
+import random
+import time
+from typing import Any, Callable
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bitboard import BitBoard
+from src.g2048.solver import Solver
+
+
+def test_monte_carlo_respects_rollout_count(
+    monkeypatch: pytest.MonkeyPatch, make_board: Callable[..., Any]
+) -> None:
+    monkeypatch.setattr(solvers.monte_carlo, "time_budget", 60.0)
+    monkeypatch.setattr(solvers.monte_carlo, "max_rollouts", 40)
+    random.seed(3)
+    board = make_board(
+        [[2, 2, 0, 0], [0, 4, 0, 0], [0, 0, 0, 0], [0, 0, 0, 2]], BitBoard
+    )
+
+    start = time.perf_counter()
+    move = solvers.monte_carlo(Solver("monte_carlo", solvers.monte_carlo), board)
+
+    assert move in ["w", "a", "s", "d"]
+    assert time.perf_counter() - start < 5
+
+
+def test_monte_carlo_respects_time_budget(
+    monkeypatch: pytest.MonkeyPatch, make_board: Callable[..., Any]
+) -> None:
+    monkeypatch.setattr(solvers.monte_carlo, "time_budget", 0.01)
+    monkeypatch.setattr(solvers.monte_carlo, "max_rollouts", 10**9)
+    board = make_board(
+        [[2, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]], BitBoard
+    )
+
+    start = time.perf_counter()
+    solvers.monte_carlo(Solver("monte_carlo", solvers.monte_carlo), board)
+
+    assert time.perf_counter() - start < 0.5
+
+
+def test_monte_carlo_only_plays_legal_moves(make_board: Callable[..., Any]) -> None:
+    # only left and right change this board
+    board = make_board(
+        [[2, 2, 4, 8], [4, 8, 2, 4], [2, 4, 8, 2], [4, 2, 4, 8]], BitBoard
+    )
+
+    move = solvers.monte_carlo(Solver("monte_carlo", solvers.monte_carlo), board)
+
+    assert move in ["a", "d"]
+
+
+def test_expectimax_deepening_respects_time_budget(
+    monkeypatch: pytest.MonkeyPatch, make_board: Callable[..., Any]
+) -> None:
+    monkeypatch.setattr(solvers.expectimax_deepening, "time_budget", 0.02)
+    board = make_board(
+        [[2, 0, 0, 0], [0, 4, 0, 0], [0, 0, 0, 0], [0, 0, 8, 0]], BitBoard
+    )
+
+    # the first search builds the heuristic's row tables, which the budget
+    # doesn't cover
+    solvers.expectimax_deepening(
+        Solver("expectimax_deepening", solvers.expectimax_deepening), board
+    )
+
+    start = time.perf_counter()
+    solver = Solver("expectimax_deepening", solvers.expectimax_deepening)
+    move = solvers.expectimax_deepening(solver, board)
+
+    assert move in ["w", "a", "s", "d"]
+    assert time.perf_counter() - start < 0.2
+    assert solver.last_depth >= 1
+
+
+def test_expectimax_deepening_goes_deeper_on_full_boards(
+    monkeypatch: pytest.MonkeyPatch, make_board: Callable[..., Any]
+) -> None:
+    monkeypatch.setattr(solvers.expectimax_deepening, "time_budget", 0.05)
+    monkeypatch.setattr(solvers.expectimax_deepening, "max_depth", 3)
+    board = make_board(
+        [[2, 2, 4, 8], [4, 8, 2, 4], [2, 4, 8, 2], [4, 2, 4, 8]], BitBoard
+    )
+
+    solver = Solver("expectimax_deepening", solvers.expectimax_deepening)
+    move = solvers.expectimax_deepening(solver, board)
+
+    assert move in ["a", "d"]
+    assert solver.last_depth == 3
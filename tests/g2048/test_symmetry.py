@@ -0,0 +1,51 @@
+from random import Random
+from typing import Callable
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bitboard import BitBoard
+from src.g2048.board import Board
+from src.g2048.symmetry import (
+    SymmetricEvaluator,
+    apply_symmetry,
+    canonical,
+    map_move,
+    transform_key,
+    unmap_move,
+)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_canonical_is_shared_by_all_symmetries(
+    board_class: Callable[[int, int], Board], random_board: Callable[..., Board]
+) -> None:
+    board = random_board(board_class(4, 4), Random(8))
+    key, symmetry = canonical(board)
+
+    assert transform_key(board.key(), symmetry) == key
+    for other in range(8):
+        assert canonical(apply_symmetry(board, other))[0] == key
+
+
+def test_moves_remap(random_board: Callable[..., Board]) -> None:
+    rng = Random(16)
+    for _ in range(20):
+        board = random_board(Board(4, 4), rng)
+        for symmetry in range(8):
+            transformed = apply_symmetry(board, symmetry)
+            for move in ["w", "a", "s", "d"]:
+                mapped = map_move(move, symmetry)
+                expected = apply_symmetry(board.moved(move)[0], symmetry)
+                assert list(transformed.moved(mapped)[0]) == list(expected)
+                assert unmap_move(mapped, symmetry) == move
+
+
+def test_symmetric_evaluator(random_board: Callable[..., Board]) -> None:
+    board = random_board(Board(4, 4), Random(32))
+    evaluate = SymmetricEvaluator(solvers.score_board)
+
+    for symmetry in range(8):
+        assert evaluate(apply_symmetry(board, symmetry)) == solvers.score_board(board)
+    assert evaluate.table.stats()["misses"] == 1
+    assert evaluate.table.stats()["hits"] == 7
@@ -0,0 +1,72 @@
+from typing import Any, Callable, List
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bench import positions
+from src.g2048.bitboard import BitBoard
+from src.g2048.board import Board
+from src.g2048.incremental import (
+    LineHeuristic,
+    Weights,
+    WeightedHeuristic,
+    incremental,
+)
+from src.g2048.solver import Solver
+from src.g2048.tables import RowTables, row_tables
+
+
+@pytest.fixture
+def bitboards(make_board: Callable[..., Any]) -> Callable[[int], List[BitBoard]]:
+    # the bench positions as BitBoards
+    def convert(count: int) -> List[BitBoard]:
+        return [make_board(list(b), BitBoard) for b in positions(count, seed=5)]
+
+    return convert
+
+
+@pytest.mark.parametrize(
+    "heuristic, reference",
+    [
+        (solvers.board_heuristic, solvers.score_board),
+        (solvers.tile_weight_heuristic, solvers.score_tile_weights),
+        (solvers.position_heuristic, solvers.score_position),
+    ],
+)
+def test_tables_match_heuristics(
+    heuristic: LineHeuristic,
+    reference: Callable[[Board], float],
+    bitboards: Callable[[int], List[BitBoard]],
+) -> None:
+    tables = row_tables(heuristic)
+    for bitboard, board in zip(bitboards(20), positions(20, seed=5)):
+        assert tables.evaluate(bitboard.key()) == pytest.approx(reference(board))
+
+
+def test_weights_are_baked_in(bitboards: Callable[[int], List[BitBoard]]) -> None:
+    heuristic = WeightedHeuristic(
+        Weights(empty=3, max_tile=1, smoothness=0.25, monotonicity=2, corner=5)
+    )
+    tables = RowTables(heuristic)
+
+    # positional rows need one table per row, columns still share one
+    assert len({id(table) for table in tables.rows}) == 4
+    assert len({id(table) for table in tables.columns}) == 1
+
+    for bitboard, board in zip(bitboards(20), positions(20, seed=5)):
+        expected = incremental(board, heuristic).evaluate()
+        assert tables.evaluate(bitboard.key()) == pytest.approx(expected)
+
+
+def test_expectimax_plays_the_same_moves(
+    monkeypatch: pytest.MonkeyPatch, bitboards: Callable[[int], List[BitBoard]]
+) -> None:
+    def play(board: BitBoard) -> str:
+        return solvers.expectimax(Solver("expectimax", solvers.expectimax), board)
+
+    for board in bitboards(5):
+        monkeypatch.setattr(solvers.expectimax, "incremental", True)
+        move = play(board)
+
+        monkeypatch.setattr(solvers.expectimax, "incremental", False)
+        assert move == play(board)
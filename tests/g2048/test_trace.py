@@ -0,0 +1,58 @@
+from pathlib import Path
+from random import Random
+
+import pytest
+
+from src.g2048 import solvers
+from src.g2048.bitboard import BitBoard
+from src.g2048.board import Board
+from src.g2048.runner import place_starting_tiles, play_game
+from src.g2048.solver import Solver
+from src.g2048.trace import Trace, TraceMismatch, TraceRecorder, replay
+
+
+def record(board: Board, method: str = "closest_best_simple") -> Trace:
+    place_starting_tiles(board)
+    recorder = TraceRecorder(meta={"method": method})
+    solver = Solver(method, solvers.METHODS[method], rng=Random(2), recorder=recorder)
+    solver.solve(board, headless=True)
+
+    assert recorder.trace is not None
+    assert len(recorder.trace) == solver.turns
+    return recorder.trace
+
+
+def test_replay_reaches_the_same_board() -> None:
+    board = Board(4, 4, rng=Random(1))
+    trace = record(board)
+
+    assert replay(trace).key() == board.key()
+
+
+def test_bitboard_games_replay_through_board() -> None:
+    board = BitBoard(4, 4, rng=Random(1))
+    trace = record(board)  # type: ignore[arg-type]
+
+    assert list(replay(trace)) == list(board)
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    path = str(tmp_path / "game.trace")
+    play_game("up-left", seed=4, trace=path)
+    trace = Trace.load(path)
+
+    assert trace.meta == {"method": "up-left", "seed": 4}
+    assert Trace.from_bytes(trace.to_bytes()).spawns == trace.spawns
+    # 2 bytes of move and spawn and a 4 byte checksum per turn
+    assert len(trace.to_bytes()) - 6 * len(trace) < 100
+
+
+def test_checks_every_state() -> None:
+    trace = record(Board(4, 4, rng=Random(3)))
+    turn = next(i for i, spawn in enumerate(trace.spawns) if spawn is not None)
+    x, y, value = trace.spawns[turn]  # type: ignore[misc]
+    trace.spawns[turn] = (x, y, 6 - value)
+
+    with pytest.raises(TraceMismatch, match=f"turn {turn} "):
+        replay(trace)
+    replay(trace, check=False)
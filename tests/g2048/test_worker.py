@@ -0,0 +1,88 @@
+import time
+from pathlib import Path
+from random import Random
+
+from src.g2048 import solvers
+from src.g2048.board import Board
+from src.g2048.book import OpeningBook
+from src.g2048.cache import TranspositionTable
+from src.g2048.runner import derive_seed, place_starting_tiles
+from src.g2048.solver import Solver
+from src.g2048.worker import SearchWorker
+
+
+def wait_for(worker: SearchWorker) -> str:
+    move = worker.poll(timeout=30)
+    assert move is not None
+    return move
+
+
+def test_moves_match_the_synchronous_solver() -> None:
+    board = Board(4, 4, rng=Random(3))
+    place_starting_tiles(board)
+    solver = Solver(
+        "expectimax",
+        solvers.expectimax,
+        cache=TranspositionTable(),
+        rng=Random(derive_seed(0, "solver")),
+    )
+
+    with SearchWorker("expectimax") as worker:
+        for _ in range(5):
+            assert not worker.busy
+            worker.request(board, solver.turns)
+            assert worker.busy
+            move = wait_for(worker)
+
+            assert move == solver.choose(board)
+            board.step(move)
+            solver.turns += 1
+
+
+def test_newer_requests_replace_older_ones() -> None:
+    first, second = Board(4, 4), Board(4, 4)
+    first[(0, 0)] = 2
+    second[(3, 3)] = 2
+
+    with SearchWorker("closest_best_simple") as worker:
+        worker.request(first)
+        worker.request(second)
+        move = wait_for(worker)
+        assert worker.poll() is None
+
+    assert move == Solver("", solvers.closest_best_simple).choose(second)
+
+
+def test_cancel_stops_a_search_in_flight() -> None:
+    board = Board(4, 4, rng=Random(5))
+    place_starting_tiles(board)
+
+    worker = SearchWorker("monte_carlo")
+    worker.request(board)
+    start = time.perf_counter()
+    worker.cancel()
+    assert time.perf_counter() - start < 5
+    assert not worker.busy and worker.poll() is None
+
+    # and the next request gets a fresh worker
+    worker.request(board)
+    assert wait_for(worker) in ["w", "a", "s", "d", "up", "left", "down", "right"]
+    worker.close()
+
+
+def test_books_of_other_methods_are_ignored(tmp_path: Path) -> None:
+    board = Board(4, 4)
+    board[(0, 0)] = 2
+    board[(1, 3)] = 4
+    searched = Solver("", solvers.closest_best_simple).choose(board)
+    booked = next(move for move in "wasd" if move != searched and board.moved(move)[1])
+
+    for method in ["closest_best_simple", "up-left"]:
+        path = str(tmp_path / f"{method}.bin")
+        with OpeningBook(path, slots=64, method=method) as book:
+            book.store(board, booked, 1.0, 1)
+
+        with SearchWorker("closest_best_simple", book=path) as worker:
+            worker.request(board)
+            expected = booked if method == "closest_best_simple" else searched
+            assert wait_for(worker) == expected